@@ -0,0 +1,320 @@
+"""
+Benchmark harness for the report hot paths on synthetic data.
+
+    python scripts/benchmark.py --sizes 1000 10000 100000
+    python scripts/benchmark.py --group gap learning --baseline reports/benchmark_base.json
+    python scripts/benchmark.py --compare reports/benchmark_base.json reports/benchmark.json --threshold 0.25
+
+Each case is timed (best and median of --repeat runs) after one extra run
+that measures its peak traced memory. Results go to a JSON file; the compare
+mode flags cases that got slower than the threshold and exits non-zero.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, 'src')
+sys.path.insert(0, SRC_DIR)
+
+import matplotlib
+matplotlib.use('Agg')
+
+import synthetic # noqa: E402
+from data_cache import load_cleaned # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, 'reports', 'benchmark.json')
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+# Builders of table_jml_responden.py that take the cleaned frame
+TABLE_BUILDERS = [
+    'create_distribution_campus_loc_tahun',
+    'create_distribution_jurusan_tahun',
+    'create_distribution_prodi_tahun',
+    'create_distribution_masa_tunggu_status',
+    'create_distribution_waktu_tunggu_jurusan',
+    'create_serapan_jurusan',
+    'create_serapan_prodi_per_jurusan',
+    'create_distribution_provinsi',
+    'create_distribution_kabkota_kalbar',
+    'create_salary_distribution',
+    'create_salary_by_jurusan',
+    'create_job_search_funnel',
+    'create_jurusan_ranking',
+    'create_masa_tunggu_survival',
+]
+
+CASES = []
+
+
+def case(group, name=None):
+    """Registers func(df) as a benchmark case."""
+    def decorator(func):
+        CASES.append({'group': group, 'name': name or func.__name__, 'func': func})
+        return func
+    return decorator
+
+
+@contextlib.contextmanager
+def patched(obj, **attrs):
+    """Temporarily replaces module attributes (report output paths, browser)."""
+    old = {k: getattr(obj, k) for k in attrs}
+    for k, v in attrs.items():
+        setattr(obj, k, v)
+    try:
+        yield
+    finally:
+        for k, v in old.items():
+            setattr(obj, k, v)
+
+
+# --- Tables ---
+
+def _register_table_builders():
+    import table_jml_responden as tr
+    for builder in TABLE_BUILDERS:
+        case('tables', builder)(lambda df, f=getattr(tr, builder): f(df))
+
+
+# --- Gap analysis ---
+
+@case('gap')
+def calculate_gap(df):
+    import gap_analisis
+    from dataset import Dataset
+    data = Dataset(df)
+    for jurusan in df['Jurusan'].dropna().unique():
+        gap_analisis.calculate_gap(data, jurusan)
+
+
+@case('gap')
+def calculate_gap_table(df):
+    import gap_analisis
+    gap_analisis.calculate_gap_table(df, 'prodi')
+
+
+@case('gap')
+def build_gap_cube(df):
+    import gap_cube
+    gap_cube.build_gap_cube(df)
+
+
+@case('gap')
+def paired_tests(df):
+    import gap_stats
+    gap_stats.paired_tests(df)
+
+
+@case('gap')
+def generate_full_report(df):
+    import gap_analisis
+    import gap_cube
+    with tempfile.TemporaryDirectory() as tmp, \
+            patched(gap_analisis, load_data=lambda: df.copy(), REPORTS_DIR=tmp), \
+            patched(gap_cube, load_gap_cube=lambda path=None: pd.DataFrame(),
+                    save_gap_cube=lambda cube, path=None: None), \
+            patched(gap_analisis.webbrowser, open=lambda *a, **k: None):
+        gap_analisis.generate_full_report(df['Jurusan'].dropna().unique().tolist(), workers=1)
+
+
+# --- Learning methods ---
+
+@case('learning')
+def calculate_means(df):
+    import pembelajaran_analisis
+    pembelajaran_analisis.calculate_means(df)
+
+
+@case('learning')
+def calculate_jurusan_means(df):
+    import pembelajaran_analisis
+    pembelajaran_analisis.calculate_jurusan_means(df)
+
+
+@case('learning')
+def calculate_distribution(df):
+    import pembelajaran_analisis
+    df_scores = pembelajaran_analisis.encode_learning_methods(df)
+    pembelajaran_analisis.calculate_distribution(df_scores, df['Jurusan'])
+
+
+# --- Charts (input size is bounded by the number of groups, not rows) ---
+
+@case('charts')
+def table_bar_chart(df):
+    import table_jml_responden as tr
+    tr.get_horizontal_bar_chart_base64(tr.create_distribution_prodi_tahun(df), "Benchmark")
+
+
+@case('charts')
+def gap_heatmap(df):
+    import gap_analisis
+    gap_analisis.create_gap_heatmap(gap_analisis.calculate_gap_table(df, 'prodi'), "Benchmark")
+
+
+@case('charts')
+def learning_heatmap(df):
+    import pembelajaran_analisis
+    pembelajaran_analisis.create_heatmap(pembelajaran_analisis.calculate_jurusan_means(df))
+
+
+def measure(func, df, repeat):
+    """(best seconds, median seconds, peak MB) of func(df); output is discarded."""
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        # The memory run goes first and doubles as warm-up (imports, caches)
+        tracemalloc.start()
+        func(df)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(df)
+            times.append(time.perf_counter() - start)
+    import matplotlib.pyplot as plt
+    plt.close('all')
+    return min(times), statistics.median(times), peak / 2 ** 20
+
+
+def run_cleaning(model, n_rows, seed):
+    """
+    Runs cleaning.py on a synthetic raw export in a subprocess with profiling
+    enabled and returns one result per cleaning stage.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = os.path.join(tmp, 'data.xlsx')
+        with contextlib.redirect_stdout(io.StringIO()):
+            synthetic.save(synthetic.to_raw_form(synthetic.sample(model, n_rows, seed=seed), seed=seed), raw_path)
+        env = dict(os.environ, TRACER_PROFILE='1', TRACER_RAW_FILE=raw_path,
+                   TRACER_PROCESSED_DIR=tmp, TRACER_REPORTS_DIR=tmp)
+        result = subprocess.run([sys.executable, os.path.join(SRC_DIR, 'cleaning.py')], env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        if result.returncode != 0:
+            print(result.stdout[-2000:])
+            raise RuntimeError(f"cleaning.py failed on {n_rows} synthetic rows")
+        with open(os.path.join(tmp, 'profile_cleaning.json'), 'r', encoding='utf-8') as f:
+            stages = json.load(f)['stages']
+    return [{'group': 'cleaning', 'case': f"cleaning/{s['stage']}", 'rows': n_rows, 'time_s': s['wall_s'],
+             'time_median_s': s['wall_s'], 'peak_mb': s['peak_mb']} for s in stages]
+
+
+def run_benchmarks(sizes, groups, repeat, seed, max_cleaning_rows):
+    _register_table_builders()
+    model = synthetic.learn_model(load_cleaned())
+    results = []
+    for n_rows in sizes:
+        df = synthetic.to_cleaned_form(synthetic.sample(model, n_rows, seed=seed))
+        print(f"\n== {n_rows} rows ==")
+        for spec in CASES:
+            if groups and spec['group'] not in groups:
+                continue
+            best, median, peak = measure(spec['func'], df, repeat)
+            name = f"{spec['group']}/{spec['name']}"
+            print(f"{name:<55} {best:>9.4f} s {peak:>9.1f} MB")
+            results.append({'group': spec['group'], 'case': name, 'rows': n_rows, 'time_s': best,
+                            'time_median_s': median, 'peak_mb': peak})
+
+        if (not groups or 'cleaning' in groups) and n_rows <= max_cleaning_rows:
+            for row in run_cleaning(model, n_rows, seed):
+                print(f"{row['case']:<55} {row['time_s']:>9.4f} s {row['peak_mb']:>9.1f} MB")
+                results.append(row)
+    return results
+
+
+def save_results(results, path, meta):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({**meta, 'results': results}, f, indent=2)
+    print(f"\nResults written to '{path}'")
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return pd.DataFrame(json.load(f)['results'])
+
+
+def scaling_table(df_results):
+    """Time per case and size, plus the fitted exponent k of time ~ rows^k."""
+    df_pivot = df_results.pivot_table(index='case', columns='rows', values='time_s', sort=False)
+    sizes = df_pivot.columns.to_numpy(dtype=float)
+    if len(sizes) > 1:
+        log_n = np.log(sizes)
+        df_pivot['exponent'] = [
+            np.polyfit(log_n, np.log(np.clip(row, 1e-6, None)), 1)[0] for row in df_pivot[df_pivot.columns[:len(sizes)]].to_numpy()
+        ]
+    return df_pivot
+
+
+def compare(df_base, df_new, threshold, min_delta=0.005):
+    """
+    Joins two result sets on (case, rows). A case regresses when it is more
+    than threshold (relative) and min_delta seconds (absolute) slower.
+    """
+    df = df_base.merge(df_new, on=['case', 'rows'], suffixes=(' base', ' new'))
+    df['ratio'] = df['time_s new'] / df['time_s base']
+    df['regression'] = (df['ratio'] > 1 + threshold) & (df['time_s new'] - df['time_s base'] > min_delta)
+    return df[['case', 'rows', 'time_s base', 'time_s new', 'ratio', 'peak_mb base', 'peak_mb new', 'regression']]
+
+
+def report_comparison(df_cmp, threshold):
+    with pd.option_context('display.width', 200, 'display.max_rows', None):
+        print(df_cmp.round(4).to_string(index=False))
+    regressions = df_cmp[df_cmp['regression']]
+    if regressions.empty:
+        print(f"\nNo regressions beyond {threshold:.0%}.")
+        return True
+    print(f"\n{len(regressions)} regression(s) beyond {threshold:.0%}:")
+    for _, row in regressions.iterrows():
+        print(f"  {row['case']} @ {row['rows']} rows: {row['time_s base']:.4f}s -> {row['time_s new']:.4f}s (x{row['ratio']:.2f})")
+    return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cleaning, table, gap and learning hot paths on synthetic data.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Synthetic dataset sizes (rows).")
+    parser.add_argument('--group', nargs='+', choices=['cleaning', 'tables', 'gap', 'learning', 'charts'],
+                        help="Only run these case groups (default: all).")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case; the best is recorded.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic data.")
+    parser.add_argument('--max-cleaning-rows', type=int, default=50_000,
+                        help="Largest size the cleaning benchmark runs at (it round-trips an Excel file).")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Results JSON file.")
+    parser.add_argument('--baseline', help="Compare the new run against this results file.")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help="Only compare two existing results files.")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Relative slowdown flagged as regression (default 0.2).")
+    args = parser.parse_args()
+
+    if args.compare:
+        ok = report_comparison(compare(load_results(args.compare[0]), load_results(args.compare[1]), args.threshold),
+                               args.threshold)
+        sys.exit(0 if ok else 1)
+
+    results = run_benchmarks(args.sizes, args.group, args.repeat, args.seed, args.max_cleaning_rows)
+    save_results(results, args.output, {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'sizes': args.sizes,
+        'seed': args.seed,
+    })
+
+    df_results = pd.DataFrame(results)
+    print("\n--- Scaling (best time in seconds per size) ---")
+    with pd.option_context('display.width', 200, 'display.max_rows', None):
+        print(scaling_table(df_results).round(4).to_string())
+
+    if args.baseline:
+        ok = report_comparison(compare(load_results(args.baseline), df_results, args.threshold), args.threshold)
+        sys.exit(0 if ok else 1)
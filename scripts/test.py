@@ -1,51 +0,0 @@
-import numpy as np
-
-# Data durasi kerja dengan np.nan sebagai pengganti data kosong
-raw_data = [
-    3, 11, 8, 1, 0, 1, 6, 3, 1, 36, 0, 18, 3, 12, 1, 2, 9, 1, 2, 3, 4, 3, 12, 6, 6, 6, 6, 19, 3, 4, 12, 0, 
-    4, 2, 4, 14, 9, 0, 1, 2, 3, 1, 3, 5, 3, 6, 6, 0, 6, 0, 1, 6, 0, 6, 7, 1, 1, 2, 0, 9, 6, 1, 1, 10, 0, 
-    2, 4, np.nan, 8, 2, 6, 6, 1, 1, 24, 6, 0, 18, 4, 6, 8, 3, 5, 3, 1, 10, np.nan, 1, np.nan, 2, 1, 0, 0, 
-    3, np.nan, 10, 1, 6, 8, 0, 4, 2, 1, 4, 3, 0, 0, 2, 8, 1, 3, 0, 4, 1, 0, 3, 4, 0, 0, np.nan, 6, 8, 
-    np.nan, 11, 1, 4, 3, 6, 0, 5, 6, 0, 0, 5, 0, np.nan, 5, 1, 0, 24, 3, 0, 0, 7, 5, 1, 1, 1, 3, 3, 3, 
-    np.nan, 12, 0, 7, np.nan, 7, 6, 0, 2, 3, 3, 1, 7, 7, 1, 0, 6, 0, 0, 7, 3, 5, 1, 0, 9, 0, 9, 7, 9, 8, 
-    6, 0, 4, np.nan, np.nan, 24, 12, 3, 7, 0, 2, 0, 6, 5, 3, np.nan, 0, 5, 3, 5, 10, 2, 1, 3, 4, 0, 9, 4, 
-    5, 3, 0, 1, 2, 8, 3, 6, 1, 0, 10, 0, 8, 0, 0, 0, 5, 8, 1, 0, 9, 3, np.nan, np.nan, 0, 3, 0, 9, 3, 3, 
-    3, 5, 2, 6, 0, 1, 1, 1, 3, 0, 1, 7, 9, np.nan, 1, 5, 3, 3, 1, 0, 0, 7, 0, 0, 3, 0, 6, 0, 4, 0, 1, 5, 
-    3, 0, 0, 0, 10, 6, 1, 12, np.nan, 3, 0, 1, 36, np.nan, 0, 9, 1, np.nan, 6, 0, 2, 3, 5, 24, 12, 3, 1, 
-    0, 1, 24, 3, np.nan, 3, 0, 1, np.nan, 1, 9, 0, 8, 4, 6, 1, 1, 0, 0, 4, 6, 3, 3, 1, 6, 9, 1, 8, 1, 0, 
-    1, np.nan, 12, 0, 3, 11, 1, 0, 7, 8, 7, 0, 0, 12, 1, np.nan, 6, 5, 1, 0, np.nan, np.nan, 0, 3, 2, 6, 
-    5, 3, 2, 9, 3, 0, 9, 3, 9, 7, 0, 4, 1, 0, 4, 6, 6, 3, 5, 8, 5, 6, 5, 12, np.nan, 6, 1, 2, 6, 0, 6, 
-    3, 3, 0, 4, 0, 3, 0, 0, 0, 3, 2, 10, 11, 0, 8, 12, 2, 5, 8, 8, np.nan, 3, 12, 3, 12, 5, 5, 0, 1, 12, 
-    np.nan, 1, 1, 1, 3, np.nan, 12, 1, 7, 2, 6, 0, 4, 1, 1, 1, 8, 8, 2, 7, 8, 0, 0, 8, 2, 5, 3, 5, 8, 6, 
-    0, 3, 9, 4, 1, 5, 2, 0, 3, np.nan, 1, 0, 3, 12, 8, 6, 0, 12, 0, 3, 7, 4, 3, 2, 7, 7, 7, 1, 4, 8, 1, 
-    0, 12, 7, 0, 2, 2, 2, 0, 0, 0, 1, np.nan, 1, 0, 2, 3, 0, 3, 3, 1, 0, 1, 3, 7, 0, 3, 10, 1, 1, 1, 8, 
-    1, 3, 7, 7, 1, 3, 2, 7, 1, 0, 0, 1, 1, 6, 1, 13, 0, 4, 0, 12, 5, np.nan, 3, 5, 7, 4, 1, 7, 3, 1, 5, 
-    np.nan, 0, 5, 9, 8, 0, 1, 3, 1, 9, 1, 6, 3, 2, 1, 0, 6, np.nan, np.nan, np.nan, 12, 12, 7, 9, 12, 1, 
-    np.nan, 7, 6, 10, 2, 5, 3, 2, 7, 1, 2, 12, 4, 0, 6, 0, 1, 5, 1, 2, 0, np.nan, 3, 10, 3, 7, 12, 0, 5, 
-    1, 6, 7, np.nan, 8, 6, 4, np.nan, 1, 11, 8, 1, 0, 1, 1, 0, 3, 2, 12, 12, 12, np.nan, 6, 9, 8, 2, 8, 
-    1, 0, 1, 1, 3, 0, 1, 8, 0, 6, 1, 12, 13, np.nan, 1, 1, 12, np.nan, 0, 1, 12, 6, np.nan, 3, 1, 0, 
-    np.nan, 9, np.nan, 12, 6, 6, 11, 1, 12, 12, 11, 5, 1, 3, 12, 4, 17, np.nan, 6, 6, 3, 3, 14, 12, 13, 
-    6, 12, 8, 1, 12, 12, 3, 12, 7, 0, 5, 12, 2, 3, 24, 0, 3, 0, 24, 30, 2, 7, 2, 1, 1, 24, 1, 0, np.nan, 
-    3, 1, 8, 1, 3, 6, 3, 18, 12, 6, 4, 20, 24, 12, 17, 2, 2, np.nan, 1, 12, 6, 3, 1, 1, 3, 6, 6, 24, 
-    np.nan, 12, 72, 2, 6, 11, 12, 3, 12, 5, 12, 24, 21, 12, 9, 3, 1, 1, 10, 3, 0, 3, 12, 9, 8, 12, 16, 
-    12, 1, 2, 1, 24, 1, 6, np.nan
-]
-
-
-# Mengonversi list di atas menjadi NumPy Array
-durasi_array = np.array(raw_data)
-
-print(f"Jumlah data: {len(durasi_array)}")
-print(f"Contoh isi array: {durasi_array[:10]}")
-
-# Membuat Tabel (DataFrame)
-import pandas as pd
-df_test = pd.DataFrame({'Duration_Months': durasi_array})
-print("\n--- Tabel Durasi ---")
-print(df_test.head(10))
-print("\n--- Statistik Deskriptif ---")
-print(df_test.describe())
-
-# Optional: Simpan ke Excel jika dibutuhkan
-df_test.to_excel('test_duration_table.xlsx', index=False)
-print("\nTabel disimpan ke 'test_duration_table.xlsx'")
\ No newline at end of file
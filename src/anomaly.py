@@ -0,0 +1,188 @@
+import pandas as pd
+import numpy as np
+import argparse
+import os
+
+import schema
+from data_cache import load_cleaned
+from survival import follow_up_months
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = os.path.join(BASE_DIR, 'reports')
+ANOMALY_FILE = 'anomalies.csv'
+
+# Robust z-score (Iglewicz & Hoaglin): 0.6745 * (x - median) / MAD, flagged
+# above Z_LIMIT. Groups smaller than MIN_GROUP use the institution median.
+Z_LIMIT = 3.5
+MIN_GROUP = 5
+
+# Heavy-tailed counts are scored on log(1 + x)
+LOG_COLUMNS = ['jml_lamaran', 'jml_respon', 'jml_wawancara']
+
+# Masa tunggu may exceed the follow-up by this much (graduation month is a guess)
+FOLLOW_UP_SLACK = 6
+
+# Ordered answer scales scanned as numbers (level 1..k)
+ORDINAL_SCALES = [schema.LEVEL_KOMPETENSI, schema.LEVEL_METODE, schema.LEVEL_PENDAPATAN]
+ORDINAL_COLUMNS = ['keeratan']
+
+COLUMNS = ['ID', 'Jurusan', 'prodi', 'Kolom', 'Nilai', 'Aturan', 'Keterangan']
+
+
+def scanned_columns(df):
+    """Numeric answers and ordinal scales present in df, as {schema ID: column}."""
+    found = {}
+    for col_id, spec in schema.SCHEMA.items():
+        if col_id in ('id', 'tahun_lulus'):
+            continue
+        numeric = spec['dtype'] in ('int', 'float')
+        ordinal = spec['categories'] in ORDINAL_SCALES or col_id in ORDINAL_COLUMNS
+        col = schema.find_column(df, col_id)
+        if (numeric or ordinal) and col is not None:
+            found[col_id] = col
+    return found
+
+
+def numeric_matrix(df, columns):
+    """Float matrix of the scanned columns; ordinal answers become their level (1..k)."""
+    values = {}
+    for col_id, col in columns.items():
+        spec = schema.SCHEMA[col_id]
+        if spec['dtype'] == 'category':
+            codes = pd.Categorical(df[col], categories=spec['categories']).codes.astype(float)
+            codes[codes < 0] = np.nan
+            values[col_id] = codes + 1
+        else:
+            values[col_id] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+    return pd.DataFrame(values, index=df.index)
+
+
+def robust_z(values, groups):
+    """
+    Robust z-scores of every column at once: medians and MADs come from one
+    grouped transform each. Small groups fall back to the overall median/MAD;
+    a zero MAD gives no score.
+    """
+    grouped = values.groupby(groups.to_numpy())
+    size = grouped[values.columns[0]].transform('size').to_numpy()
+    median = grouped.transform('median')
+    mad = (values - median).abs().groupby(groups.to_numpy()).transform('median')
+
+    small = (size < MIN_GROUP) | groups.isna().to_numpy()
+    overall_median = values.median()
+    overall_mad = (values - overall_median).abs().median()
+    median[small] = overall_median.to_numpy()
+    mad[small] = overall_mad.to_numpy()
+    # Rows without a group got no transform result
+    median = median.fillna(overall_median)
+    mad = mad.fillna(overall_mad)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return 0.6745 * (values - median) / mad.where(mad > 0)
+
+
+def _flags(mask, col_id, rule, detail, values=None):
+    """Long-form records of the flagged rows of one rule."""
+    mask = np.asarray(mask, dtype=bool)
+    return pd.DataFrame({
+        'row': np.flatnonzero(mask),
+        'Kolom': col_id,
+        'Nilai': None if values is None else np.asarray(values)[mask],
+        'Aturan': rule,
+        'Keterangan': detail if np.isscalar(detail) else np.asarray(detail)[mask],
+    })
+
+
+def scan(df, group='prodi'):
+    """
+    Runs every anomaly rule over df (question texts or schema IDs):
+    - outlier: robust z-score per group (prodi) above Z_LIMIT, for all
+      numeric and ordinal columns (counts on a log scale);
+    - impossible: masa tunggu longer than the time since Tahun Lulus,
+      negative counts, responses > applications, interviews > responses;
+    - contradiction: answers to related questions that disagree.
+    Returns one row per (respondent, rule, column) with the respondent ID.
+    """
+    columns = scanned_columns(df)
+    if not columns:
+        return pd.DataFrame(columns=COLUMNS)
+    values = numeric_matrix(df, columns)
+    parts = []
+
+    group_col = schema.find_column(df, group)
+    groups = df[group_col] if group_col is not None else pd.Series('Total', index=df.index)
+    scores = values.copy()
+    logged = [c for c in LOG_COLUMNS if c in scores]
+    scores[logged] = np.log1p(scores[logged].clip(lower=0))
+    z = robust_z(scores, groups)
+    for col_id in columns:
+        zc = z[col_id].to_numpy()
+        outlier = np.abs(np.nan_to_num(zc)) > Z_LIMIT
+        parts.append(_flags(outlier, col_id, 'outlier', [f"z = {v:.1f}" for v in zc], values[col_id]))
+
+    col_lulus = schema.find_column(df, 'tahun_lulus')
+    if 'masa_tunggu' in values and col_lulus is not None:
+        limit = follow_up_months(df[col_lulus]) + FOLLOW_UP_SLACK
+        too_long = (values['masa_tunggu'] > limit).to_numpy()
+        parts.append(_flags(too_long, 'masa_tunggu', 'impossible',
+                            [f"> {v:.0f} bulan sejak lulus" for v in limit], values['masa_tunggu']))
+    for col_id in ('masa_tunggu', 'jml_lamaran', 'jml_respon', 'jml_wawancara'):
+        if col_id in values:
+            parts.append(_flags(values[col_id] < 0, col_id, 'impossible', 'nilai negatif', values[col_id]))
+    for col_id, previous in (('jml_respon', 'jml_lamaran'), ('jml_wawancara', 'jml_respon')):
+        if col_id in values and previous in values:
+            parts.append(_flags(values[col_id] > values[previous], col_id, 'impossible',
+                                [f"> {previous} ({v:g})" for v in values[previous]], values[col_id]))
+
+    col_6bln = schema.find_column(df, 'kerja_6bln')
+    if col_6bln is not None and 'masa_tunggu' in values:
+        answer = df[col_6bln].to_numpy()
+        mt = values['masa_tunggu'].to_numpy()
+        contradicts = ((answer == 'Ya') & (mt > 6)) | ((answer == 'Tidak') & (mt <= 6))
+        parts.append(_flags(contradicts, 'masa_tunggu', 'contradiction',
+                            [f"kerja <= 6 bulan: {a}" for a in answer], mt))
+    col_mulai = schema.find_column(df, 'mulai_cari')
+    if col_mulai is not None and 'jml_lamaran' in values:
+        not_searching = (df[col_mulai] == 'Saya tidak mencari kerja').to_numpy()
+        parts.append(_flags(not_searching & (values['jml_lamaran'] > 0).to_numpy(), 'jml_lamaran',
+                            'contradiction', 'tidak mencari kerja tetapi melamar', values['jml_lamaran']))
+
+    df_flags = pd.concat(parts, ignore_index=True)
+    rows = df_flags.pop('row').to_numpy()
+    for label, col_id in (('ID', 'id'), ('Jurusan', 'jurusan'), ('prodi', 'prodi')):
+        col = schema.find_column(df, col_id)
+        df_flags[label] = df[col].to_numpy()[rows] if col is not None else None
+    df_flags = df_flags[COLUMNS]
+    return df_flags.sort_values(['ID', 'Aturan', 'Kolom'], ignore_index=True, kind='stable')
+
+
+def summarize(df_flags, examples=5):
+    """Flag counts per (rule, column) with a few example IDs."""
+    if df_flags.empty:
+        return pd.DataFrame(columns=['Aturan', 'Kolom', 'Jumlah', 'Contoh ID'])
+    return (df_flags.groupby(['Aturan', 'Kolom'])
+            .agg(Jumlah=('ID', 'size'),
+                 **{'Contoh ID': ('ID', lambda ids: ', '.join(str(i) for i in ids.head(examples)))})
+            .reset_index().sort_values('Jumlah', ascending=False, ignore_index=True))
+
+
+def write_anomalies(df_flags, reports_dir=REPORTS_DIR):
+    path = os.path.join(reports_dir, ANOMALY_FILE)
+    df_flags.to_csv(path, index=False)
+    print(f"Anomaly table saved to '{path}' ({len(df_flags)} flags, {df_flags['ID'].nunique()} respondents)")
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scan the cleaned data for outliers, impossible values and contradictions.")
+    parser.add_argument('--group', default='prodi', help="Group of the robust z-scores (schema ID).")
+    parser.add_argument('--source', help="Cleaned file or dataset directory (default: cleaned_data.xlsx).")
+    args = parser.parse_args()
+
+    from console import print_styled_table
+
+    df_load = load_cleaned(args.source) if args.source else load_cleaned()
+    df_anomalies = scan(df_load, args.group)
+    print_styled_table(summarize(df_anomalies), "Ringkasan Anomali")
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    write_anomalies(df_anomalies)
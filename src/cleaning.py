@@ -1,220 +1,284 @@
 import pandas as pd
 import numpy as np
-import re
-
+import argparse
+import contextlib
+import heapq
+import io
 import os
+import shutil
+import tempfile
 
-# Define paths
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_RAW = os.path.join(BASE_DIR, 'data', 'raw', 'data.xlsx')
-DATA_PROCESSED_DIR = os.path.join(BASE_DIR, 'data', 'processed')
-REPORTS_DIR = os.path.join(BASE_DIR, 'reports')
-
-# Ensure output directories exist
-os.makedirs(DATA_PROCESSED_DIR, exist_ok=True)
-os.makedirs(REPORTS_DIR, exist_ok=True)
+import profiling
+import schema
+from data_cache import write_part, clear_parts
 
-df = pd.read_excel(DATA_RAW)
-initial_rows = len(df)
-print(f"Initial Row Count: {initial_rows}")
+# Define paths (overridable from the environment, e.g. for benchmarks on synthetic data)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_RAW = os.environ.get('TRACER_RAW_FILE', os.path.join(BASE_DIR, 'data', 'raw', 'data.xlsx'))
+DATA_PROCESSED_DIR = os.environ.get('TRACER_PROCESSED_DIR', os.path.join(BASE_DIR, 'data', 'processed'))
+REPORTS_DIR = os.environ.get('TRACER_REPORTS_DIR', os.path.join(BASE_DIR, 'reports'))
 
+# Streaming mode: cleaned chunks are appended to this dataset (one file per chunk)
+PARTS_DIRNAME = 'cleaned'
+EXCEL_MAX_ROWS = 1_048_575 # below the header row
 
 nim_col = "Nomor Induk Mahasiswa (NIM)"
 name_col = "Nama Mahasiswa"
-email_col = "Email Address"
-
-# 1. Remove rows where "Nama Mahasiswa" is empty
-print(f"Rows before removing empty names: {len(df)}")
-df = df.dropna(subset=[name_col])
-print(f"Rows after removing empty names: {len(df)}")
-
-# 2. Handle duplicates
-# Convert Timestamp to datetime for accurate sorting
-# Debug: Check for invalid timestamps
-df['Timestamp_parsed'] = pd.to_datetime(df['Timestamp'], errors='coerce')
-invalid_timestamps = df[df['Timestamp_parsed'].isna()]
-if not invalid_timestamps.empty:
-    print(f"Found {len(invalid_timestamps)} invalid timestamps:")
-    print(invalid_timestamps['Timestamp'].head())
-    # decided to drop them or keep them? For now, let's just use the coerced column and maybe drop NaT if essential for sorting
-    # If timestamp is NaT, we can't reliably sort "latest".
-    # Let's assume we drop them or keep them at the end. 
-    # For now, let's just proceed with coercion so the script runs.
-    df['Timestamp'] = df['Timestamp_parsed']
-else:
-    df['Timestamp'] = pd.to_datetime(df['Timestamp'])
-
-# Sort by Timestamp descending (latest first)
-df = df.sort_values(by='Timestamp', ascending=False)
-
-# Identify the exception NIM
-exception_nim = 4202014111
-
-# Split data
-exception_rows = df[df[nim_col] == exception_nim]
-other_rows = df[df[nim_col] != exception_nim]
-
-# Deduplicate 'other_rows' keeping the first (latest)
-print(f"Rows before deduplication (excluding exception): {len(other_rows)}")
-other_rows_cleaned = other_rows.drop_duplicates(subset=[nim_col], keep='first')
-print(f"Rows after deduplication: {len(other_rows_cleaned)}")
-
-# Combine back
-df_cleaned = pd.concat([other_rows_cleaned, exception_rows])
-
-print(f"Final row count: {len(df_cleaned)}")
-print(f"Exception NIM {exception_nim} count: {len(exception_rows)} (should be preserved)")
-
-# Assign back to df for further processing
-df = df_cleaned
 
-# Debug: Clean column names to ensure 'Jurusan' is accessible
-df.columns = df.columns.str.strip()
-
-# Deduplicate columns (in case stripping caused duplicates)
-df = df.loc[:, ~df.columns.duplicated()]
-
-# Split "Program Studi" into "diploma" and "prodi"
-# User requested adding 'diploma', and then grouping by Jurusan, prodi, diploma.
-# We will generate 'diploma' and 'prodi' (cleaned name) while KEEPING 'Program Studi'.
-prodi_col = "Program Studi"
-print("Splitting 'Program Studi' into 'diploma' and 'prodi'...")
-split_data = df[prodi_col].str.split(' - ', n=1, expand=True)
-df['diploma'] = split_data[0]
-df['prodi'] = split_data[1]
-
-# Verify columns exist
-print("Columns after split:", df.columns.tolist())
-
-# Fix inconsistent data (Jurusan="Ilmu Kelautan dan Perikanan", prodi="Teknik Sipil")
-# User requested to change Jurusan to "Teknik Sipil dan Perencanaan" instead of removing.
-print("\n--- Fixing Inconsistent Data ---")
-rows_before = len(df)
-
-# Identify the rows
-mask_inconsistent = (df['Jurusan'] == 'Ilmu Kelautan dan Perikanan') & (df['prodi'] == 'Teknik Sipil')
-inconsistent_count = mask_inconsistent.sum()
-print(f"Found {inconsistent_count} inconsistent rows to fix.")
-
-if inconsistent_count > 0:
-    # Update Jurusan
-    df.loc[mask_inconsistent, 'Jurusan'] = 'Teknik Sipil dan Perencanaan'
-    print("Inconsistent rows updated.")
+# Kept with all of its submissions when deduplicating NIM
+exception_nim = 4202014111
 
-rows_after = len(df)
-print(f"Rows after fixing inconsistent data: {rows_after} (Should be same as before)")
+col_status = "Jelaskan status Anda saat ini?"
+# User requested to keep 'rev2' as is.
+col_duration_rev2 = "Dalam berapa bulan Anda mendapatkan pekerjaan? Tulis dengan angka (Contoh: 1, 1Tahun = 12 bulan) rev2"
 
+final_columns = [
+    "ID",
+    "Tahun Lulus",
+    "Jurusan",
+    "diploma",
+    "prodi",
+    "Jelaskan status Anda saat ini?",
+    "Apakah anda telah mendapatkan pekerjaan <=6 bulan / termasuk bekerja sebelum lulus?",
+    "Dalam berapa bulan Anda mendapatkan pekerjaan? Tulis dengan angka (Contoh: 1, 1Tahun = 12 bulan) rev2",
+    "Berapa rata-rata pendapatan Anda per bulan?",
+    "Provinsi rev",
+    "Kota/Kabupate rev",
+    "Apa jenis Perusahaan/Instansi/Institusi tempat Anda bekerja sekarang? rev",
+    "Apaila berwiraswasta, apa posisi/jabatan Anda saat ini? (Status Wiraswasta)",
+    "Apa tingkat tempat kerja Anda? rev",
+    "Sumber biaya",
+    "Sumber dana dalam pembiayaan kuliah (bukan ketika studi lanjut) rev",
+    "Seberapa erat hubungan bidang studi dengan pekerjaan Anda?",
+    "Tingkat pendidikan apa yang paling tepat/sesuai untuk pekerjaan Anda saat ini?",
+    "Etika 1",
+    "Keahlian berdasarkan bidang ilmu 1",
+    "Bahasa Inggris 1",
+    "Penggunaan Teknologi Informasi 1",
+    "Komunikasi 1",
+    "Kerjasama Tim 1",
+    "Pengembangan 1",
+    "Etika 2",
+    "Keahlian berdasarkan bidang ilmu 2",
+    "Bahasa Inggris 2",
+    "Penggunaan Teknologi Informasi 2",
+    "Komunikasi 2",
+    "Kerjasama Tim 2",
+    "Pengembangan 2",
+    "Perkuliahan",
+    "Demonstrasi",
+    "Partisipasi dalam proyek riset",
+    "Magang",
+    "Praktikum",
+    "Kerja Lapangan",
+    "Diskusi",
+    "Kapan Anda mulai cari pekerjaan? (Mohon pekerjaan sambilan tidak dimasukkan)",
+    "Bagaimana Anda mencari pekerjaan tersebut? (jawaban bisa lebih dari satu",
+    "Berapa Perusahaan/Instansi/Institusi yang sudah Anda lamar (lewat surel atau email) sebelum Anda memperoleh pekerjaan pertama? rev",
+    "Berapa banyak Perusahaan/Instansi/Institusi yang merespon lamaran Anda? rev",
+    "Berapa banyak Perusahaann/Instansi/Institusi yang mengundang Anda untuk wawancara? rev",
+    "Apakah Anda aktif mencari pekerjaan dalam 4 minggu terakhir? rev",
+    "Jika menurut Anda pekerjaan saat ini tidak sesuai dengan pendidikan Anda, mengapa  mengambilnya? Jawaban bisa lebih dari satu"
+]
 
-report_path = os.path.join(REPORTS_DIR, 'cleaning_report.txt')
-with open(report_path, 'w') as f:
-    f.write(f"Rows before removing inconsistent data: {rows_before}\n")
-    f.write(f"Inconsistent rows removed: {inconsistent_count}\n")
-    f.write(f"Rows after removing inconsistent data: {rows_after}\n")
 
+# --- Reading ---
 
+def read_raw(path=DATA_RAW):
+    if path.lower().endswith('.csv'):
+        return pd.read_csv(path)
+    return pd.read_excel(path)
 
-# Create Group Table
-print("\n--- Group Table (Jurusan, prodi, diploma) ---")
-if 'Jurusan' in df.columns:
-    group_table = df.groupby(['Jurusan', 'prodi', 'diploma']).size().reset_index(name='Count')
-    print(group_table)
-    
-    # Optional: Save group table
-    group_table_path = os.path.join(DATA_PROCESSED_DIR, 'group_table.xlsx')
-    group_table.to_excel(group_table_path, index=False)
-    print(f"Group table saved to '{group_table_path}'")
-else:
-    print("CRITICAL: 'Jurusan' column still NOT FOUND.")
-    # Debug print to help identify the issue if it persists
-    print("Available columns:", df.columns.tolist())
-
-# Remove columns as requested by user
-cols_to_remove = [
-    'Timestamp', 
-    'Timestamp_parsed', # Also remove the parsed one if it exists
-    'Email Address', 
-    'Nama Mahasiswa', 
-    'Nomor Handphone', 
-    'NIK'
-]
-print(f"\n--- Removing Columns: {cols_to_remove} ---")
-# Only drop columns that exist to avoid errors
-cols_to_drop = [c for c in cols_to_remove if c in df.columns]
-df = df.drop(columns=cols_to_drop)
-print(f"Columns removed. Remaining columns: {len(df.columns)}")
-
-
-# --- Clean Active Job Search Column ---
-print("\n--- Processing Active Job Search Column ---")
-col_active_search = "Apakah Anda aktif mencari pekerjaan dalam 4 minggu terakhir?"
-col_active_search_rev = "Apakah Anda aktif mencari pekerjaan dalam 4 minggu terakhir? rev"
-
-valid_active_search_values = [
-    "Tidak", 
-    "Tidak, tapi saya sedang menunggu hasil lamaran kerja", 
-    "Ya, saya akan mulai bekerja dalam 2 minggu kedepan", 
-    "Ya, tapi saya belum pasti akan bekerja dalam 2minggu kedepan"
-]
 
-if col_active_search in df.columns:
-    def map_active_search(val):
-        if pd.isna(val):
-            return "Lainnya"
-        s_val = str(val).strip()
-        if s_val in valid_active_search_values:
-            return s_val
-        else:
-            return "Lainnya"
-
-    df[col_active_search_rev] = df[col_active_search].apply(map_active_search)
-    print(f"Created '{col_active_search_rev}'")
-    print("Value Counts:")
-    print(df[col_active_search_rev].value_counts())
-else:
-    print(f"WARNING: Column '{col_active_search}' not found.")
-
-# --- Status and Duration Analysis ---
-print("\n--- Processing Status and Duration ---")
-col_status = "Jelaskan status Anda saat ini?"
-col_duration = "Dalam berapa bulan Anda mendapatkan pekerjaan? Tulis dengan angka (Contoh: 1, 1Tahun = 12 bulan)"
+def _convert_cell(value):
+    # Same conversions as pandas' openpyxl reader
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
 
 
+def _to_frame(header, rows):
+    from pandas.io.parsers import TextParser
+    width = len(header)
+    rows = [row[:width] + [""] * (width - len(row)) for row in rows]
+    return TextParser([header] + rows, header=0, skip_blank_lines=False).read()
 
-# Clean Duration Column if it exists (it might have been removed if user requested, but check list)
-# Wait, did user remove it? The previous step removed "Timestamp, Email, Name, Phone, NIK".
-# Duration is "Dalam berapa bulan...". Use checks.
 
-# User requested to keep 'rev2' as is.
-col_duration_rev2 = "Dalam berapa bulan Anda mendapatkan pekerjaan? Tulis dengan angka (Contoh: 1, 1Tahun = 12 bulan) rev2"
-if col_duration_rev2 not in df.columns:
-    print(f"WARNING: Duration column '{col_duration_rev2}' not found in source.")
-    col_duration_rev2 = None
-else:
-    print(f"Using original data for: {col_duration_rev2}")
-
-# Create Status Table
-if col_status in df.columns:
-    print(f"Analyzing column: {col_status}")
-    status_counts = df[col_status].value_counts().reset_index()
-    status_counts.columns = ['Status', 'Count']
-    print(status_counts)
-    
-    # Save Status Table
-    # Save Status Table
-    status_table_path = os.path.join(DATA_PROCESSED_DIR, 'status_table.xlsx')
-    status_counts.to_excel(status_table_path, index=False)
-    print(f"Status table saved to '{status_table_path}'")
-else:
-    print(f"WARNING: Status column '{col_status}' not found.")
+def iter_raw_chunks(path=DATA_RAW, chunk_rows=50_000):
+    """
+    Streams the raw export as DataFrames of at most chunk_rows rows. Workbooks
+    are read row by row (openpyxl read-only mode); values are parsed like
+    pd.read_excel would, so a chunk equals the same slice of read_raw().
+    """
+    if path.lower().endswith('.csv'):
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+        return
 
-# --- Mapping Kategori Perusahaan ---
-print("\n--- Mapping Company Categories ---")
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        header = [_convert_cell(v) for v in next(rows, ())]
+        while header and header[-1] == "":
+            header.pop()
+        if not header:
+            return
+        buffer = []
+        for row in rows:
+            buffer.append([_convert_cell(v) for v in row])
+            if len(buffer) == chunk_rows:
+                yield _to_frame(header, buffer)
+                buffer = []
+        # Trailing empty rows are not part of the sheet
+        while buffer and all(v == "" for v in buffer[-1]):
+            buffer.pop()
+        if buffer:
+            yield _to_frame(header, buffer)
+    finally:
+        wb.close()
+
+
+# --- Global stages (need every row) ---
+
+def drop_empty_names(df):
+    # 1. Remove rows where "Nama Mahasiswa" is empty
+    print(f"Rows before removing empty names: {len(df)}")
+    df = df.dropna(subset=[name_col])
+    print(f"Rows after removing empty names: {len(df)}")
+    return df
+
+
+def parse_timestamps(series):
+    """Submission times; unparseable values become NaT (sorted last)."""
+    parsed = pd.to_datetime(series, errors='coerce')
+    invalid = series[parsed.isna()]
+    if not invalid.empty:
+        print(f"Found {len(invalid)} invalid timestamps:")
+        print(invalid.head())
+    return parsed
+
+
+def deduplicate_nim(df):
+    """
+    Keeps the latest submission per NIM. All submissions of the exception
+    NIM are preserved. Returns the rows latest first.
+    """
+    # 2. Handle duplicates
+    # Convert Timestamp to datetime for accurate sorting
+    df = df.copy()
+    df['Timestamp'] = parse_timestamps(df['Timestamp'])
+
+    # Sort by Timestamp descending (latest first)
+    df = df.sort_values(by='Timestamp', ascending=False)
+
+    # Split data
+    exception_rows = df[df[nim_col] == exception_nim]
+    other_rows = df[df[nim_col] != exception_nim]
+
+    # Deduplicate 'other_rows' keeping the first (latest)
+    print(f"Rows before deduplication (excluding exception): {len(other_rows)}")
+    other_rows_cleaned = other_rows.drop_duplicates(subset=[nim_col], keep='first')
+    print(f"Rows after deduplication: {len(other_rows_cleaned)}")
+
+    # Combine back
+    df_cleaned = pd.concat([other_rows_cleaned, exception_rows])
+
+    print(f"Final row count: {len(df_cleaned)}")
+    print(f"Exception NIM {exception_nim} count: {len(exception_rows)} (should be preserved)")
+    return df_cleaned
+
+
+# --- Row-local stages (can run chunk by chunk) ---
+
+def normalize_headers(df):
+    # Debug: Clean column names to ensure 'Jurusan' is accessible
+    df.columns = df.columns.str.strip()
+
+    # Deduplicate columns (in case stripping caused duplicates)
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    # Align headers that drifted in case/whitespace (e.g. "? Rev") with the schema registry
+    return schema.canonicalize_columns(df)
+
+
+def split_program_studi(df):
+    # Split "Program Studi" into "diploma" and "prodi"
+    # User requested adding 'diploma', and then grouping by Jurusan, prodi, diploma.
+    # We will generate 'diploma' and 'prodi' (cleaned name) while KEEPING 'Program Studi'.
+    prodi_col = "Program Studi"
+    print("Splitting 'Program Studi' into 'diploma' and 'prodi'...")
+    df = df.copy()
+    split_data = df[prodi_col].str.split(' - ', n=1, expand=True)
+    df['diploma'] = split_data[0]
+    df['prodi'] = split_data[1] if 1 in split_data.columns else np.nan
+    return df
+
+
+def fix_inconsistent_jurusan(df):
+    # Fix inconsistent data (Jurusan="Ilmu Kelautan dan Perikanan", prodi="Teknik Sipil")
+    # User requested to change Jurusan to "Teknik Sipil dan Perencanaan" instead of removing.
+    print("\n--- Fixing Inconsistent Data ---")
+    mask_inconsistent = (df['Jurusan'] == 'Ilmu Kelautan dan Perikanan') & (df['prodi'] == 'Teknik Sipil')
+    inconsistent_count = mask_inconsistent.sum()
+    print(f"Found {inconsistent_count} inconsistent rows to fix.")
+
+    if inconsistent_count > 0:
+        # Update Jurusan
+        df.loc[mask_inconsistent, 'Jurusan'] = 'Teknik Sipil dan Perencanaan'
+        print("Inconsistent rows updated.")
+    return df
+
+
+def drop_columns(df):
+    # Remove columns as requested by user
+    cols_to_remove = [
+        'Timestamp',
+        'Timestamp_parsed', # Also remove the parsed one if it exists
+        'Email Address',
+        'Nama Mahasiswa',
+        'Nomor Handphone',
+        'NIK'
+    ]
+    print(f"\n--- Removing Columns: {cols_to_remove} ---")
+    # Only drop columns that exist to avoid errors
+    cols_to_drop = [c for c in cols_to_remove if c in df.columns]
+    df = df.drop(columns=cols_to_drop)
+    print(f"Columns removed. Remaining columns: {len(df.columns)}")
+    return df
+
+
+def _map_allowed(series, allowed):
+    """Keeps values from the allowed list (after stripping); anything else is 'Lainnya'."""
+    stripped = series.astype(str).str.strip()
+    return stripped.where(series.notna() & stripped.isin(allowed), "Lainnya")
+
+
+def map_active_search(df):
+    # --- Clean Active Job Search Column ---
+    print("\n--- Processing Active Job Search Column ---")
+    col_active_search = "Apakah Anda aktif mencari pekerjaan dalam 4 minggu terakhir?"
+    col_active_search_rev = "Apakah Anda aktif mencari pekerjaan dalam 4 minggu terakhir? rev"
+
+    valid_active_search_values = [
+        "Tidak",
+        "Tidak, tapi saya sedang menunggu hasil lamaran kerja",
+        "Ya, saya akan mulai bekerja dalam 2 minggu kedepan",
+        "Ya, tapi saya belum pasti akan bekerja dalam 2minggu kedepan"
+    ]
 
-# --- Mapping Kategori Perusahaan ---
-print("\n--- Mapping Company Categories ---")
+    if col_active_search in df.columns:
+        df[col_active_search_rev] = _map_allowed(df[col_active_search], valid_active_search_values)
+        print(f"Created '{col_active_search_rev}'")
+        print("Value Counts:")
+        print(df[col_active_search_rev].value_counts())
+    else:
+        print(f"WARNING: Column '{col_active_search}' not found.")
+    return df
 
-# --- Mapping Kategori Perusahaan ---
-print("\n--- Mapping Company Categories ---")
 
 def mapping_rev_v2(teks):
     t = str(teks).strip().lower()
@@ -285,75 +349,59 @@ def mapping_rev_v2(teks):
     return 'lainnya'
 
 
-# 2. Identifikasi Nama Kolom
-kolom_asal = "Apa jenis Perusahaan/Instansi/Institusi tempat Anda bekerja sekarang?"
-kolom_rev = "Apa jenis Perusahaan/Instansi/Institusi tempat Anda bekerja sekarang? rev"
+def map_company_category(df):
+    # --- Mapping Kategori Perusahaan ---
+    print("\n--- Mapping Company Categories ---")
+    kolom_asal = "Apa jenis Perusahaan/Instansi/Institusi tempat Anda bekerja sekarang?"
+    kolom_rev = "Apa jenis Perusahaan/Instansi/Institusi tempat Anda bekerja sekarang? rev"
+
+    if kolom_asal in df.columns:
+        print("Applying V2 revised mapping function...")
+        # Free-text answers repeat a lot; map each distinct value once
+        values = df[kolom_asal]
+        df[kolom_rev] = values.map({v: mapping_rev_v2(v) for v in values.unique()})
+        print(f"Created new column '{kolom_rev}' based on V2 mapping.")
+    else:
+        print(f"WARNING: Column '{kolom_asal}' NOT FOUND. Skipping mapping.")
+    return df
+
+
+def add_validation_column(df):
+    # --- Validation Column ---
+    # "valid column for Dalam berapa bulan Anda mendapatkan pekerjaan"
+    # 1 if (<=6 bulan == "Ya" AND duration <= 6) OR (<=6 bulan == "Tidak" AND (duration > 6 OR empty)) else 0
+    col_valid_name = "valid column for Dalam berapa bulan Anda mendapatkan pekerjaan"
+    col_check_6bulan = "Apakah anda telah mendapatkan pekerjaan <=6 bulan / termasuk bekerja sebelum lulus?"
+
+    print("\n--- Adding Validation Column ---")
+    if col_duration_rev2 in df.columns and col_check_6bulan in df.columns:
+        val_6bulan = df[col_check_6bulan].astype(str)
+        duration = pd.to_numeric(df[col_duration_rev2], errors='coerce')
+        cond1 = (val_6bulan == "Ya") & (duration <= 6)
+        cond2 = (val_6bulan == "Tidak") & ((duration > 6) | duration.isna())
+        df[col_valid_name] = (cond1 | cond2).astype(int)
+        print(f"Created '{col_valid_name}'. Found {df[col_valid_name].sum()} flagged rows.")
+    else:
+        print(f"WARNING: Could not create validation column. Missing columns: "
+              f"{[c for c in (col_check_6bulan, col_duration_rev2) if c not in df.columns]}")
+    return df
+
+
+def map_workplace_level(df):
+    # --- Clean Workplace Level Column ---
+    col_tingkat = "Apa tingkat tempat kerja Anda?"
+    col_tingkat_rev = "Apa tingkat tempat kerja Anda? rev"
+
+    print("\n--- Cleaning Workplace Level Column ---")
+    if col_tingkat in df.columns:
+        # Remove leading numbers and space (e.g., "1 Lokal..." -> "Lokal...")
+        df[col_tingkat_rev] = df[col_tingkat].str.replace(r'^\d+\s+', '', regex=True)
+        print(f"Created '{col_tingkat_rev}'.")
+    else:
+        print(f"WARNING: Column '{col_tingkat}' not found.")
+    return df
+
 
-if kolom_asal in df.columns:
-    # 3. Eksekusi Perubahan
-    print("Applying V2 revised mapping function...")
-    df[kolom_rev] = df[kolom_asal].apply(mapping_rev_v2)
-    print(f"Created new column '{kolom_rev}' based on V2 mapping.")
-    
-    # Check for 'Lainnya / Belum Terklasifikasi' to see what's left
-    unmapped = df[df[kolom_rev] == 'Lainnya / Belum Terklasifikasi']
-    if not unmapped.empty:
-        print(f"INFO: {len(unmapped)} rows classified as 'Lainnya'. Sample values:")
-        print(unmapped[kolom_asal].unique()[:20])
-else:
-    print(f"WARNING: Column '{kolom_asal}' NOT FOUND. Skipping mapping.")
-
-
-
-# --- Validation Column ---
-# "valid column for Dalam berapa bulan Anda mendapatkan pekerjaan"
-# 1 if (<=6 bulan == "Ya" AND duration > 6) OR (<=6 bulan == "Tidak" AND duration <= 6) else 0
-
-col_valid_name = "valid column for Dalam berapa bulan Anda mendapatkan pekerjaan"
-col_check_6bulan = "Apakah anda telah mendapatkan pekerjaan <=6 bulan / termasuk bekerja sebelum lulus?"
-
-print("\n--- Adding Validation Column ---")
-if col_duration_rev2 and col_check_6bulan in df.columns:
-    def validation_logic(row):
-        val_6bulan = str(row[col_check_6bulan])
-        duration = row[col_duration_rev2] # This is numeric or NaN
-        
-        # Condition 1: Claimed <= 6 months (Ya) AND duration <= 6 (VALID)
-        cond1 = (val_6bulan == "Ya") and (pd.notna(duration) and duration <= 6)
-        
-        # Condition 2: Claimed > 6 months (Tidak) AND (duration > 6 OR Empty) (VALID)
-        cond2 = (val_6bulan == "Tidak") and ((pd.notna(duration) and duration > 6) or pd.isna(duration))
-        
-        if cond1 or cond2:
-            return 1
-        else:
-            return 0
-
-    df[col_valid_name] = df.apply(validation_logic, axis=1)
-    print(f"Created '{col_valid_name}'. Found {df[col_valid_name].sum()} flagged rows.")
-    
-    # Debug sample
-    flagged = df[df[col_valid_name] == 1]
-    if not flagged.empty:
-        print("Sample flagged rows (Check 6bulan vs Duration):")
-        print(flagged[[col_check_6bulan, col_duration_rev2]].head())
-
-else:
-    print(f"WARNING: Could not create validation column. Missing columns: {col_check_6bulan if col_check_6bulan not in df.columns else ''} {col_duration_rev2 if not col_duration_rev2 else ''}")
-
-# --- Clean Workplace Level Column ---
-col_tingkat = "Apa tingkat tempat kerja Anda?"
-col_tingkat_rev = "Apa tingkat tempat kerja Anda? rev"
-
-print("\n--- Cleaning Workplace Level Column ---")
-if col_tingkat in df.columns:
-    # Remove leading numbers and space (e.g., "1 Lokal..." -> "Lokal...")
-    df[col_tingkat_rev] = df[col_tingkat].str.replace(r'^\d+\s+', '', regex=True)
-    print(f"Created '{col_tingkat_rev}'.")
-else:
-    print(f"WARNING: Column '{col_tingkat}' not found.")
-
-# --- Transform Competency Columns ---
 # User requested 1-5 to String mapping
 competency_mapping = {
     1: "Tidak Menguasai",
@@ -371,210 +419,360 @@ def map_competency(val):
     except:
         return val
 
-# Identify columns using robust whitespace stripping
-comp_cols_1 = ['Etika', 'Keahlian berdasarkan bidang ilmu', 'Bahasa Inggris', 'Penggunaan Teknologi Informasi', 'Komunikasi', 'Kerjasama Tim', 'Pengembangan']
-
-actual_cols_to_map = []
-
-# Map Set 1 (Suffix 1)
-for target in comp_cols_1:
-    found = False
-    for col in df.columns:
-        # Check patterns: "Name 1", "Name  1"
-        clean_col = col.strip()
-        if clean_col == target + " 1" or clean_col == target + "  1":
-            actual_cols_to_map.append(col)
-            found = True
-            break
-    if not found:
-        print(f"DEBUG: Set 1 target '{target}' (Suffix 1) NOT found matches.")
-
-# Map Set 2 (Suffix 2 or .1)
-for target in comp_cols_1:
-    found = False
-    for col in df.columns:
-        # Check patterns: "Name 2", "Name  2", "Name.1"
-        clean_col = col.strip()
-        if clean_col == target + " 2" or clean_col == target + ".1" or clean_col == target + "  2":
-             actual_cols_to_map.append(col)
-             found = True
-    if not found:
-        print(f"DEBUG: Set 2 target '{target}' NOT found matches.")
-
-print(f"\n--- Transforming Competency Columns ({len(actual_cols_to_map)}) ---")
-print(actual_cols_to_map)
-
-for col in actual_cols_to_map:
-    print(f"Mapping {col}...")
-    # Debug first value
-    first_val = df[col].iloc[0]
-    print(f"  First val before: {first_val} type {type(first_val)}")
-    df[col] = df[col].apply(map_competency)
-    print(f"  First val after: {df[col].iloc[0]}")
-
-# --- Mapping Sumber Dana ---
-print("\n--- Mapping Sources of Funding ---")
-col_funding = "Sumber dana dalam pembiayaan kuliah (bukan ketika studi lanjut)"
-col_funding_rev = "Sumber dana dalam pembiayaan kuliah (bukan ketika studi lanjut) rev"
-
-allowed_funding = [
-    "Biaya Sendiri/Keluarga", 
-    "Beasiswa ADIK", 
-    "Beasiswa BIDIKMISI", 
-    "Beasiswa PPA", 
-    "Beasiswa AFIRMASI", 
-    "Beasiswa Perusahaan/Swasta"
-]
 
-if col_funding in df.columns:
-    def map_funding(val):
-        if pd.isna(val):
-            return "Lainnya"
-        s_val = str(val).strip()
-        if s_val in allowed_funding:
-            return s_val
-        else:
-            return "Lainnya"
-
-    df[col_funding_rev] = df[col_funding].apply(map_funding)
-    print(f"Created '{col_funding_rev}'.")
-    print("Value Counts for new Funding Column:")
-    print(df[col_funding_rev].value_counts())
-else:
-    print(f"WARNING: Column '{col_funding}' not found.")
-
-# --- Mapping Employment Search Status ---
-print("\n--- Mapping Employment Search Status ---")
-col_search = "Apakah Anda aktif mencari pekerjaan dalam 4 minggu terakhir?"
-col_search_rev = "Apakah Anda aktif mencari pekerjaan dalam 4 minggu terakhir? rev"
-
-allowed_search_status = [
-    "Tidak",
-    "Tidak, tapi saya sedang menunggu hasil lamaran kerja",
-    "Ya, saya akan mulai bekerja dalam 2 minggu kedepan",
-    "Ya, tapi saya belum pasti akan bekerja dalam 2minggu kedepan"
-]
+def competency_columns(columns):
+    """Acquired (suffix 1) then required (suffix 2 or .1) competency columns, as found in columns."""
+    comp_cols_1 = ['Etika', 'Keahlian berdasarkan bidang ilmu', 'Bahasa Inggris', 'Penggunaan Teknologi Informasi', 'Komunikasi', 'Kerjasama Tim', 'Pengembangan']
+    found_cols = []
+    for suffixes, label in (((' 1', '  1'), 'Set 1'), ((' 2', '.1', '  2'), 'Set 2')):
+        for target in comp_cols_1:
+            matches = [col for col in columns if col.strip() in [target + s for s in suffixes]]
+            if not matches:
+                print(f"DEBUG: {label} target '{target}' NOT found matches.")
+            # Set 1 takes the first match only
+            found_cols.extend(matches[:1] if label == 'Set 1' else matches)
+    return found_cols
+
+
+def map_competencies(df):
+    # --- Transform Competency Columns ---
+    actual_cols_to_map = competency_columns(df.columns)
+    print(f"\n--- Transforming Competency Columns ({len(actual_cols_to_map)}) ---")
+    print(actual_cols_to_map)
+    for col in actual_cols_to_map:
+        df[col] = df[col].map(map_competency)
+    return df
+
+
+def map_funding(df):
+    # --- Mapping Sumber Dana ---
+    print("\n--- Mapping Sources of Funding ---")
+    col_funding = "Sumber dana dalam pembiayaan kuliah (bukan ketika studi lanjut)"
+    col_funding_rev = "Sumber dana dalam pembiayaan kuliah (bukan ketika studi lanjut) rev"
+
+    allowed_funding = [
+        "Biaya Sendiri/Keluarga",
+        "Beasiswa ADIK",
+        "Beasiswa BIDIKMISI",
+        "Beasiswa PPA",
+        "Beasiswa AFIRMASI",
+        "Beasiswa Perusahaan/Swasta"
+    ]
 
-if col_search in df.columns:
-    def map_search_status(val):
-        if pd.isna(val):
-             return "Lainnya"
-        s_val = str(val).strip()
-        if s_val in allowed_search_status:
-            return s_val
-        else:
-            return "Lainnya"
-
-    df[col_search_rev] = df[col_search].apply(map_search_status)
-    print(f"Created '{col_search_rev}'.")
-    print("Value Counts for new Search Status Column:")
-    print(df[col_search_rev].value_counts())
-else:
-    print(f"WARNING: Column '{col_search}' not found.")
-
-# --- Clean Learning Method Columns ---
-print("\n--- Cleaning Learning Method Columns ---")
-learning_cols = ['Perkuliahan', 'Demonstrasi', 'Partisipasi dalam proyek riset', 'Magang', 'Praktikum', 'Kerja Lapangan', 'Diskusi']
-
-# Find actual columns in df that contain these keywords (exact match preferred based on request)
-# User listed exact names. Let's check if they exist or need fuzzy match.
-# Based on previous `py -c` output: "Perkuliahan", "Demonstrasi" etc. seem to exist directly.
-for col in learning_cols:
-    if col in df.columns:
-        print(f"Cleaning column: {col}")
-        # Remove digits and strip whitespace
-        # Example "1 Sangat Besar" -> "Sangat Besar"
-        # Example " 1. Sangat Besar" -> ". Sangat Besar" -> "Sangat Besar" (if strip is enough? or need to remove dot?)
-        # User said "remove number character and white space".
-        # Let's assume standard cleaning: remove digits, then strip.
-        df[col] = df[col].astype(str).str.replace(r'\d+', '', regex=True).str.strip()
+    if col_funding in df.columns:
+        df[col_funding_rev] = _map_allowed(df[col_funding], allowed_funding)
+        print(f"Created '{col_funding_rev}'.")
+        print("Value Counts for new Funding Column:")
+        print(df[col_funding_rev].value_counts())
     else:
+        print(f"WARNING: Column '{col_funding}' not found.")
+    return df
+
+
+def clean_learning_methods(df):
+    # --- Clean Learning Method Columns ---
+    print("\n--- Cleaning Learning Method Columns ---")
+    learning_cols = ['Perkuliahan', 'Demonstrasi', 'Partisipasi dalam proyek riset', 'Magang', 'Praktikum', 'Kerja Lapangan', 'Diskusi']
+
+    for col in learning_cols:
         # Check for columns that might be variations (whitespace etc)
-        found = False
-        for existing in df.columns:
-            if existing.strip() == col:
-                print(f"Cleaning column (strip match): {existing}")
-                df[existing] = df[existing].astype(str).str.replace(r'\d+', '', regex=True).str.strip()
-                found = True
-                break
-        if not found:
-             print(f"WARNING: Learning method column '{col}' NOT FOUND.")
-
-
-# --- Final Column Selection ---
-print("\n--- Selecting Final Columns ---")
-final_columns = [
-    "ID",
-    "Tahun Lulus",
-    "Jurusan",
-    "diploma",
-    "prodi",
-    "Jelaskan status Anda saat ini?",
-    "Apakah anda telah mendapatkan pekerjaan <=6 bulan / termasuk bekerja sebelum lulus?",
-    "Dalam berapa bulan Anda mendapatkan pekerjaan? Tulis dengan angka (Contoh: 1, 1Tahun = 12 bulan) rev2",
-    "Berapa rata-rata pendapatan Anda per bulan?",
-    "Provinsi rev",
-    "Kota/Kabupate rev",
-    "Apa jenis Perusahaan/Instansi/Institusi tempat Anda bekerja sekarang? rev",
-    "Apaila berwiraswasta, apa posisi/jabatan Anda saat ini? (Status Wiraswasta)",
-    "Apa tingkat tempat kerja Anda? rev",
-    "Sumber biaya",
-    "Sumber dana dalam pembiayaan kuliah (bukan ketika studi lanjut) rev",
-    "Seberapa erat hubungan bidang studi dengan pekerjaan Anda?",
-    "Tingkat pendidikan apa yang paling tepat/sesuai untuk pekerjaan Anda saat ini?",
-    "Etika 1",
-    "Keahlian berdasarkan bidang ilmu 1",
-    "Bahasa Inggris 1",
-    "Penggunaan Teknologi Informasi 1",
-    "Komunikasi 1",
-    "Kerjasama Tim 1",
-    "Pengembangan 1",
-    "Etika 2",
-    "Keahlian berdasarkan bidang ilmu 2",
-    "Bahasa Inggris 2",
-    "Penggunaan Teknologi Informasi 2",
-    "Komunikasi 2",
-    "Kerjasama Tim 2",
-    "Pengembangan 2",
-    "Perkuliahan",
-    "Demonstrasi",
-    "Partisipasi dalam proyek riset",
-    "Magang",
-    "Praktikum",
-    "Kerja Lapangan",
-    "Diskusi",
-    "Kapan Anda mulai cari pekerjaan? (Mohon pekerjaan sambilan tidak dimasukkan)",
-    "Bagaimana Anda mencari pekerjaan tersebut? (jawaban bisa lebih dari satu",
-    "Berapa Perusahaan/Instansi/Institusi yang sudah Anda lamar (lewat surel atau email) sebelum Anda memperoleh pekerjaan pertama? rev",
-    "Berapa banyak Perusahaan/Instansi/Institusi yang merespon lamaran Anda? rev",
-    "Berapa banyak Perusahaann/Instansi/Institusi yang mengundang Anda untuk wawancara? rev",
-    "Apakah Anda aktif mencari pekerjaan dalam 4 minggu terakhir? rev",
-    "Jika menurut Anda pekerjaan saat ini tidak sesuai dengan pendidikan Anda, mengapa  mengambilnya? Jawaban bisa lebih dari satu"
+        existing = col if col in df.columns else next((c for c in df.columns if c.strip() == col), None)
+        if existing is None:
+            print(f"WARNING: Learning method column '{col}' NOT FOUND.")
+            continue
+        print(f"Cleaning column: {existing}")
+        # Remove digits and strip whitespace ("1 Sangat Besar" -> "Sangat Besar")
+        df[existing] = df[existing].astype(str).str.replace(r'\d+', '', regex=True).str.strip()
+    return df
+
+
+def select_final_columns(df):
+    # --- Final Column Selection ---
+    print("\n--- Selecting Final Columns ---")
+    # Verify columns exist before selecting
+    missing_cols = [c for c in final_columns if c not in df.columns]
+    if missing_cols:
+        print(f"WARNING: The following requested columns are MISSING: {missing_cols}")
+        print("Proceeding with available columns only.")
+    df = df[[c for c in final_columns if c in df.columns]]
+    print(f"Selected {len(df.columns)} columns.")
+    return df
+
+
+ROW_STAGES = [
+    ('normalize headers', normalize_headers),
+    ('split program studi', split_program_studi),
+    ('fix inconsistent jurusan', fix_inconsistent_jurusan),
+    ('drop columns', drop_columns),
+    ('map active search', map_active_search),
+    ('map company category', map_company_category),
+    ('validation column', add_validation_column),
+    ('map workplace level', map_workplace_level),
+    ('map competencies', map_competencies),
+    ('map funding', map_funding),
+    ('learning methods', clean_learning_methods),
+    ('select final columns', select_final_columns),
 ]
 
-# Verify columns exist before selecting
-missing_cols = [c for c in final_columns if c not in df.columns]
-if missing_cols:
-    print(f"WARNING: The following requested columns are MISSING: {missing_cols}")
-    print("Proceeding with available columns only.")
-    final_columns = [c for c in final_columns if c in df.columns]
 
-df = df[final_columns]
-print(f"Selected {len(df.columns)} columns.")
+def transform(df, profile=True):
+    """Applies the row-local stages in order (profiled as steps unless profile=False)."""
+    for name, func in ROW_STAGES:
+        if profile:
+            profiling.step(name, len(df))
+        df = func(df)
+    return df
+
+
+# --- Summary tables ---
+
+def group_counts(df):
+    return df.groupby(['Jurusan', 'prodi', 'diploma']).size()
 
-# Save to new file
-# Save to new file
-output_file = os.path.join(DATA_PROCESSED_DIR, 'cleaned_data.xlsx')
-df.to_excel(output_file, index=False)
-print(f"Cleaned data saved to {output_file}")
 
-print("\n=== FINAL REPORT ===")
-print(f"Initial Rows: {initial_rows}")
-print(f"Final Rows:   {len(df)}")
-print(f"Rows Removed: {initial_rows - len(df)}")
+def status_counts(df):
+    return df[col_status].value_counts()
 
-with open(report_path, 'w') as f:
-    f.write(f"Initial Rows: {initial_rows}\n")
-    f.write(f"Final Rows: {len(df)}\n")
-    f.write(f"Total Rows Removed: {initial_rows - len(df)}\n")
 
+def write_tables(groups, statuses, out_dir):
+    print("\n--- Group Table (Jurusan, prodi, diploma) ---")
+    group_table = groups.reset_index(name='Count')
+    print(group_table)
+    group_table_path = os.path.join(out_dir, 'group_table.xlsx')
+    group_table.to_excel(group_table_path, index=False)
+    print(f"Group table saved to '{group_table_path}'")
+
+    status_table = statuses.reset_index()
+    status_table.columns = ['Status', 'Count']
+    print(status_table)
+    status_table_path = os.path.join(out_dir, 'status_table.xlsx')
+    status_table.to_excel(status_table_path, index=False)
+    print(f"Status table saved to '{status_table_path}'")
+
+
+def write_summary(initial_rows, final_rows, reports_dir):
+    print("\n=== FINAL REPORT ===")
+    print(f"Initial Rows: {initial_rows}")
+    print(f"Final Rows:   {final_rows}")
+    print(f"Rows Removed: {initial_rows - final_rows}")
+
+    with open(os.path.join(reports_dir, 'cleaning_report.txt'), 'w') as f:
+        f.write(f"Initial Rows: {initial_rows}\n")
+        f.write(f"Final Rows: {final_rows}\n")
+        f.write(f"Total Rows Removed: {initial_rows - final_rows}\n")
+
+
+def scan_anomalies(df, reports_dir):
+    """Optional stage: outliers, impossible values and contradictions of the cleaned rows."""
+    import anomaly
+    print("\n--- Scanning for Anomalies ---")
+    df_flags = anomaly.scan(df)
+    print(anomaly.summarize(df_flags).to_string(index=False))
+    anomaly.write_anomalies(df_flags, reports_dir)
+
+
+# --- In-memory run ---
+
+def run(raw_path=DATA_RAW, out_dir=DATA_PROCESSED_DIR, reports_dir=REPORTS_DIR, anomalies=False):
+    """
+    Cleans the whole raw export in memory and writes cleaned_data.xlsx.
+    With anomalies=True the cleaned rows are also scanned (anomaly.py) and
+    the flags written to reports_dir/anomalies.csv.
+    """
+    profiling.step('read raw')
+    df = read_raw(raw_path)
+    initial_rows = len(df)
+    print(f"Initial Row Count: {initial_rows}")
+
+    profiling.step('drop empty names', len(df))
+    df = drop_empty_names(df)
+    profiling.step('deduplicate NIM', len(df))
+    df = deduplicate_nim(df)
+    df = transform(df)
+
+    if anomalies:
+        profiling.step('anomaly scan', len(df))
+        scan_anomalies(df, reports_dir)
+
+    profiling.step('summary tables', len(df))
+    write_tables(group_counts(df), status_counts(df), out_dir)
+
+    profiling.step('write excel', len(df))
+    output_file = os.path.join(out_dir, 'cleaned_data.xlsx')
+    df.to_excel(output_file, index=False)
+    print(f"Cleaned data saved to {output_file}")
+    profiling.step(None, len(df))
+
+    write_summary(initial_rows, len(df), reports_dir)
+    return df
+
+
+# --- Streaming run ---
+
+def _nim_key(value):
+    """NIM as text, so that 4202014111 and 4202014111.0 (chunks with gaps) match."""
+    if pd.isna(value):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _write_run(df, rows, path):
+    """
+    Sorted run of the external sort: (NIM, -timestamp, row) for the rows
+    competing in NIM deduplication. Missing timestamps sort last.
+    """
+    keys = df[nim_col].map(_nim_key).to_numpy(dtype=str)
+    stamps = parse_timestamps(df['Timestamp'])
+    missing = stamps.isna().to_numpy()
+    ts = stamps.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    ts[missing] = 0
+    neg_ts = np.where(missing, np.iinfo(np.int64).max, -ts)
+    run = np.empty(len(keys), dtype=[('nim', keys.dtype), ('neg_ts', np.int64), ('row', np.int64)])
+    run['nim'], run['neg_ts'], run['row'] = keys, neg_ts, rows
+    run.sort(order=['nim', 'neg_ts', 'row'])
+    np.save(path, run)
+
+
+def _iter_run(path, block_rows=65_536):
+    run = np.load(path, mmap_mode='r')
+    for start in range(0, len(run), block_rows):
+        yield from run[start:start + block_rows].tolist()
+
+
+def merge_runs(run_paths, keep):
+    """
+    k-way merge of the sorted runs; the first (latest) row of every NIM is
+    marked in keep, a boolean index over all raw rows.
+    """
+    last = None
+    for nim, _, row in heapq.merge(*(_iter_run(p) for p in run_paths)):
+        if nim != last:
+            keep[row] = True
+            last = nim
+
+
+def _append_excel(ws, df):
+    for row in df.itertuples(index=False):
+        ws.append([None if pd.isna(v) else v for v in row])
+
+
+def run_streaming(raw_path=DATA_RAW, out_dir=DATA_PROCESSED_DIR, reports_dir=REPORTS_DIR,
+                  chunk_rows=50_000, excel=True):
+    """
+    Cleans the raw export chunk by chunk with memory bounded by chunk_rows.
+
+    Pass 1 streams the raw rows, drops empty names, writes one sorted
+    (NIM, timestamp) run per chunk for the deduplication and spills the
+    chunk after the row-local stages. The runs are merged into the keep index
+    (one byte per raw row). Pass 2 filters the spilled chunks by the index and
+    appends them to the cleaned/ dataset (and cleaned_data.xlsx while it fits
+    in a worksheet). Rows keep their raw order instead of latest first.
+    """
+    parts_dir = os.path.join(out_dir, PARTS_DIRNAME)
+    tmp_dir = tempfile.mkdtemp(prefix='cleaning_', dir=out_dir)
+    try:
+        run_paths, spills = [], []
+        total_rows = kept_names = 0
+        with profiling.stage('pass 1: clean chunks') as record:
+            for i, chunk in enumerate(iter_raw_chunks(raw_path, chunk_rows)):
+                rows = np.arange(total_rows, total_rows + len(chunk))
+                total_rows += len(chunk)
+                named = chunk[name_col].notna().to_numpy()
+                chunk, rows = chunk[named], rows[named]
+                kept_names += len(chunk)
+
+                exception = (chunk[nim_col].map(_nim_key) == str(exception_nim)).to_numpy()
+                run_paths.append(os.path.join(tmp_dir, f'run-{i:05d}.npy'))
+                _write_run(chunk[~exception], rows[~exception], run_paths[-1])
+                spills.append((os.path.join(tmp_dir, f'chunk-{i:05d}.pkl'), rows[exception]))
+
+                # Stage output is shown for the first chunk only
+                quiet = contextlib.redirect_stdout(io.StringIO()) if i else contextlib.nullcontext()
+                with quiet:
+                    cleaned = transform(chunk, profile=False)
+                cleaned.insert(0, '_row', rows)
+                cleaned.to_pickle(spills[-1][0])
+                print(f"Chunk {i + 1}: {len(rows)} rows cleaned ({total_rows} read)")
+            record.rows_out = kept_names
+
+        print(f"Initial Row Count: {total_rows}")
+        print(f"Rows after removing empty names: {kept_names}")
+
+        with profiling.stage('deduplicate NIM (merge runs)', kept_names) as record:
+            keep = np.zeros(total_rows, dtype=bool)
+            merge_runs(run_paths, keep)
+            exception_count = 0
+            for _, exception_rows in spills:
+                keep[exception_rows] = True
+                exception_count += len(exception_rows)
+            record.rows_out = int(keep.sum())
+        print(f"Final row count: {int(keep.sum())}")
+        print(f"Exception NIM {exception_nim} count: {exception_count} (should be preserved)")
+
+        final_rows = int(keep.sum())
+        write_excel = excel and final_rows <= EXCEL_MAX_ROWS
+        if excel and not write_excel:
+            print(f"WARNING: {final_rows} rows do not fit in a worksheet; skipping cleaned_data.xlsx.")
+
+        with profiling.stage('pass 2: write dataset', kept_names) as record:
+            clear_parts(parts_dir)
+            if write_excel:
+                from openpyxl import Workbook
+                wb = Workbook(write_only=True)
+                ws = wb.create_sheet()
+            groups, statuses = [], []
+            for i, (spill, _) in enumerate(spills):
+                chunk = pd.read_pickle(spill)
+                chunk = chunk[keep[chunk.pop('_row').to_numpy()]]
+                os.remove(spill)
+                if i == 0 and write_excel:
+                    ws.append(list(chunk.columns))
+                if chunk.empty:
+                    continue
+                write_part(chunk, parts_dir)
+                if write_excel:
+                    _append_excel(ws, chunk)
+                groups.append(group_counts(chunk))
+                statuses.append(status_counts(chunk))
+            if write_excel:
+                output_file = os.path.join(out_dir, 'cleaned_data.xlsx')
+                wb.save(output_file)
+                print(f"Cleaned data saved to {output_file}")
+            record.rows_out = final_rows
+        print(f"Cleaned dataset written to '{parts_dir}'")
+
+        # Per-chunk counts add up to the totals
+        groups = pd.concat(groups).groupby(level=[0, 1, 2]).sum() if groups else pd.Series(dtype=int)
+        statuses = pd.concat(statuses).groupby(level=0).sum().sort_values(ascending=False, kind='stable') \
+            if statuses else pd.Series(dtype=int)
+        write_tables(groups, statuses, out_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    write_summary(total_rows, final_rows, reports_dir)
+    return final_rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean the raw tracer study export.")
+    parser.add_argument('--chunk-rows', type=int,
+                        help="Stream the export in chunks of this many rows (bounded memory) instead of loading it whole.")
+    parser.add_argument('--no-excel', action='store_true',
+                        help="Streaming mode: only write the cleaned/ dataset, not cleaned_data.xlsx.")
+    parser.add_argument('--profile', action='store_true', help="Record per-stage time and memory.")
+    parser.add_argument('--anomalies', action='store_true',
+                        help="Scan the cleaned rows for anomalies (in-memory run; for a streamed dataset "
+                             "run anomaly.py --source on it).")
+    args = parser.parse_args()
+
+    # Ensure output directories exist
+    os.makedirs(DATA_PROCESSED_DIR, exist_ok=True)
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+
+    if args.chunk_rows:
+        run_streaming(chunk_rows=args.chunk_rows, excel=not args.no_excel)
+    else:
+        run(anomalies=args.anomalies)
+    profiling.write_report('cleaning')
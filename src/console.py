@@ -0,0 +1,101 @@
+import os
+import sys
+
+import pandas as pd
+
+import formatting
+
+# Batch runs skip console tables: TRACER_QUIET=1 in the environment or
+# --quiet on the command line
+QUIET = os.environ.get('TRACER_QUIET', '').lower() in ('1', 'true', 'yes', 'on') or '--quiet' in sys.argv
+
+# Head limit (TRACER_MAX_ROWS; 0 prints every row) and cell width limit
+MAX_ROWS = int(os.environ.get('TRACER_MAX_ROWS', '0') or 0)
+MAX_WIDTH = 60
+ELLIPSIS = '...'
+
+
+def set_quiet(quiet=True):
+    global QUIET
+    QUIET = quiet
+
+
+def set_max_rows(max_rows):
+    global MAX_ROWS
+    MAX_ROWS = max_rows or 0
+
+
+def _text_columns(df, max_width, encoding):
+    """
+    Every column as text in one pass per column: missing cells become '-',
+    long cells are cut to max_width and characters the console cannot
+    encode are replaced.
+    """
+    columns = {}
+    for i in range(df.shape[1]):
+        text = df.iloc[:, i].astype(str).fillna(formatting.MISSING)
+        if max_width:
+            long = text.str.len() > max_width
+            if long.any():
+                text = text.where(~long, text.str.slice(0, max_width - len(ELLIPSIS)) + ELLIPSIS)
+        if encoding:
+            text = text.str.encode(encoding, 'replace').str.decode(encoding)
+        columns[i] = text
+    return columns
+
+
+def _console_encoding(stream):
+    """None when the stream takes any character (UTF-8), else its encoding."""
+    encoding = getattr(stream, 'encoding', None) or 'utf-8'
+    return None if encoding.lower().replace('-', '').startswith('utf') else encoding
+
+
+def render_table(df, title=None, index=None, max_rows=None, max_width=MAX_WIDTH, stream=None):
+    """
+    Writes df as a bordered text table, one row at a time. Recorded column
+    formats (formatting.formatted) are applied; named indexes are shown as
+    leading columns unless index=False. Only the first max_rows rows are
+    rendered (default MAX_ROWS, 0 for all).
+    """
+    stream = stream or sys.stdout
+    if title:
+        stream.write(f"\n[{title}]\n")
+    if df.empty:
+        stream.write("No data available.\n")
+        return
+
+    max_rows = MAX_ROWS if max_rows is None else max_rows
+    hidden = len(df) - max_rows if max_rows and len(df) > max_rows else 0
+    df_head = df.head(max_rows) if hidden else df
+    if index is None:
+        index = any(name is not None for name in df_head.index.names)
+    df_print = formatting.formatted(df_head)
+    if index:
+        df_head, df_print = df_head.reset_index(), df_print.reset_index()
+
+    encoding = _console_encoding(stream)
+    headers = [str(c) for c in df_print.columns]
+    if encoding:
+        headers = [h.encode(encoding, 'replace').decode(encoding) for h in headers]
+    columns = _text_columns(df_print, max_width, encoding)
+    widths = [max(len(h), int(columns[i].str.len().max() or 0)) for i, h in enumerate(headers)]
+    # Alignment follows the numbers, not their formatted text
+    numeric = [pd.api.types.is_numeric_dtype(df_head.iloc[:, i]) for i in range(len(headers))]
+
+    border = '+' + '+'.join('-' * (w + 2) for w in widths) + '+\n'
+    stream.write(border)
+    stream.write('| ' + ' | '.join(h.ljust(w) for h, w in zip(headers, widths)) + ' |\n')
+    stream.write(border)
+    cells = [columns[i].str.rjust(w) if numeric[i] else columns[i].str.ljust(w) for i, w in enumerate(widths)]
+    for row in zip(*(c.tolist() for c in cells)):
+        stream.write('| ' + ' | '.join(row) + ' |\n')
+    stream.write(border)
+    if hidden:
+        stream.write(f"({hidden} more rows not shown)\n")
+
+
+def print_styled_table(df, title=None, index=None, max_rows=None):
+    """Console table of df (nothing in quiet mode). See render_table."""
+    if QUIET:
+        return
+    render_table(df, title, index=index, max_rows=max_rows)
@@ -0,0 +1,180 @@
+import pandas as pd
+import glob
+import hashlib
+import json
+import os
+
+import schema
+
+# Optional pyarrow for the parquet cache; pickle is used without it
+try:
+    import pyarrow # noqa: F401
+except ImportError:
+    pyarrow = None
+
+# Setup Paths
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data', 'processed')
+DATA_FILE = os.path.join(DATA_DIR, 'cleaned_data.xlsx')
+CACHE_DIR = os.path.join(DATA_DIR, 'cache')
+
+
+def cache_path(source=DATA_FILE):
+    """Path of the columnar cache belonging to an Excel file."""
+    name = os.path.splitext(os.path.basename(source))[0]
+    ext = '.parquet' if pyarrow is not None else '.pkl'
+    return os.path.join(CACHE_DIR, name + ext)
+
+
+def _existing_cache(source=DATA_FILE):
+    """The cache file actually on disk (parquet or its pickle fallback), or None."""
+    path = cache_path(source)
+    for candidate in (path, os.path.splitext(path)[0] + '.pkl'):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def source_hash(source=DATA_FILE, chunk_size=1 << 20):
+    """SHA-256 of the source workbook."""
+    h = hashlib.sha256()
+    with open(source, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _meta_path(source=DATA_FILE):
+    return os.path.splitext(cache_path(source))[0] + '.json'
+
+
+def write_stamp(path, source, **extra):
+    """Records the size, mtime and SHA-256 of source (plus extra values) in the sidecar file path."""
+    stat = os.stat(source)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': source_hash(source), **extra}, f)
+
+
+def stamp_matches(path, source, **extra):
+    """
+    True when the sidecar file path was written for the current content of
+    source with the same extra values. Size and mtime are checked first; the
+    content hash settles the rest, so copies and checkouts (which reset
+    mtimes) are still recognised.
+    """
+    if not os.path.exists(path) or not os.path.exists(source):
+        return False
+    with open(path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    stat = os.stat(source)
+    if meta.get('size') != stat.st_size or any(meta.get(k) != v for k, v in extra.items()):
+        return False
+    return meta.get('mtime') == stat.st_mtime or meta.get('sha256') == source_hash(source)
+
+
+def is_fresh(source=DATA_FILE):
+    """
+    True when the cache was built from the current content of its source
+    with the current schema registry (headers are canonicalized through it).
+    """
+    return _existing_cache(source) is not None and \
+        stamp_matches(_meta_path(source), source, registry=schema.registry_hash())
+
+
+def write_cache(df, source=DATA_FILE):
+    """Writes df as the columnar cache of source. Returns the cache path."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = cache_path(source)
+    written = False
+    if path.endswith('.parquet'):
+        try:
+            df.to_parquet(path, index=False)
+            written = True
+        except Exception as e:
+            # Mixed-type object columns cannot always be stored as parquet
+            print(f"Warning: parquet cache failed ({e}), using pickle")
+            if os.path.exists(path):
+                os.remove(path)
+            path = os.path.splitext(path)[0] + '.pkl'
+    if not written:
+        df.to_pickle(path)
+
+    write_stamp(_meta_path(source), source, registry=schema.registry_hash())
+    return path
+
+
+def read_cache(source=DATA_FILE):
+    path = _existing_cache(source)
+    if path is None:
+        raise FileNotFoundError(f"No cache for {source}")
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _part_files(directory):
+    return sorted(glob.glob(os.path.join(directory, 'part-*.parquet')) + glob.glob(os.path.join(directory, 'part-*.pkl')))
+
+
+def write_part(df, directory):
+    """Appends df to a dataset directory as the next part file. Returns its path."""
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, f'part-{len(_part_files(directory)):05d}')
+    if pyarrow is not None:
+        try:
+            df.to_parquet(stem + '.parquet', index=False)
+            return stem + '.parquet'
+        except Exception as e:
+            print(f"Warning: parquet part failed ({e}), using pickle")
+            if os.path.exists(stem + '.parquet'):
+                os.remove(stem + '.parquet')
+    df.to_pickle(stem + '.pkl')
+    return stem + '.pkl'
+
+
+def clear_parts(directory):
+    """Removes the part files of a dataset directory."""
+    for path in _part_files(directory):
+        os.remove(path)
+
+
+def read_parts(directory):
+    """Concatenates the part files of a dataset directory in order."""
+    paths = _part_files(directory)
+    if not paths:
+        raise FileNotFoundError(f"No part files in {directory}")
+    return pd.concat([pd.read_parquet(p) if p.endswith('.parquet') else pd.read_pickle(p) for p in paths],
+                     ignore_index=True)
+
+
+def load_cleaned(source=DATA_FILE, refresh=False, ids=False):
+    """
+    Loads the cleaned data through the columnar cache. The Excel file is only
+    parsed when the cache is missing or out of date; headers are
+    canonicalized against the schema registry at that point.
+    ids=True returns the columns as schema IDs with registry dtypes.
+    source may also be a dataset directory written by cleaning.py --chunk-rows
+    (already columnar, read directly).
+    """
+    if os.path.isdir(source):
+        df = schema.canonicalize_columns(read_parts(source))
+        return schema.to_ids(df, dtypes=True) if ids else df
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"Data file not found at {source}")
+
+    df = None
+    if not refresh and is_fresh(source):
+        try:
+            df = read_cache(source)
+        except Exception as e:
+            print(f"Warning: could not read cache ({e}), re-reading {source}")
+
+    if df is None:
+        df = schema.canonicalize_columns(pd.read_excel(source))
+        write_cache(df, source)
+    return schema.to_ids(df, dtypes=True) if ids else df
+
+
+if __name__ == "__main__":
+    df_load = load_cleaned(refresh=True)
+    print(f"Cache written to '{cache_path()}' ({len(df_load)} rows, {len(df_load.columns)} columns)")
@@ -0,0 +1,88 @@
+import pandas as pd
+import numpy as np
+
+import schema
+
+WORKING_STATUS = ['Bekerja (Full time/Part time)', 'Wiraswasta']
+
+
+def _status_in(*statuses):
+    def mask(df):
+        col = schema.find_column(df, 'status')
+        # Without a status column the builders fall back to all rows
+        return df[col].isin(statuses).to_numpy() if col is not None else np.ones(len(df), dtype=bool)
+    return mask
+
+
+def _has_duration(df):
+    col = schema.find_column(df, 'masa_tunggu')
+    return pd.to_numeric(df[col], errors='coerce').notna().to_numpy() if col is not None \
+        else np.zeros(len(df), dtype=bool)
+
+
+def _kalbar(df):
+    col = schema.find_column(df, 'provinsi')
+    return (df[col] == 'Kalimantan Barat').to_numpy() if col is not None else np.zeros(len(df), dtype=bool)
+
+
+# Named row masks: name -> function(df) returning a boolean array
+MASKS = {
+    'working': _status_in(*WORKING_STATUS),
+    'employed': _status_in('Bekerja (Full time/Part time)'),
+    'has_duration': _has_duration,
+    'kalbar': _kalbar,
+}
+
+
+class Dataset:
+    """
+    The cleaned rows plus row masks and encodings that several builders
+    need. Each is computed on first use and kept; builders select the
+    columns they use through a mask instead of copying the whole frame.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._masks = {}
+        self._rows = {}
+        self._competencies = None
+
+    def __len__(self):
+        return len(self.df)
+
+    def mask(self, *names):
+        """Boolean array of the rows in all named masks (the combination is cached too)."""
+        key = tuple(sorted(names))
+        if key not in self._masks:
+            if len(key) == 1:
+                self._masks[key] = MASKS[key[0]](self.df)
+            else:
+                self._masks[key] = np.logical_and.reduce([self.mask(n) for n in key])
+        return self._masks[key]
+
+    def rows(self, *names):
+        """Positions of the rows in all named masks."""
+        key = tuple(sorted(names))
+        if key not in self._rows:
+            self._rows[key] = np.flatnonzero(self.mask(*names))
+        return self._rows[key]
+
+    def column(self, col, *names):
+        """
+        One column restricted to the named masks (col: question text or
+        schema ID). Only that column's selected values are copied.
+        """
+        series = self.df[schema.find_column(self.df, col) or col]
+        return series.iloc[self.rows(*names)] if names else series
+
+    def competencies(self):
+        """gap_analisis.encode_competencies() of all rows, encoded once."""
+        if self._competencies is None:
+            from gap_analisis import encode_competencies
+            self._competencies = encode_competencies(self.df)
+        return self._competencies
+
+
+def as_dataset(data):
+    """Wraps a DataFrame (builders accept either)."""
+    return data if isinstance(data, Dataset) else Dataset(data)
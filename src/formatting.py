@@ -0,0 +1,88 @@
+import pandas as pd
+import numpy as np
+
+# Display formats of numeric columns: printf pattern, divisor applied first
+# and the matching Excel number format. Builders keep their numbers and
+# name the format per column in df.attrs['formats']; the writers (HTML,
+# console, XLSX) apply them.
+FORMATS = {
+    'percent': ('%.2f%%', 1, '0.00"%"'),
+    'percent1': ('%.1f%%', 1, '0.0"%"'),
+    'number1': ('%.1f', 1, '0.0'),
+    'number2': ('%.2f', 1, '0.00'),
+    'rupiah': ('Rp%.1f juta', 1_000_000, '"Rp"#,##0'),
+}
+MISSING = '-'
+
+
+def set_formats(df, formats):
+    """Records {column: format name} in df.attrs (merged with earlier ones). Returns df."""
+    unknown = set(formats.values()) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown format(s): {', '.join(sorted(unknown))}")
+    df.attrs['formats'] = {**df.attrs.get('formats', {}), **formats}
+    return df
+
+
+def formats_of(df):
+    """{column: format name} of the columns df still has."""
+    return {col: name for col, name in df.attrs.get('formats', {}).items() if col in df.columns}
+
+
+def format_values(values, name):
+    """Formats a whole numeric column at once; text and missing values stay as they are."""
+    pattern, divisor, _ = FORMATS[name]
+    numbers = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+    missing = np.isnan(numbers)
+    text = np.char.mod(pattern, np.where(missing, 0.0, numbers / divisor)).astype(object)
+    original = pd.Series(values).to_numpy(dtype=object)
+    # Cells that were not numbers (labels in total rows, '-') are kept
+    text[missing] = np.where(pd.isna(original[missing]), MISSING, original[missing])
+    return text
+
+
+def formatted(df):
+    """Display copy of df with the recorded formats applied (df itself is unchanged)."""
+    formats = formats_of(df)
+    if not formats:
+        return df
+    df_display = df.copy()
+    for col, name in formats.items():
+        df_display[col] = pd.Series(format_values(df[col], name), index=df.index, dtype=object)
+    return df_display
+
+
+def excel_formats(df):
+    """{column: Excel number format} for writing df to XLSX with its numbers intact."""
+    return {col: FORMATS[name][2] for col, name in formats_of(df).items()}
+
+
+def _sheet_name(title, used):
+    """Excel sheet name: no []:*?/\\ characters, at most 31, unique."""
+    name = ''.join('-' if c in '[]:*?/\\' else c for c in title)[:31].strip() or 'Sheet'
+    base, i = name, 2
+    while name in used:
+        suffix = f" ({i})"
+        name = base[:31 - len(suffix)] + suffix
+        i += 1
+    used.add(name)
+    return name
+
+
+def write_excel(tables, path):
+    """
+    Writes {title: DataFrame} to one workbook, a sheet per table. Numbers
+    stay numbers; the recorded formats become Excel number formats.
+    """
+    used = set()
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for title, df in tables.items():
+            df_sheet = (df.reset_index() if df.index.name else df).rename(columns=str)
+            sheet = _sheet_name(title, used)
+            df_sheet.to_excel(writer, sheet_name=sheet, index=False)
+            ws = writer.sheets[sheet]
+            for col, number_format in excel_formats(df).items():
+                j = df_sheet.columns.get_loc(str(col)) + 1
+                for (cell,) in ws.iter_rows(min_row=2, min_col=j, max_col=j):
+                    cell.number_format = number_format
+    print(f"Workbook saved: {path} ({len(tables)} tables)")
@@ -1,12 +1,24 @@
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg') # Charts are rendered to buffers, also inside worker processes
 import matplotlib.pyplot as plt
 from math import pi
 import io
 import base64
 import os
 import sys
+import argparse
 import webbrowser
+from concurrent.futures import ProcessPoolExecutor
+
+import schema
+from data_cache import load_cleaned
+from dataset import as_dataset, WORKING_STATUS
+import console
+from console import print_styled_table
+import profiling
+from profiling import profiled
 
 # Setup Paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -30,6 +42,7 @@ COMPETENCY_MAP = {
     'Pengembangan Diri': ['Pengembangan']
 }
 
+@profiled()
 def load_data():
     """Loads the cleaned data."""
     if not os.path.exists(DATA_FILE):
@@ -42,7 +55,7 @@ def load_data():
             raise FileNotFoundError(f"Data file not found at {DATA_FILE} or {raw_path}")
     
     try:
-        df = pd.read_excel(DATA_FILE)
+        df = load_cleaned(DATA_FILE)
     except PermissionError:
         print(f"Warning: Access denied to {DATA_FILE}. It might be open. Trying raw data...")
         raw_path = os.path.join(BASE_DIR, 'data', 'raw', 'data.xlsx')
@@ -107,125 +120,203 @@ def get_column_pair(df, keywords):
 
     return col_acq, col_req
 
-def print_styled_table(df, title=None):
+# Competency levels scored by their position in the registry scale (the
+# inverse of cleaning.py's map) + common variations
+COMPETENCY_SCORE_MAP = {
+    **{level: score for score, level in enumerate(schema.LEVEL_KOMPETENSI, 1)},
+    # Common Likert
+    "Sangat Tinggi": 5, "Tinggi": 4, "Cukup": 3, "Rendah": 2, "Sangat Rendah": 1,
+    "Sangat Besar": 5, "Besar": 4, "Sedang": 3, "Kecil": 2, "Sangat Kecil": 1,
+    "Sangat Baik": 5, "Baik": 4, 
+}
+
+COL_STATUS = 'Jelaskan status Anda saat ini?'
+
+def parse_competency_value(x):
+    """Parses a single rating such as "5 - Sangat ..." or "Menguasai" to a score."""
+    if pd.isna(x): return np.nan
+    s = str(x).strip()
+    # Check if starts with digit
+    if s and s[0].isdigit():
+        try:
+            return float(s[0]) # naive 1-digit check
+        except:
+            pass
+    # Check text map: exact answers first, then the longest label contained
+    # in s (so "Kurang Menguasai" is not read as "Menguasai")
+    if s in COMPETENCY_SCORE_MAP:
+        return COMPETENCY_SCORE_MAP[s]
+    for k in sorted(COMPETENCY_SCORE_MAP, key=len, reverse=True):
+        if k.lower() in s.lower():
+            return COMPETENCY_SCORE_MAP[k]
+    return np.nan
+
+def convert_competency_series(series):
     """
-    Prints a pandas DataFrame in a styled format (Console).
+    Safe Convert to numeric using custom mapper if needed.
+    Every distinct answer is converted once and broadcast by its factorize code.
     """
-    if title:
-        print(f"\n[{title}]")
-    
-    if df.empty:
-        print("No data available.")
-        return
-        
-    try:
-        from tabulate import tabulate
-        try:
-             print(tabulate(df, headers='keys', tablefmt='psql', showindex=False))
-        except UnicodeEncodeError:
-             # Fallback for Windows Console encoding issues
-             df_safe = df.copy()
-             for col in df_safe.columns:
-                 df_safe[col] = df_safe[col].apply(lambda x: str(x).encode('ascii', 'ignore').decode('ascii'))
-             print(tabulate(df_safe, headers='keys', tablefmt='psql', showindex=False))
-    except ImportError:
-        print(df)
+    codes, uniques = pd.factorize(series)
+    # Try numeric first
+    values = pd.to_numeric(pd.Series(uniques, dtype=object), errors='coerce')
+    if values.isna().all():
+        # If all NaN, try mapping from known strings
+        values = pd.Series([parse_competency_value(val) for val in uniques], dtype=float)
+    out = np.full(len(series), np.nan)
+    answered = codes >= 0
+    out[answered] = values.to_numpy(dtype=float)[codes[answered]]
+    return pd.Series(out, index=series.index, name=series.name)
 
 def calculate_gap(df, filter_val, filter_col='Jurusan'):
     """
     Calculates Gap Analysis for a specific filter (Jurusan or Prodi).
+    df: DataFrame or dataset.Dataset; with a Dataset the working mask and the
+    encoded competencies are shared between calls instead of recomputed.
     Returns DataFrame results.
     """
-    # Filter Data: Working Status only
-    working_status = ['Bekerja (Full time/Part time)', 'Wiraswasta']
+    data = as_dataset(df)
+    df = data.df
     col_status = 'Jelaskan status Anda saat ini?'
     
     if col_status not in df.columns:
         print(f"DEBUG: Status column '{col_status}' not found. Available: {df.columns.tolist()[:5]}...")
         return pd.DataFrame() # handling mismatch names
         
-    df_filtered = df[
-        (df[filter_col] == filter_val) & 
-        (df[col_status].isin(working_status))
-    ].copy()
+    # Filter Data: Working Status only
+    in_group = (df[filter_col] == filter_val).to_numpy()
+    mask = in_group & data.mask('working')
     
-    if len(df_filtered) == 0:
-        print(f"DEBUG: No working respondents for {filter_val}. Total rows for {filter_val}: {len(df[df[filter_col] == filter_val])}")
+    if not mask.any():
+        print(f"DEBUG: No working respondents for {filter_val}. Total rows for {filter_val}: {int(in_group.sum())}")
         return pd.DataFrame()
     
     results = []
     
-    for comp_name, keywords in COMPETENCY_MAP.items():
-        col_acq, col_req = get_column_pair(df_filtered, keywords)
-        
-        if not col_acq or not col_req:
-             print(f"DEBUG: Could not find pair for {comp_name}. Keywords: {keywords}")
-             continue
-        
-        if col_acq and col_req:
-            # Debug: Check values
-            # print(f"DEBUG: Sample values for {comp_name} ({col_acq}): {df_filtered[col_acq].dropna().unique()[:3]}")
-
-            # Safe Convert to numeric using custom mapper if needed
-            def safe_convert(series):
-                # Try numeric first
-                s_num = pd.to_numeric(series, errors='coerce')
-                if s_num.notna().sum() > 0:
-                     return s_num
-                
-                # If mostly NaN, try mapping from known strings
-                # Inverse of cleaning.py map + common variations
-                map_score = {
-                    "Sangat Menguasai": 5,
-                    "Cukup Menguasai": 4, # Follow cleaning.py oddity or fix? Let's treat Cukup as 4 if cleaning says so.
-                    "Menguasai": 3,
-                    "Kurang Menguasai": 2,
-                    "Tidak Menguasai": 1,
-                    # Common Likert
-                    "Sangat Tinggi": 5, "Tinggi": 4, "Cukup": 3, "Rendah": 2, "Sangat Rendah": 1,
-                    "Sangat Besar": 5, "Besar": 4, "Sedang": 3, "Kecil": 2, "Sangat Kecil": 1,
-                    "Sangat Baik": 5, "Baik": 4, 
-                }
-                
-                # Clean strings: remove digits "5 - ...", lowercase matching?
-                # Helper to parse "5 - Sangat ..." -> 5
-                def parse_val(x):
-                    if pd.isna(x): return np.nan
-                    s = str(x).strip()
-                    # Check if starts with digit
-                    if s and s[0].isdigit():
-                        try:
-                            return float(s[0]) # naive 1-digit check
-                        except:
-                            pass
-                    # Check text map
-                    for k, v in map_score.items():
-                        if k.lower() in s.lower():
-                            return v
-                    return np.nan
-
-                return series.apply(parse_val)
-
-            acq_vals = safe_convert(df_filtered[col_acq])
-            req_vals = safe_convert(df_filtered[col_req])
-            
-            # print(f"DEBUG: Converted Means: {acq_vals.mean()} | {req_vals.mean()}")
-
+    # Codes 1-5, 0 = missing
+    names, acq, req = data.competencies()
+    for k, comp_name in enumerate(names):
+        acq_vals = acq[mask, k]
+        req_vals = req[mask, k]
+        acq_vals = acq_vals[acq_vals > 0]
+        req_vals = req_vals[req_vals > 0]
+
+        if len(acq_vals) and len(req_vals):
             acq_mean = acq_vals.mean()
             req_mean = req_vals.mean()
-            
-            if pd.notna(acq_mean) and pd.notna(req_mean):
-                gap = req_mean - acq_mean
-                
-                results.append({
-                    'Kompetensi': comp_name,
-                    'Acquired (Diperoleh)': round(acq_mean, 2),
-                    'Required (Dibutuhkan)': round(req_mean, 2),
-                    'Gap': round(gap, 2)
-                })
+            gap = req_mean - acq_mean
+
+            results.append({
+                'Kompetensi': comp_name,
+                'Acquired (Diperoleh)': round(acq_mean, 2),
+                'Required (Dibutuhkan)': round(req_mean, 2),
+                'Gap': round(gap, 2)
+            })
                 
     return pd.DataFrame(results)
 
+def encode_competencies(df):
+    """
+    Encodes every Acquired/Required competency column once into int8 matrices.
+    Returns (names, acq_codes, req_codes) where codes are 1-5 and 0 means missing.
+    """
+    names, acq_cols, req_cols = [], [], []
+    for comp_name, keywords in COMPETENCY_MAP.items():
+        col_acq, col_req = get_column_pair(df, keywords)
+        if not col_acq or not col_req:
+            print(f"DEBUG: Could not find pair for {comp_name}. Keywords: {keywords}")
+            continue
+        names.append(comp_name)
+        acq_cols.append(col_acq)
+        req_cols.append(col_req)
+
+    def to_codes(cols):
+        codes = np.zeros((len(df), len(cols)), dtype=np.int8)
+        for k, col in enumerate(cols):
+            vals = convert_competency_series(df[col]).to_numpy(dtype=float)
+            valid = (vals >= 1) & (vals <= 5)
+            codes[valid, k] = np.rint(vals[valid]).astype(np.int8)
+        return codes
+
+    return names, to_codes(acq_cols), to_codes(req_cols)
+
+@profiled()
+def calculate_gap_table(df, group_col='prodi', sort_by='gap'):
+    """
+    Vectorized gap table for all groups at once (working respondents only).
+    Returns a DataFrame indexed by group with one Gap column per competency,
+    plus 'Rata-rata Gap' and 'Responden'. sort_by: 'gap' (largest first) or 'name'.
+    """
+    group_id = schema.column_id(group_col) or group_col
+    if schema.find_column(df, 'status') is None or schema.find_column(df, group_id) is None:
+        return pd.DataFrame()
+
+    import gap_cube # Imported here because gap_cube builds on this module
+
+    cube = gap_cube.build_gap_cube(df, keys=[group_id, 'status'])
+    df_matrix = gap_cube.gap_matrix(cube, group_id)
+    if df_matrix.empty:
+        return df_matrix
+    df_matrix.index.name = group_col
+    return sort_gap_matrix(df_matrix, sort_by)
+
+# Row orders of the gap matrices (--sort) and how the report describes them
+GAP_SORT_CAPTIONS = {
+    'gap': "Baris diurutkan berdasarkan rata-rata gap (terbesar di atas).",
+    'name': "Baris diurutkan berdasarkan nama program studi.",
+}
+
+def sort_gap_matrix(df_matrix, sort_by='gap'):
+    """Orders the rows of a gap matrix: 'gap' (largest Rata-rata Gap first) or 'name'."""
+    if sort_by not in GAP_SORT_CAPTIONS:
+        raise ValueError(f"Unknown sort '{sort_by}' (choose from {', '.join(GAP_SORT_CAPTIONS)})")
+    if sort_by == 'name':
+        return df_matrix.sort_index()
+    return df_matrix.sort_values(by='Rata-rata Gap', ascending=False)
+
+@profiled()
+def create_gap_heatmap(df_matrix, title):
+    """Renders the group x competency gap matrix as a single heatmap (Base64)."""
+    if df_matrix.empty:
+        return None
+
+    df_plot = df_matrix.drop(columns=['Rata-rata Gap', 'Responden'], errors='ignore')
+    data = df_plot.to_numpy(dtype=float)
+    x_labels = df_plot.columns
+    y_labels = df_plot.index.astype(str)
+
+    # Dynamic height based on number of rows
+    fig, ax = plt.subplots(figsize=(12, len(y_labels) * 0.4 + 3))
+
+    # Symmetric range so that 0 (no gap) is the neutral colour
+    limit = np.nanmax(np.abs(data)) if np.isfinite(data).any() else 1
+    im = ax.imshow(data, cmap='RdBu_r', vmin=-limit, vmax=limit, aspect='auto')
+
+    ax.set_xticks(np.arange(len(x_labels)))
+    ax.set_yticks(np.arange(len(y_labels)))
+    ax.set_xticklabels(x_labels, rotation=45, ha="right", size=10)
+    ax.set_yticklabels(y_labels, size=9)
+
+    # Annotate
+    for i in range(len(y_labels)):
+        for j in range(len(x_labels)):
+            val = data[i, j]
+            if pd.notna(val):
+                text_color = "white" if abs(val) > limit * 0.6 else "black"
+                ax.text(j, i, f"{val:.2f}", ha="center", va="center", color=text_color, size=8)
+
+    cbar = ax.figure.colorbar(im, ax=ax, shrink=0.5)
+    cbar.ax.set_ylabel("Gap (Dibutuhkan - Diperoleh)", rotation=-90, va="bottom")
+
+    plt.title(f'Peta Gap Kompetensi\n{title}', size=14, weight='bold')
+    plt.tight_layout()
+
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format='png', bbox_inches='tight', dpi=300)
+    plt.close(fig)
+    buffer.seek(0)
+    return base64.b64encode(buffer.read()).decode('utf-8')
+
+@profiled()
 def create_radar_chart(df_gap, title):
     """Generates Radar Chart as Base64 String."""
     if df_gap.empty:
@@ -270,6 +361,7 @@ def create_radar_chart(df_gap, title):
     buffer.seek(0)
     return base64.b64encode(buffer.read()).decode('utf-8')
 
+@profiled()
 def create_ipa_chart(df_gap, title):
     """Generates IPA Chart as Base64 String."""
     if df_gap.empty:
@@ -326,48 +418,39 @@ def create_ipa_chart(df_gap, title):
     buffer.seek(0)
     return base64.b64encode(buffer.read()).decode('utf-8')
 
-def generate_full_report(jurusan_list=None):
-    df = load_data()
-    
-    if jurusan_list is None:
-        # Default: Analyze all Jurusan found in data
-        jurusan_list = df['Jurusan'].unique().tolist()
-        
-    print(f"Generating Gap Analysis Report for: {jurusan_list}")
-    
-    # Ensure 'prodi' column exists if likely needed
-    if 'prodi' not in df.columns and 'Program Studi' in df.columns:
-        print("Deriving 'prodi' from 'Program Studi'...")
-        try:
-            split_data = df['Program Studi'].astype(str).str.split(' - ', n=1, expand=True)
-            if split_data.shape[1] > 1:
-                df['prodi'] = split_data[1]
-            else:
-                df['prodi'] = df['Program Studi'] # Fallback
-        except Exception as e:
-            print(f"Warning: Could not split 'Program Studi': {e}")
-            df['prodi'] = df['Program Studi']
-    
-    html_sections = ""
-    
-    for i, jurusan in enumerate(jurusan_list):
-        print(f"Processing Jurusan: {jurusan}")
-        
-        # 1. Jurusan Level Gap Analysis
-        df_gap_jur = calculate_gap(df, jurusan, filter_col='Jurusan')
-        
-        if df_gap_jur.empty:
-            print(f"Skipping {jurusan} (Not enough data)")
-            continue
-            
-        print_styled_table(df_gap_jur, f"Gap Analysis: {jurusan}")
-        
-        # Charts
-        ipa_chart = create_ipa_chart(df_gap_jur, f"Jurusan {jurusan}")
-        jurusan_slug = f"jurusan_{i}"
-        
-        # HTML Block for Jurusan
-        html_sections += f"""
+def build_jurusan_section(df, jurusan, i, prodi_col, detail=False, df_tests=None):
+    """
+    Builds the HTML block (gap table, IPA chart, prodi radars) for one Jurusan.
+    Runs as an independent task, so it only sees the rows it is given.
+    Per-prodi tables and radar charts are only rendered when detail=True;
+    otherwise the institution heatmap covers the prodi level.
+    df_tests: paired_tests() rows for this Jurusan (both levels), attached to the tables.
+    Returns (html, console_tables) or None when the Jurusan has no usable data.
+    """
+    import gap_stats
+
+    console_tables = []
+    df_tests = df_tests or {}
+    # Working mask and competency codes are shared by the jurusan and prodi tables
+    data = as_dataset(df)
+
+    # 1. Jurusan Level Gap Analysis
+    df_gap_jur = calculate_gap(data, jurusan, filter_col='Jurusan')
+
+    if df_gap_jur.empty:
+        print(f"Skipping {jurusan} (Not enough data)")
+        return None
+
+    df_gap_jur = gap_stats.attach_significance(df_gap_jur, df_tests.get('Jurusan'))
+
+    console_tables.append((df_gap_jur, f"Gap Analysis: {jurusan}"))
+
+    # Charts
+    ipa_chart = create_ipa_chart(df_gap_jur, f"Jurusan {jurusan}")
+    jurusan_slug = f"jurusan_{i}"
+
+    # HTML Block for Jurusan
+    html = f"""
         <div class="section">
             <h2 style="background-color: #2c3e50; color: white; padding: 10px; border-radius: 5px;">Jurusan: {jurusan}</h2>
             <div style="display: flex; flex-wrap: wrap; gap: 20px; align-items: flex-start;">
@@ -386,36 +469,39 @@ def generate_full_report(jurusan_list=None):
                     {f'<img src="data:image/png;base64,{ipa_chart}" style="max-width: 100%; border: 1px solid #ddd; border-radius: 8px;">' if ipa_chart else 'No Chart'}
                 </div>
             </div>
+        """
+
+    if not detail:
+        html += "</div>" # End Jurusan Section
+        return html, console_tables
+
+    html += """
             <hr style="margin: 40px 0; border-top: 2px dashed #ccc;">
             
             <h3>Detail per Program Studi</h3>
         """
-        
-        # 2. Prodi Level (Turunan)
-        prodis = df[df['Jurusan'] == jurusan]['prodi'].copy().unique() # Copy to avoid SettingWithCopy warning on unique? No unique returns array.
-        # Handle prodi logic again just to be safe if 'prodi' missing from earlier block? 
-        # Actually it's guaranteed to exist or fallback in the header of this function.
-        if 'prodi' not in df.columns:
-             # Just in case fallback didn't run properly
-             if 'Program Studi' in df.columns:
-                  prodis = df[df['Jurusan'] == jurusan]['Program Studi'].unique()
-             else:
-                  prodis = []
-
-        for j, prodi in enumerate(prodis):
-            # print(f"  > Processing Prodi: {prodi}")
-            df_gap_prodi = calculate_gap(df, prodi, filter_col='prodi' if 'prodi' in df.columns else 'Program Studi')
-            
-            if df_gap_prodi.empty:
-                continue
-            
-            print_styled_table(df_gap_prodi, f"Gap Analysis Prodi: {prodi}")
-                
-            # Radar Chart for Prodi
-            radar_chart = create_radar_chart(df_gap_prodi, f"Prodi {prodi}")
-            prodi_slug = f"{jurusan_slug}_prodi_{j}"
-            
-            html_sections += f"""
+
+    # 2. Prodi Level (Turunan)
+    prodis = df[df['Jurusan'] == jurusan][prodi_col].unique() if prodi_col else []
+
+    for j, prodi in enumerate(prodis):
+        df_gap_prodi = calculate_gap(data, prodi, filter_col=prodi_col)
+
+        if df_gap_prodi.empty:
+            continue
+
+        df_tests_prodi = df_tests.get(prodi_col)
+        if df_tests_prodi is not None and not df_tests_prodi.empty:
+            df_tests_prodi = df_tests_prodi[df_tests_prodi[prodi_col] == prodi]
+        df_gap_prodi = gap_stats.attach_significance(df_gap_prodi, df_tests_prodi)
+
+        console_tables.append((df_gap_prodi, f"Gap Analysis Prodi: {prodi}"))
+
+        # Radar Chart for Prodi
+        radar_chart = create_radar_chart(df_gap_prodi, f"Prodi {prodi}")
+        prodi_slug = f"{jurusan_slug}_prodi_{j}"
+
+        html += f"""
             <div style="margin-left: 20px; margin-bottom: 40px; background: #f9f9f9; padding: 20px; border-radius: 8px; border-left: 5px solid #3498db;">
                 <h4 style="margin-top:0; color: #2980b9;">{prodi}</h4>
                 <div style="display: flex; flex-wrap: wrap; gap: 20px;">
@@ -435,8 +521,156 @@ def generate_full_report(jurusan_list=None):
                 </div>
             </div>
             """
-            
-        html_sections += "</div>" # End Jurusan Section
+
+    html += "</div>" # End Jurusan Section
+    return html, console_tables
+
+@profiled()
+def build_heatmap_section(cube, sort_by='gap'):
+    """
+    Institution-wide prodi x competency gap matrix, derived from the gap cube
+    and rendered as a single heatmap plus its table.
+    """
+    import gap_cube
+
+    df_matrix = schema.to_labels(gap_cube.gap_matrix(cube, 'prodi'))
+    if df_matrix.empty:
+        return ""
+    df_matrix = sort_gap_matrix(df_matrix, sort_by)
+
+    print_styled_table(df_matrix.round(2).reset_index(), "Gap Matrix: Program Studi x Kompetensi")
+    heatmap_chart = create_gap_heatmap(df_matrix, "Seluruh Program Studi")
+
+    return f"""
+        <div class="section">
+            <h2 style="background-color: #2c3e50; color: white; padding: 10px; border-radius: 5px;">Peta Gap Kompetensi per Program Studi</h2>
+            <p style="color: #7f8c8d;">Nilai positif (merah) berarti kompetensi yang dibutuhkan lebih tinggi dari yang diperoleh. {GAP_SORT_CAPTIONS[sort_by]}</p>
+            <div style="text-align: right; margin-bottom: 10px;">
+                <a href="data:image/png;base64,{heatmap_chart}" download="Heatmap_Gap_Prodi.png" style="background: #2980b9; color: white; text-decoration: none; padding: 5px 10px; border-radius: 4px; font-size: 0.9em;">Simpan Grafik HD</a>
+                <button onclick="saveTable('gap_matrix_table', 'Tabel_Gap_Prodi')" style="background: #27ae60; color: white; border: none; padding: 5px 10px; border-radius: 4px; cursor: pointer;">Simpan Tabel</button>
+            </div>
+            <img src="data:image/png;base64,{heatmap_chart}" style="max-width: 100%; border: 1px solid #ddd; border-radius: 8px;">
+            {df_matrix.reset_index().to_html(index=False, classes='table table-sm', border=0, table_id='gap_matrix_table', float_format=lambda x: f'{x:.2f}')}
+            <hr style="margin: 40px 0; border-top: 2px dashed #ccc;">
+        </div>
+        """
+
+@profiled()
+def build_trend_section(cube):
+    """Institution total and per-cohort (Tahun Lulus) gap trend, both rolled up from the cube."""
+    import gap_cube
+
+    df_total = gap_cube.rollup(cube)
+    if df_total.empty:
+        return ""
+    df_total = df_total[['Kompetensi', 'Acquired (Diperoleh)', 'Required (Dibutuhkan)', 'Gap']]
+    print_styled_table(df_total.round(2), "Gap Analysis: Institusi")
+
+    trend_html = ""
+    if 'tahun_lulus' in cube.columns:
+        df_trend = schema.to_labels(gap_cube.gap_matrix(cube, 'tahun_lulus')).sort_index().reset_index()
+        print_styled_table(df_trend.round(2), "Tren Gap per Tahun Lulus")
+        trend_html = f"""
+            <h3>Tren Gap per Tahun Lulus</h3>
+            {df_trend.to_html(index=False, classes='table table-sm', border=0, table_id='gap_trend_table', float_format=lambda x: f'{x:.2f}')}
+        """
+
+    return f"""
+        <div class="section">
+            <h2 style="background-color: #2c3e50; color: white; padding: 10px; border-radius: 5px;">Gap Kompetensi Institusi</h2>
+            {df_total.to_html(index=False, classes='table', border=0, table_id='gap_total_table', float_format=lambda x: f'{x:.2f}')}
+            {trend_html}
+            <hr style="margin: 40px 0; border-top: 2px dashed #ccc;">
+        </div>
+        """
+
+def _build_jurusan_task(task):
+    """Unpacks a (df, jurusan, index, prodi_col, detail, df_tests) tuple for ProcessPoolExecutor.map."""
+    return build_jurusan_section(*task)
+
+def generate_full_report(jurusan_list=None, workers=1, detail=False, sort_by='gap'):
+    df = load_data()
+    
+    if jurusan_list is None:
+        # Default: Analyze all Jurusan found in data
+        jurusan_list = df['Jurusan'].unique().tolist()
+        
+    print(f"Generating Gap Analysis Report for: {jurusan_list}")
+    
+    # Ensure 'prodi' column exists if likely needed
+    if 'prodi' not in df.columns and 'Program Studi' in df.columns:
+        print("Deriving 'prodi' from 'Program Studi'...")
+        try:
+            split_data = df['Program Studi'].astype(str).str.split(' - ', n=1, expand=True)
+            if split_data.shape[1] > 1:
+                df['prodi'] = split_data[1]
+            else:
+                df['prodi'] = df['Program Studi'] # Fallback
+        except Exception as e:
+            print(f"Warning: Could not split 'Program Studi': {e}")
+            df['prodi'] = df['Program Studi']
+
+    if 'prodi' in df.columns:
+        prodi_col = 'prodi'
+    elif 'Program Studi' in df.columns:
+        prodi_col = 'Program Studi'
+    else:
+        prodi_col = None
+
+    # Paired significance tests for every competency x Jurusan x prodi in one pass
+    import gap_stats
+    levels = (('Jurusan',), ('Jurusan', prodi_col)) if prodi_col else (('Jurusan',),)
+    with profiling.stage('paired tests', len(df)):
+        tests = gap_stats.paired_tests(df, levels=levels)
+
+    # One task per Jurusan. Each task gets only the rows of its Jurusan plus
+    # any other rows of its prodi, so the prodi gaps match a full-frame scan
+    # while keeping the payload sent to each worker small.
+    tasks = []
+    for i, jurusan in enumerate(jurusan_list):
+        mask = df['Jurusan'] == jurusan
+        if prodi_col:
+            mask |= df[prodi_col].isin(df.loc[mask, prodi_col].unique())
+        df_tests = {}
+        for level, df_level in tests.items():
+            if not df_level.empty:
+                df_tests[level[-1]] = df_level[df_level['Jurusan'] == jurusan]
+        tasks.append((df[mask], jurusan, i, prodi_col, detail, df_tests))
+
+    workers = max(1, min(workers or 1, len(tasks)))
+    print(f"Processing {len(tasks)} Jurusan with {workers} worker(s)...")
+    with profiling.stage(f'jurusan sections ({workers} workers)', len(df)) as record:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map() yields results in submission order, so the report is
+                # identical regardless of which worker finishes first.
+                results = list(executor.map(_build_jurusan_task, tasks))
+        else:
+            results = [_build_jurusan_task(task) for task in tasks]
+        record.rows_out = len(results)
+
+    # Institution level: one cube at the finest grain, everything else is a
+    # rollup. The cube is the pipeline's 'cube' output; it is only built here
+    # when the report runs without it.
+    import gap_cube
+    with profiling.stage('gap cube', len(df)) as record:
+        cube = gap_cube.load_gap_cube()
+        if cube.empty:
+            print(f"No saved gap cube at '{gap_cube.CUBE_FILE}', building it (run gap_cube.py to refresh it)")
+            cube = gap_cube.build_gap_cube(df)
+            gap_cube.save_gap_cube(cube)
+        record.rows_out = len(cube)
+
+    html_sections = build_trend_section(cube)
+    if 'prodi' in cube.columns:
+        html_sections += build_heatmap_section(cube, sort_by)
+    for result in results:
+        if result is None:
+            continue
+        html, console_tables = result
+        for df_table, title in console_tables:
+            print_styled_table(df_table, title)
+        html_sections += html
 
     # Wrap in Full HTML
     full_html = f"""
@@ -490,8 +724,9 @@ def generate_full_report(jurusan_list=None):
     """
     
     output_path = os.path.join(REPORTS_DIR, 'gap_analysis_report.html')
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(full_html)
+    with profiling.stage('write html'):
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(full_html)
         
     print(f"Report generated: {output_path}")
     
@@ -503,6 +738,28 @@ def generate_full_report(jurusan_list=None):
         print(f"Could not open browser: {e}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the competency gap analysis report.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Number of processes used to build Jurusan sections (default: CPU count). "
+                             "The report is identical for any value.")
+    parser.add_argument('--detail', action='store_true',
+                        help="Also render per-prodi gap tables and radar charts (slow for many prodi).")
+    parser.add_argument('--sort', choices=['gap', 'name'], default='gap',
+                        help="Row order of the prodi gap heatmap (default: largest average gap first).")
+    parser.add_argument('--profile', action='store_true',
+                        help="Record per-stage time and memory (same as TRACER_PROFILE=1).")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Skip the console tables (same as TRACER_QUIET=1).")
+    parser.add_argument('--max-rows', type=int, metavar='N',
+                        help="Print only the first N rows of each console table (same as TRACER_MAX_ROWS=N).")
+    args = parser.parse_args()
+    if args.profile:
+        profiling.enable()
+    if args.quiet:
+        console.set_quiet()
+    if args.max_rows is not None:
+        console.set_max_rows(args.max_rows)
+
     # Example Usage: Analyze Specific list or all
     # User said: "Tapi saya bisa mengubah-ngubah jurusan mana saja yang mau di analisis"
     # So we can define a list here easily.
@@ -525,6 +782,8 @@ if __name__ == "__main__":
         all_jurusan = df_load['Jurusan'].unique().tolist()
         # Filter raw names if needed or use cleaned
         valid_jurusan = [j for j in all_jurusan if isinstance(j, str)]
-        generate_full_report(valid_jurusan)
+        generate_full_report(valid_jurusan, workers=args.workers, detail=args.detail, sort_by=args.sort)
     except Exception as e:
         print(f"Error: {e}")
+
+    profiling.write_report('gap_analisis')
@@ -0,0 +1,143 @@
+import pandas as pd
+import numpy as np
+import os
+
+import schema
+from console import print_styled_table
+from dataset import WORKING_STATUS
+from gap_analisis import (
+    load_data,
+    encode_competencies,
+    DATA_DIR,
+)
+
+# Finest grain of the cube, as schema IDs. Jurusan is carried along as an
+# attribute of prodi so that every higher level (prodi -> Jurusan ->
+# institution) is a plain sum.
+CUBE_KEYS = ['jurusan', 'prodi', 'tahun_lulus', 'status']
+CUBE_FILE = os.path.join(DATA_DIR, 'gap_cube.csv')
+
+STAT_COLS = ['responden', 'acq_n', 'acq_sum', 'acq_sumsq', 'req_n', 'req_sum', 'req_sumsq']
+
+
+def build_gap_cube(df, keys=None):
+    """
+    Builds the competency gap cube: count, sum and sum of squares of the
+    Acquired and Required scores per competency at the finest grain
+    (prodi x Tahun Lulus x status). All respondents are kept; the working
+    filter is applied when rolling up. keys are schema IDs; df may use IDs
+    or question texts.
+    Returns a long DataFrame with one row per (keys..., Kompetensi).
+    """
+    if keys is None:
+        keys = CUBE_KEYS
+    columns = {k: schema.find_column(df, k) for k in keys}
+    keys = [k for k in keys if columns[k] is not None]
+    if not keys:
+        return pd.DataFrame()
+
+    names, acq, req = encode_competencies(df)
+    if not names:
+        return pd.DataFrame()
+
+    # Stack the per-row statistics of every competency side by side,
+    # then a single groupby-sum produces the whole cube.
+    blocks = {}
+    for prefix, codes in (('acq', acq), ('req', req)):
+        present = (codes > 0).astype(np.int32)
+        vals = codes.astype(np.int32)
+        for k, name in enumerate(names):
+            blocks[(name, f'{prefix}_n')] = present[:, k]
+            blocks[(name, f'{prefix}_sum')] = vals[:, k]
+            blocks[(name, f'{prefix}_sumsq')] = vals[:, k] ** 2
+
+    df_stats = pd.DataFrame(blocks, index=df.index)
+    df_stats.columns = pd.MultiIndex.from_tuples(df_stats.columns, names=['Kompetensi', 'stat'])
+    key_series = [df[columns[k]].rename(k) for k in keys]
+    grouped = df_stats.groupby(key_series, dropna=False).sum()
+    sizes = df.groupby(key_series, dropna=False).size()
+
+    cube = grouped.stack('Kompetensi', future_stack=True)
+    cube['responden'] = sizes.reindex(cube.index.droplevel('Kompetensi')).to_numpy()
+    cube = cube.reset_index()
+    cube.columns.name = None
+    return cube[keys + ['Kompetensi'] + STAT_COLS]
+
+
+def save_gap_cube(cube, path=CUBE_FILE):
+    """Writes the cube to disk (tens of KB, independent of the number of respondents)."""
+    cube.to_csv(path, index=False)
+    print(f"Gap cube saved to '{path}' ({len(cube)} rows)")
+
+
+def load_gap_cube(path=CUBE_FILE):
+    """Loads a previously saved cube, or returns an empty DataFrame."""
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    # Cubes saved before the schema registry used question texts as keys
+    return schema.to_ids(pd.read_csv(path))
+
+
+def rollup(cube, by=None, status=WORKING_STATUS):
+    """
+    Derives statistics for any level of the hierarchy by summation only.
+    by: list of key IDs (e.g. ['jurusan'], ['prodi', 'tahun_lulus']);
+        None or [] gives the institution total.
+    status: list of statuses to include (None for all respondents).
+    Returns a long DataFrame with n, mean and std for Acquired and Required.
+    """
+    if cube.empty:
+        return pd.DataFrame()
+
+    by = list(by or [])
+    df_cube = cube
+    if status is not None and 'status' in df_cube.columns:
+        df_cube = df_cube[df_cube['status'].isin(status)]
+
+    summed = df_cube.groupby(by + ['Kompetensi'], sort=False)[STAT_COLS].sum()
+
+    result = pd.DataFrame(index=summed.index)
+    for prefix, label in (('acq', 'Acquired (Diperoleh)'), ('req', 'Required (Dibutuhkan)')):
+        n = summed[f'{prefix}_n'].astype(float)
+        s = summed[f'{prefix}_sum']
+        ss = summed[f'{prefix}_sumsq']
+        mean = s / n.where(n > 0)
+        var = (ss - s * mean) / (n - 1).where(n > 1)
+        result[f'n {label}'] = summed[f'{prefix}_n']
+        result[label] = mean
+        result[f'Std {label}'] = np.sqrt(var.clip(lower=0))
+
+    result['Gap'] = result['Required (Dibutuhkan)'] - result['Acquired (Diperoleh)']
+    result['Responden'] = summed['responden']
+    return result.reset_index()
+
+
+def gap_matrix(cube, by, status=WORKING_STATUS):
+    """
+    Pivots a rollup into a wide group x competency gap matrix, with
+    'Rata-rata Gap' across competencies. by: key ID(s) forming the rows.
+    Index names stay IDs; use schema.to_labels() when rendering.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    df_roll = rollup(cube, by, status=status)
+    if df_roll.empty:
+        return pd.DataFrame()
+
+    order = list(dict.fromkeys(df_roll['Kompetensi']))
+    df_matrix = df_roll.pivot_table(index=by, columns='Kompetensi', values='Gap', sort=False)[order]
+    df_matrix.columns.name = None
+    df_matrix['Rata-rata Gap'] = df_matrix[order].mean(axis=1)
+    df_matrix['Responden'] = df_roll.groupby(by, sort=False)['Responden'].first()
+    return df_matrix
+
+
+if __name__ == "__main__":
+    df_load = load_data()
+    cube = build_gap_cube(df_load)
+    save_gap_cube(cube)
+
+    df_total = rollup(cube)
+    print_styled_table(df_total.round(2), "Gap Institusi (Bekerja/Wiraswasta)")
+
+    df_trend = schema.to_labels(gap_matrix(cube, 'tahun_lulus'))
+    print_styled_table(df_trend.round(2).reset_index(), "Tren Gap per Tahun Lulus")
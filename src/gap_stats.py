@@ -0,0 +1,200 @@
+import pandas as pd
+import numpy as np
+import math
+
+from console import print_styled_table
+from dataset import WORKING_STATUS
+from gap_analisis import (
+    load_data,
+    encode_competencies,
+    COL_STATUS,
+)
+
+# Optional scipy for exact t / normal tail probabilities
+try:
+    from scipy import stats as sp_stats
+except ImportError:
+    sp_stats = None
+
+# Paired differences (Required - Acquired) of 1-5 scores lie in -4..4,
+# stored as histogram bins 0..8.
+DIFF_VALUES = np.arange(-4, 5)
+N_BINS = len(DIFF_VALUES)
+
+# Levels tested by default: every Jurusan and every prodi within its Jurusan
+DEFAULT_LEVELS = (('Jurusan',), ('Jurusan', 'prodi'))
+
+
+def _normal_sf(x):
+    """Upper tail of the standard normal distribution."""
+    if sp_stats is not None:
+        return sp_stats.norm.sf(x)
+    return 0.5 * np.frompyfunc(math.erfc, 1, 1)(np.asarray(x, dtype=float) / math.sqrt(2)).astype(float)
+
+
+def _t_sf(x, dof):
+    """Upper tail of Student's t; falls back to the normal approximation without scipy."""
+    if sp_stats is not None:
+        return sp_stats.t.sf(x, dof)
+    return _normal_sf(x)
+
+
+def fdr_bh(p_values):
+    """Benjamini-Hochberg adjusted p-values (NaN entries are ignored)."""
+    p = np.asarray(p_values, dtype=float)
+    adjusted = np.full(p.shape, np.nan)
+    valid = ~np.isnan(p)
+    m = valid.sum()
+    if m == 0:
+        return adjusted
+
+    pv = p[valid]
+    order = np.argsort(pv)
+    ranked = pv[order] * m / np.arange(1, m + 1)
+    # Enforce monotonicity from the largest p-value downwards
+    ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+    out = np.empty(m)
+    out[order] = np.minimum(ranked, 1.0)
+    adjusted[valid] = out
+    return adjusted
+
+
+def paired_difference_histogram(df, keys):
+    """
+    Counts paired differences (Required - Acquired) per group, competency and
+    difference value in a single bincount over the int8 competency matrices.
+    Only working respondents with both ratings present are counted.
+    Returns (df_groups, names, hist) where hist has shape (groups, competencies, 9).
+    """
+    keys = [k for k in keys if k in df.columns]
+    names, acq, req = encode_competencies(df)
+    if not names or not keys or COL_STATUS not in df.columns:
+        return pd.DataFrame(columns=keys), names, np.zeros((0, len(names), N_BINS), dtype=np.int64)
+
+    working = df[COL_STATUS].isin(WORKING_STATUS).to_numpy()
+    df_keys = df.loc[working, keys]
+    gid = df_keys.groupby(keys, sort=True).ngroup().to_numpy() # -1 for missing keys
+    df_groups = df_keys.groupby(keys, sort=True).size().index.to_frame(index=False)
+
+    valid = gid >= 0
+    gid = gid[valid]
+    a = acq[working][valid].astype(np.int64)
+    r = req[working][valid].astype(np.int64)
+    paired = (a > 0) & (r > 0)
+    n_comp = len(names)
+
+    flat = (gid[:, None] * n_comp + np.arange(n_comp)[None, :]) * N_BINS + (r - a + 4)
+    n_groups = len(df_groups)
+    hist = np.bincount(flat[paired], minlength=n_groups * n_comp * N_BINS)
+    return df_groups, names, hist.reshape(n_groups, n_comp, N_BINS)
+
+
+def paired_tests_from_histogram(hist):
+    """
+    Paired t-test and Wilcoxon signed-rank test (zeros dropped, tie-corrected
+    normal approximation) for every histogram cell at once.
+    Returns a dict of arrays with shape hist.shape[:-1].
+    """
+    hist = hist.astype(float)
+    v = DIFF_VALUES.astype(float)
+
+    # Paired t-test from the moments of the difference
+    n = hist.sum(axis=-1)
+    sum_d = (hist * v).sum(axis=-1)
+    sum_d2 = (hist * v ** 2).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_d = sum_d / n
+        var_d = (sum_d2 - n * mean_d ** 2) / (n - 1)
+        sd_d = np.sqrt(np.clip(var_d, 0, None))
+        t_stat = mean_d / (sd_d / np.sqrt(n))
+        p_t = 2 * _t_sf(np.abs(t_stat), n - 1)
+        cohen_dz = mean_d / sd_d
+    # Undefined without spread (e.g. every pair differs by the same amount)
+    defined = (n > 1) & (sd_d > 0)
+    t_stat = np.where(defined, t_stat, np.nan)
+    p_t = np.where(defined, p_t, np.nan)
+    cohen_dz = np.where(defined, cohen_dz, np.nan)
+
+    # Wilcoxon signed-rank: all |d| = m share the average rank of their tie block
+    neg = hist[..., 3::-1] # |d| = 1..4 for negative differences
+    pos = hist[..., 5:]    # |d| = 1..4 for positive differences
+    ties = neg + pos
+    n_r = ties.sum(axis=-1)
+    before = np.cumsum(ties, axis=-1) - ties
+    avg_rank = before + (ties + 1) / 2
+    w_plus = (pos * avg_rank).sum(axis=-1)
+    w_minus = (neg * avg_rank).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = n_r * (n_r + 1) / 4
+        variance = n_r * (n_r + 1) * (2 * n_r + 1) / 24 - (ties ** 3 - ties).sum(axis=-1) / 48
+        z_stat = (w_plus - expected) / np.sqrt(variance)
+        p_w = 2 * _normal_sf(np.abs(z_stat))
+        rank_biserial = (w_plus - w_minus) / (n_r * (n_r + 1) / 2)
+    p_w = np.where(variance > 0, p_w, np.nan)
+
+    return {
+        'n': n,
+        'Mean Diff': mean_d,
+        't': t_stat,
+        'p (t-test)': p_t,
+        'Cohen dz': cohen_dz,
+        'W+': w_plus,
+        'z': z_stat,
+        'p (Wilcoxon)': p_w,
+        'Rank-biserial r': rank_biserial,
+    }
+
+
+def paired_tests(df, levels=DEFAULT_LEVELS):
+    """
+    Runs both paired tests for every competency at every requested level.
+    The histogram is built once at the finest grain (union of all level keys)
+    and summed up for coarser levels. p-values are BH-adjusted per level.
+    Returns { level_tuple: long DataFrame [keys..., Kompetensi, statistics...] }.
+    """
+    finest = list(dict.fromkeys(k for level in levels for k in level if k in df.columns))
+    df_groups, names, hist = paired_difference_histogram(df, finest)
+
+    results = {}
+    for level in levels:
+        keys = [k for k in level if k in finest]
+        if not keys or len(df_groups) == 0:
+            results[tuple(level)] = pd.DataFrame()
+            continue
+
+        flat = pd.DataFrame(hist.reshape(len(hist), -1))
+        summed = flat.groupby([df_groups[k].to_numpy() for k in keys], sort=True).sum()
+        level_hist = summed.to_numpy().reshape(len(summed), len(names), N_BINS)
+        tests = paired_tests_from_histogram(level_hist)
+
+        index = summed.index.set_names(keys).to_frame(index=False)
+        df_level = index.loc[index.index.repeat(len(names))].reset_index(drop=True)
+        df_level['Kompetensi'] = np.tile(names, len(index))
+        for stat, values in tests.items():
+            df_level[stat] = values.ravel()
+        df_level['p adj (t-test)'] = fdr_bh(df_level['p (t-test)'])
+        df_level['p adj (Wilcoxon)'] = fdr_bh(df_level['p (Wilcoxon)'])
+        results[tuple(level)] = df_level
+
+    return results
+
+
+def attach_significance(df_gap, df_tests):
+    """
+    Adds p-values and effect sizes to a calculate_gap() table.
+    df_tests: the rows of paired_tests() for the same group.
+    """
+    if df_gap.empty or df_tests is None or df_tests.empty:
+        return df_gap
+    cols = ['Kompetensi', 'p adj (t-test)', 'p adj (Wilcoxon)', 'Cohen dz']
+    df_out = df_gap.merge(df_tests[cols], on='Kompetensi', how='left')
+    df_out['Signifikan'] = np.where(df_out['p adj (Wilcoxon)'] < 0.05, 'Ya', 'Tidak')
+    return df_out
+
+
+if __name__ == "__main__":
+    df_load = load_data()
+    results = paired_tests(df_load)
+    for level, df_level in results.items():
+        n_sig = int((df_level['p adj (Wilcoxon)'] < 0.05).sum()) if not df_level.empty else 0
+        print_styled_table(df_level.round(4), f"Uji Berpasangan per {' / '.join(level)} ({n_sig} signifikan)")
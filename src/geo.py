@@ -0,0 +1,355 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import matplotlib.colors as mcolors
+
+from data_cache import CACHE_DIR
+
+try:
+    import folium
+except ImportError:
+    folium = None
+
+# Optional geopandas, only needed for the first download of the shapes
+try:
+    import geopandas as gpd
+except ImportError:
+    gpd = None
+
+# Database Koordinat Provinsi Indonesia (Latitude, Longitude)
+INDO_COORDS = {
+    'Aceh': (4.6951, 96.7494),
+    'Sumatera Utara': (2.1154, 99.5451),
+    'Sumatera Barat': (-0.7399, 100.8000),
+    'Riau': (0.2933, 101.7068),
+    'Jambi': (-1.4852, 102.4381),
+    'Sumatera Selatan': (-3.3194, 104.9144),
+    'Bengkulu': (-3.5778, 102.3464),
+    'Lampung': (-4.5586, 105.4068),
+    'Kepulauan Bangka Belitung': (-2.7411, 106.4406),
+    'Kepulauan Riau': (3.9456, 108.1428),
+    'DKI Jakarta': (-6.2088, 106.8456),
+    'Jawa Barat': (-6.9175, 107.6191),
+    'Jawa Tengah': (-7.1510, 110.1403),
+    'Daerah Istimewa Yogyakarta': (-7.7956, 110.3695),
+    'Jawa Timur': (-7.5360, 112.2384),
+    'Banten': (-6.4058, 106.0640),
+    'Bali': (-8.4095, 115.1889),
+    'Nusa Tenggara Barat': (-8.6529, 117.3616),
+    'Nusa Tenggara Timur': (-8.6574, 121.0794),
+    'Kalimantan Barat': (-0.2787, 111.4753),
+    'Kalimantan Tengah': (-1.6815, 113.3824),
+    'Kalimantan Selatan': (-3.0926, 115.2838),
+    'Kalimantan Timur': (0.5387, 116.4194),
+    'Kalimantan Utara': (3.0731, 116.0414),
+    'Sulawesi Utara': (0.6247, 123.9750),
+    'Sulawesi Tengah': (-1.4300, 121.4456),
+    'Sulawesi Selatan': (-3.6687, 119.9740),
+    'Sulawesi Tenggara': (-4.1449, 122.1746),
+    'Gorontalo': (0.6999, 122.4467),
+    'Sulawesi Barat': (-2.8441, 119.2321),
+    'Maluku': (-3.2385, 129.4936),
+    'Maluku Utara': (0.2120, 127.9791),
+    'Papua Barat': (-1.3361, 133.1747),
+    'Papua': (-4.2699, 138.0804),
+    'Sumatera Tengah': (-0.947, 100.417)
+}
+
+# Database Koordinat Kota/Kabupaten di Kalbar
+KALBAR_COORDS = {
+    'Pontianak': (-0.026330, 109.342504),
+    'Kubu Raya': (-0.468725, 109.378906),
+    'Ketapang': (-1.595914, 110.490723), # Approx center
+    'Mempawah': (0.334000, 109.116000),
+    'Sanggau': (0.120800, 110.586600),
+    'Sambas': (1.338700, 109.317500),
+    'Landak': (0.435700, 109.957500), # Ngabang
+    'Singkawang': (0.910300, 108.985000),
+    'Kayong Utara': (-1.144800, 109.957900), # Sukadana
+    'Sintang': (0.071100, 111.495200),
+    'Kapuas Hulu': (0.814300, 112.930400), # Putussibau
+    'Sekadau': (0.035700, 110.938800),
+    'Melawi': (-0.686500, 111.688100), # Nanga Pinoh
+    'Bengkayang': (0.931700, 109.529900)
+}
+
+# Map regions: shape source, its name property, point fallback and view.
+# highlight: region drawn on top in red and left out of the color scale
+# (Pontianak dwarfs the other cities). extra: synthetic round shapes
+# ((lon, lat), radius in degrees) for regions missing from the source.
+REGIONS = {
+    'provinsi': {
+        'url': "https://raw.githubusercontent.com/superpikar/indonesia-geojson/master/indonesia-province-simple.json",
+        'name_property': 'Propinsi',
+        'coords': INDO_COORDS,
+        'title': 'Indonesia',
+        'label': 'Provinsi',
+        'center': (-2.5, 118), 'zoom': 5,
+        'figsize': (15, 6),
+        'labels': False,
+    },
+    'kabkota': {
+        'url': "https://raw.githubusercontent.com/ghapsara/indonesia-atlas/master/kabupaten-kota/Kalimantan%20Barat/kalimantan-barat-simplified-topo.json",
+        'name_property': 'kabkot',
+        'coords': KALBAR_COORDS,
+        'title': 'Kalimantan Barat',
+        'label': 'Kota/Kabupaten',
+        'center': (0.0, 111.0), 'zoom': 7,
+        'figsize': (12, 10),
+        'labels': True,
+        'highlight': 'PONTIANAK',
+        'extra': {'Pontianak': ((109.342504, -0.026330), 0.08)},
+    },
+}
+
+# Spellings of the shape sources that differ from the survey answers
+ALIASES = {
+    'DI YOGYAKARTA': 'DAERAH ISTIMEWA YOGYAKARTA',
+    'DI. ACEH': 'ACEH',
+    'NANGGROE ACEH DARUSSALAM': 'ACEH',
+    'PROBANTEN': 'BANTEN',
+    'BANGKA BELITUNG': 'KEPULAUAN BANGKA BELITUNG',
+    'NUSATENGGARA BARAT': 'NUSA TENGGARA BARAT',
+    'IRIAN JAYA BARAT': 'PAPUA BARAT',
+}
+
+COLOR_RAMP = mcolors.LinearSegmentedColormap.from_list("blue_density", ["#87CEEB", "#00008B"])
+NO_DATA_COLOR = 'lightgrey'
+HIGHLIGHT_COLOR = 'red'
+
+_PREFIX = re.compile(r'^(KABUPATEN|KAB\.?|KOTA)\s*')
+
+# region -> (FeatureCollection, pd.Index of region keys), loaded once per process
+_GEOMETRY = {}
+
+
+def region_key(name):
+    """Join key of a region name: upper case, single spaces, no Kab./Kota prefix."""
+    key = re.sub(r'\s+', ' ', str(name)).strip().upper()
+    key = _PREFIX.sub('', key)
+    return ALIASES.get(key, key)
+
+
+def geometry_path(region):
+    return os.path.join(CACHE_DIR, f'geo_{region}.geojson')
+
+
+def _circle(center, radius, n=32):
+    angles = np.linspace(0, 2 * np.pi, n + 1)
+    ring = np.column_stack([center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles)])
+    return {'type': 'Polygon', 'coordinates': [ring.round(6).tolist()]}
+
+
+def _download(region):
+    """Region shapes (GeoJSON or TopoJSON source) as a FeatureCollection, through geopandas."""
+    spec = REGIONS[region]
+    gdf = gpd.read_file(spec['url']).drop_duplicates(subset=spec['name_property'], keep='first')
+    collection = json.loads(gdf.to_json(drop_id=True))
+    for feature in collection['features']:
+        feature['properties'] = {'name': feature['properties'][spec['name_property']]}
+    return collection
+
+
+def _point_collection(region):
+    """Point features from the coordinate table (no shapes available)."""
+    return {'type': 'FeatureCollection', 'features': [
+        {'type': 'Feature', 'properties': {'name': name},
+         'geometry': {'type': 'Point', 'coordinates': [lon, lat]}}
+        for name, (lat, lon) in REGIONS[region]['coords'].items()]}
+
+
+def _polygons(geometry):
+    """Exterior rings of a (Multi)Polygon as (n, 2) arrays."""
+    if geometry['type'] == 'Polygon':
+        return [np.asarray(geometry['coordinates'][0], dtype=float)]
+    if geometry['type'] == 'MultiPolygon':
+        return [np.asarray(polygon[0], dtype=float) for polygon in geometry['coordinates']]
+    return []
+
+
+def _anchor(geometry):
+    """Label point: the point itself, else the centroid of the largest ring."""
+    if geometry['type'] == 'Point':
+        return [float(v) for v in geometry['coordinates']]
+    best, best_area = None, 0.0
+    for ring in _polygons(geometry):
+        x, y = ring[:, 0], ring[:, 1]
+        cross = x * np.roll(y, -1) - np.roll(x, -1) * y
+        area = cross.sum() / 2
+        if abs(area) > abs(best_area):
+            best_area = area
+            best = [float(((x + np.roll(x, -1)) * cross).sum() / (6 * area)),
+                    float(((y + np.roll(y, -1)) * cross).sum() / (6 * area))]
+    if best is None:
+        rings = _polygons(geometry)
+        return np.concatenate(rings).mean(axis=0).tolist() if rings else None
+    return best
+
+
+def _prepare(region, collection):
+    """
+    Adds the synthetic shapes, computes the join key and label point of
+    every feature and puts the highlighted region last (drawn on top).
+    """
+    spec = REGIONS[region]
+    features = collection['features']
+    names = {region_key(f['properties']['name']) for f in features}
+    if any(f['geometry']['type'] != 'Point' for f in features):
+        for name, (center, radius) in spec.get('extra', {}).items():
+            if region_key(name) not in names:
+                features.append({'type': 'Feature', 'properties': {'name': name},
+                                 'geometry': _circle(center, radius)})
+    for feature in features:
+        feature['properties']['key'] = region_key(feature['properties']['name'])
+        feature['properties']['anchor'] = _anchor(feature['geometry'])
+    features.sort(key=lambda f: f['properties']['key'] == spec.get('highlight'))
+    return collection, pd.Index([f['properties']['key'] for f in features])
+
+
+def load_geometry(region, refresh=False):
+    """
+    Shapes of a region ('provinsi' or 'kabkota') with their join keys,
+    prepared once per process. The first download (needs geopandas) is
+    stored as GeoJSON under the cache directory, so later runs read plain
+    JSON; without either the coordinate table gives point features.
+    Returns (FeatureCollection, pd.Index of keys in feature order).
+    """
+    if region in _GEOMETRY and not refresh:
+        return _GEOMETRY[region]
+    path = geometry_path(region)
+    collection = None
+    if os.path.exists(path) and not refresh:
+        with open(path, encoding='utf-8') as f:
+            collection = json.load(f)
+    elif gpd is not None:
+        try:
+            collection = _download(region)
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(collection, f)
+        except Exception as e:
+            print(f"Could not load the {region} shapes: {e}")
+    if collection is None:
+        print(f"Using point features for the {region} map.")
+        collection = _point_collection(region)
+    _GEOMETRY[region] = _prepare(region, collection)
+    return _GEOMETRY[region]
+
+
+def density_colors(values, scaled):
+    """Hex colors of values on the blue ramp, scaled over the values where scaled is set."""
+    values = np.asarray(values, dtype=float)
+    if not scaled.any():
+        return np.full(len(values), NO_DATA_COLOR, dtype=object)
+    low, high = values[scaled].min(), values[scaled].max()
+    norm = (values - low) / (high - low) if high > low else np.ones(len(values))
+    return np.array([mcolors.to_hex(c) for c in COLOR_RAMP(np.clip(norm, 0, 1))], dtype=object)
+
+
+def choropleth(counts, region, total=None):
+    """
+    Joins counts (Series: region name -> value) to the cached shapes with
+    one index lookup. The returned FeatureCollection reuses the cached
+    geometry objects; only the properties (value, pct, color) are new.
+    total: denominator of pct (default: sum of counts).
+    """
+    collection, keys = load_geometry(region)
+    spec = REGIONS[region]
+    counts = counts.groupby(pd.Index(counts.index).map(region_key)).sum()
+    position = keys.get_indexer(counts.index)
+    unmatched = counts.index[position < 0]
+    if len(unmatched):
+        print(f"No {region} shape for: {', '.join(unmatched)}")
+
+    values = np.zeros(len(keys))
+    values[position[position >= 0]] = counts.to_numpy(dtype=float)[position >= 0]
+    total = total or counts.sum()
+    pct = values / total * 100 if total else np.zeros(len(keys))
+    highlight = (keys == spec.get('highlight')) & (values > 0)
+    colors = density_colors(values, (values > 0) & ~highlight)
+    colors[values == 0] = NO_DATA_COLOR
+    colors[highlight] = HIGHLIGHT_COLOR
+
+    features = [{'type': 'Feature', 'geometry': f['geometry'],
+                 'properties': {**f['properties'], 'value': int(v), 'pct': round(float(p), 2), 'color': c}}
+                for f, v, p, c in zip(collection['features'], values, pct, colors)]
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def render_interactive(collection, region, output_file):
+    """Folium map with the whole FeatureCollection as a single GeoJson layer."""
+    if folium is None:
+        print("Folium not installed, skipping map generation.")
+        return
+    spec = REGIONS[region]
+    m = folium.Map(location=list(spec['center']), zoom_start=spec['zoom'], tiles='CartoDB positron')
+
+    def style(feature):
+        props = feature['properties']
+        return {'fillColor': props['color'], 'color': 'black', 'weight': 0.5, 'fillOpacity': 0.7,
+                'radius': 5 + props['value'] / 5}
+
+    folium.GeoJson(
+        collection,
+        name=f"Sebaran Alumni - {spec['title']}",
+        style_function=style,
+        marker=folium.CircleMarker(fill=True),
+        tooltip=folium.GeoJsonTooltip(fields=['name', 'value', 'pct'],
+                                      aliases=[spec['label'], 'Jumlah Alumni', 'Persentase (%)']),
+    ).add_to(m)
+    m.save(output_file)
+    print(f"Map generated: {output_file}")
+
+
+def render_static(collection, region, output_path):
+    """PNG of the same FeatureCollection with matplotlib (shapes or bubbles)."""
+    import matplotlib.pyplot as plt
+    import matplotlib.patheffects
+    from matplotlib.patches import Polygon
+
+    spec = REGIONS[region]
+    features = collection['features']
+    fig, ax = plt.subplots(figsize=spec['figsize'])
+    for feature in features:
+        geometry, props = feature['geometry'], feature['properties']
+        if geometry['type'] == 'Point':
+            if props['value']:
+                ax.scatter(*geometry['coordinates'], s=50 + props['value'] * 3, color=props['color'],
+                           alpha=0.7, edgecolor='k', linewidth=0.5, zorder=2)
+            continue
+        for ring in _polygons(geometry):
+            ax.add_patch(Polygon(ring, closed=True, facecolor=props['color'], edgecolor='black', linewidth=0.5))
+    if spec['labels']:
+        for props in (f['properties'] for f in features):
+            if props['anchor'] and props['value']:
+                ax.annotate(f"{props['name']}\n({props['pct']:.1f}%)", xy=props['anchor'],
+                            ha='center', va='center', fontsize=8, color='black', weight='bold', zorder=3,
+                            path_effects=[matplotlib.patheffects.withStroke(linewidth=2, foreground="white")])
+
+    scaled = [p['value'] for p in (f['properties'] for f in features) if p['color'] not in (NO_DATA_COLOR, HIGHLIGHT_COLOR)]
+    if scaled:
+        mappable = plt.cm.ScalarMappable(cmap=COLOR_RAMP, norm=mcolors.Normalize(min(scaled), max(scaled)))
+        fig.colorbar(mappable, ax=ax, label="Jumlah Alumni", shrink=0.6)
+    ax.autoscale_view()
+    ax.set_aspect('equal')
+    ax.set_title(f"Sebaran Alumni - {spec['title']}", fontsize=16)
+    ax.axis('off')
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+    print(f"Static map saved: {output_path}")
+
+
+def render_map(counts, region, output_file, png_file=None, total=None):
+    """Interactive map (and PNG) of counts from one join on the cached shapes."""
+    collection = choropleth(counts, region, total)
+    render_interactive(collection, region, output_file)
+    if png_file:
+        try:
+            render_static(collection, region, png_file)
+        except Exception as e:
+            print(f"Error saving PNG map: {e}")
+    return collection
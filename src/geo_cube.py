@@ -0,0 +1,140 @@
+import pandas as pd
+import argparse
+import os
+
+import schema
+import data_cache
+from data_cache import load_cleaned, CACHE_DIR, DATA_FILE
+from dataset import WORKING_STATUS
+
+# Finest grain of the geo-aggregate, as schema IDs
+GEO_KEYS = ['provinsi', 'kabkota', 'jurusan', 'prodi', 'tahun_lulus', 'status']
+# Bump when the cube's layout or how it is counted changes: saved cubes of
+# another version are rebuilt
+GEO_CUBE_VERSION = 1
+KALBAR = 'Kalimantan Barat'
+
+# Shorthands accepted as status filter values
+STATUS_GROUPS = {
+    'working': WORKING_STATUS,
+    'employed': ['Bekerja (Full time/Part time)'],
+    'seeking': ['Tidak kerja tetapi sedang mencari kerja'],
+}
+
+# The spatial tables count working respondents unless a status is given
+DEFAULT_FILTERS = {'status': ['working']}
+
+
+def build_geo_cube(df, keys=None):
+    """
+    Respondent counts per (provinsi, kabkota, jurusan, prodi, Tahun Lulus,
+    status) in one groupby. df: question texts or schema IDs; keys missing
+    from df are left out. Missing answers are kept as their own cells.
+    """
+    columns = {k: schema.find_column(df, k) for k in (keys or GEO_KEYS)}
+    keys = [k for k, col in columns.items() if col is not None]
+    if not keys:
+        return pd.DataFrame()
+    cube = df.groupby([df[columns[k]].rename(k) for k in keys], dropna=False).size()
+    return cube.rename('responden').reset_index()
+
+
+def geo_cube_path(source=DATA_FILE):
+    """Path of the saved geo cube built from source (one per source file)."""
+    name = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(CACHE_DIR, f'geo_cube_{name}.csv')
+
+
+def _stamp_path(path):
+    return os.path.splitext(path)[0] + '.json'
+
+
+def save_geo_cube(cube, path=None, source=None):
+    """Writes the cube; with source, also the stamp that load_geo_cube checks."""
+    path = path or geo_cube_path(source or DATA_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    cube.to_csv(path, index=False)
+    if source is not None and os.path.exists(source):
+        data_cache.write_stamp(_stamp_path(path), source, version=GEO_CUBE_VERSION, keys=GEO_KEYS)
+    print(f"Geo cube saved to '{path}' ({len(cube)} rows)")
+
+
+def load_geo_cube(df=None, source=DATA_FILE, path=None, refresh=False):
+    """
+    The saved geo cube of source when it was built from the source's current
+    content (size + SHA-256, as the data cache) with this GEO_CUBE_VERSION
+    and GEO_KEYS; otherwise it is built (from df, or the cleaned data) and
+    saved.
+    """
+    path = path or geo_cube_path(source)
+    if not refresh and os.path.exists(path) and data_cache.stamp_matches(
+            _stamp_path(path), source, version=GEO_CUBE_VERSION, keys=GEO_KEYS):
+        return pd.read_csv(path, keep_default_na=False, na_values=[''])
+    cube = build_geo_cube(df if df is not None else load_cleaned(source))
+    save_geo_cube(cube, path, source)
+    return cube
+
+
+def parse_filters(items):
+    """
+    ['jurusan=Teknik Mesin', 'tahun_lulus=2024', 'status=working'] ->
+    {'jurusan': ['Teknik Mesin'], ...}. Repeating a key adds values; a token
+    without '=' continues the previous value (unquoted names with spaces).
+    """
+    filters = {}
+    key = None
+    for item in items or []:
+        if '=' not in item:
+            if key is None:
+                raise ValueError(f"Filter '{item}' is not KEY=VALUE")
+            filters[key][-1] += f" {item}"
+            continue
+        key, _, value = item.partition('=')
+        if key not in GEO_KEYS:
+            raise ValueError(f"Unknown filter '{key}' (choose from {', '.join(GEO_KEYS)})")
+        filters.setdefault(key, []).append(value)
+    return filters
+
+
+def filter_cube(cube, filters=None):
+    """
+    Cells of the cube matching every filter ({key: [values]}); values are
+    compared as text, status shorthands (working, employed, seeking) expand.
+    Filters on keys the cube does not have are ignored.
+    """
+    keep = pd.Series(True, index=cube.index)
+    for key, values in (filters or {}).items():
+        if key not in cube.columns:
+            continue
+        if key == 'status':
+            values = [s for v in values for s in STATUS_GROUPS.get(v, [v])]
+        keep &= cube[key].astype(str).str.strip().isin([str(v).strip() for v in values])
+    return cube[keep]
+
+
+def region_counts(cube, region, filters=None):
+    """Respondents per region ('provinsi' or 'kabkota') of the filtered cells, largest first."""
+    if region not in cube.columns:
+        return pd.Series(dtype='int64')
+    counts = filter_cube(cube, filters).groupby(region)['responden'].sum()
+    return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+
+def describe_filters(filters):
+    """'Jurusan: Teknik Mesin; Tahun Lulus: 2024' for titles."""
+    return '; '.join(f"{schema.label(k)}: {', '.join(str(v) for v in values)}" for k, values in (filters or {}).items())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the geo-aggregate and print regional counts.")
+    parser.add_argument('--filter', nargs='*', metavar='KEY=VALUE', help="e.g. jurusan=Teknik Mesin tahun_lulus=2024")
+    args = parser.parse_args()
+
+    from console import print_styled_table
+
+    geo_cube = load_geo_cube(refresh=True)
+    filters = {**DEFAULT_FILTERS, **parse_filters(args.filter)}
+    for region in ('provinsi', 'kabkota'):
+        cells = geo_cube if region == 'provinsi' else filter_cube(geo_cube, {'provinsi': [KALBAR]})
+        df_counts = region_counts(cells, region, filters).rename_axis(schema.label(region)).reset_index(name='Jumlah')
+        print_styled_table(df_counts, f"Sebaran per {schema.label(region)} ({describe_filters(filters)})")
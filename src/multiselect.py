@@ -0,0 +1,173 @@
+import pandas as pd
+import numpy as np
+import argparse
+import re
+
+import schema
+from data_cache import load_cleaned
+
+# Bit of free-text answers that match no option
+OTHER = 'Lainnya'
+
+# Leftover text without letters or digits ('-', '.', separators) is no answer
+_MEANINGFUL = re.compile(r'[0-9A-Za-z]')
+
+
+def multi_columns():
+    """Schema IDs of the multi-select questions."""
+    return [col_id for col_id, spec in schema.SCHEMA.items() if spec['dtype'] == 'multi']
+
+
+def option_dictionary(col_id):
+    """Options in bit order (bit k = option k); the last bit is OTHER."""
+    return list(schema.SCHEMA[col_id]['categories']) + [OTHER]
+
+
+def mask_dtype(n_bits):
+    """Smallest unsigned integer dtype holding n_bits."""
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if n_bits <= np.iinfo(dtype).bits:
+            return dtype
+    raise ValueError(f"{n_bits} options do not fit in a 64-bit mask")
+
+
+def parse_answer(text, options):
+    """
+    Bitmask of one comma-joined answer. Options are matched as whole
+    strings (longest first, since they may contain commas); remaining text
+    sets the OTHER bit. options is the full dictionary including OTHER.
+    """
+    if pd.isna(text):
+        return 0
+    rest = ' '.join(str(text).split())
+    mask = 0
+    for k in sorted(range(len(options) - 1), key=lambda k: -len(options[k])):
+        if options[k] in rest:
+            mask |= 1 << k
+            rest = rest.replace(options[k], ' ')
+    if _MEANINGFUL.search(rest):
+        mask |= 1 << (len(options) - 1)
+    return mask
+
+
+def encode(series, options):
+    """
+    Encodes a multi-select column as a uint bitmask array. Each distinct
+    answer string is parsed once; rows only look up their answer's mask.
+    """
+    codes, uniques = pd.factorize(series)
+    dtype = mask_dtype(len(options))
+    unique_masks = np.array([parse_answer(u, options) for u in uniques], dtype=dtype)
+    masks = np.zeros(len(series), dtype=dtype)
+    answered = codes >= 0
+    masks[answered] = unique_masks[codes[answered]]
+    return masks
+
+
+def encode_frame(df):
+    """
+    Bitmask columns (named by schema ID) for every multi-select question
+    present in df, plus their option dictionaries {col_id: options}.
+    """
+    masks, dictionaries = {}, {}
+    for col_id in multi_columns():
+        col = schema.find_column(df, col_id)
+        if col is None:
+            continue
+        dictionaries[col_id] = option_dictionary(col_id)
+        masks[col_id] = encode(df[col], dictionaries[col_id])
+    return pd.DataFrame(masks, index=df.index), dictionaries
+
+
+def decode(masks, options):
+    """Option lists of bitmasks (inverse of encode, up to OTHER)."""
+    return [[options[k] for k in range(len(options)) if int(m) >> k & 1] for m in masks]
+
+
+def popcount(masks):
+    """Number of options chosen per respondent."""
+    masks = np.asarray(masks)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks)
+    return np.unpackbits(masks.astype('>u8').view(np.uint8).reshape(len(masks), -1), axis=1).sum(axis=1)
+
+
+def _bits(masks, n_bits):
+    """(len(masks), n_bits) 0/1 matrix."""
+    masks = np.asarray(masks, dtype=np.uint64)
+    return ((masks[:, None] >> np.arange(n_bits, dtype=np.uint64)) & np.uint64(1)).astype(np.int64)
+
+
+def _mask_histogram(masks, groups):
+    """
+    Respondents per (group, distinct mask): a bincount over group x mask
+    codes. Returns (group labels, distinct masks, counts [groups x masks]).
+    """
+    if groups is None:
+        group_codes, group_labels = np.zeros(len(masks), dtype=np.int64), pd.Index(['Total'])
+    else:
+        group_codes, group_labels = pd.factorize(pd.Series(groups), sort=True)
+    valid = group_codes >= 0
+    unique_masks, mask_codes = np.unique(np.asarray(masks)[valid], return_inverse=True)
+    n_groups, n_masks = len(group_labels), len(unique_masks)
+    counts = np.bincount(group_codes[valid] * n_masks + mask_codes.ravel(),
+                         minlength=n_groups * n_masks).reshape(n_groups, n_masks)
+    return group_labels, unique_masks, counts
+
+
+def option_frequencies(masks, options, groups=None):
+    """
+    Respondents choosing each option, per group (groups: labels aligned with
+    masks, e.g. the Jurusan column; None for the institution total).
+    Adds 'Responden' (group size) and 'Menjawab' (at least one option).
+    """
+    group_labels, unique_masks, counts = _mask_histogram(masks, groups)
+    freq = counts @ _bits(unique_masks, len(options))
+    df_freq = pd.DataFrame(freq, index=group_labels, columns=options)
+    df_freq['Responden'] = counts.sum(axis=1)
+    df_freq['Menjawab'] = counts[:, unique_masks != 0].sum(axis=1)
+    return df_freq
+
+
+def cooccurrence(masks, options, groups=None):
+    """
+    Option x option counts of respondents choosing both, per group. The
+    diagonal equals option_frequencies(). Returns {group: DataFrame}.
+    """
+    group_labels, unique_masks, counts = _mask_histogram(masks, groups)
+    bits = _bits(unique_masks, len(options))
+    co = np.einsum('gu,uk,ul->gkl', counts, bits, bits)
+    return {g: pd.DataFrame(co[i], index=options, columns=options) for i, g in enumerate(group_labels)}
+
+
+def top_pairs(df_co, n=10):
+    """Most frequent option pairs of a co-occurrence matrix (long form)."""
+    i, j = np.triu_indices(len(df_co), k=1)
+    df_pairs = pd.DataFrame({'Opsi A': df_co.index[i], 'Opsi B': df_co.columns[j],
+                             'Responden': df_co.to_numpy()[i, j]})
+    return df_pairs[df_pairs['Responden'] > 0].sort_values('Responden', ascending=False).head(n)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Option frequencies and co-occurrence of the multi-select questions.")
+    parser.add_argument('--by', default='jurusan', help="Group column (schema ID, e.g. jurusan or prodi).")
+    parser.add_argument('--pairs', type=int, default=10, help="Number of option pairs to list.")
+    args = parser.parse_args()
+
+    from console import print_styled_table
+
+    df_load = load_cleaned()
+    df_masks, dicts = encode_frame(df_load)
+    group_col = schema.find_column(df_load, args.by)
+    for col_id, opts in dicts.items():
+        df_total = option_frequencies(df_masks[col_id], opts)
+        share = (df_total[opts].iloc[0] / df_total['Menjawab'].iloc[0] * 100).round(1)
+        print_styled_table(pd.DataFrame({'Opsi': opts, 'Responden': df_total[opts].iloc[0].to_numpy(),
+                                         'Persentase (%)': share.to_numpy()}),
+                           f"{schema.label(col_id)} ({df_total['Menjawab'].iloc[0]} menjawab)")
+        print_styled_table(top_pairs(cooccurrence(df_masks[col_id], opts)['Total'], args.pairs),
+                           "Pasangan opsi yang paling sering dipilih bersama")
+        if group_col is not None:
+            df_group = option_frequencies(df_masks[col_id], opts, df_load[group_col])
+            print_styled_table(df_group.reset_index(names=schema.label(args.by)),
+                               f"Frekuensi opsi per {schema.label(args.by)}")
@@ -7,6 +7,10 @@ import base64
 import os
 import webbrowser
 
+from data_cache import load_cleaned
+import profiling
+from profiling import profiled
+
 # Setup Paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, 'data', 'processed')
@@ -27,6 +31,9 @@ LEARNING_METHODS = {
     'Diskusi': 'Diskusi'
 }
 
+# Grouping columns for the per-group learning method statistics
+GROUP_KEYS = ['Jurusan', 'prodi', 'Tahun Lulus']
+
 # Likert Scale Mapping
 LIKERT_MAP = {
     "Sangat Besar": 5,
@@ -36,13 +43,14 @@ LIKERT_MAP = {
     "Tidak Sama Sekali": 1
 }
 
+@profiled()
 def load_data():
     """Loads the cleaned data."""
     if not os.path.exists(DATA_FILE):
         raise FileNotFoundError(f"Data file not found at {DATA_FILE}")
     
     try:
-        df = pd.read_excel(DATA_FILE)
+        df = load_cleaned(DATA_FILE)
         return df
     except Exception as e:
         raise Exception(f"Error loading data: {e}")
@@ -71,24 +79,55 @@ def convert_likert(val):
             
     return np.nan
 
-def calculate_means(df):
-    """Calculates mean scores for each learning method."""
-    stats = {}
-    
+@profiled()
+def encode_learning_methods(df):
+    """
+    Encodes the learning-method columns once into a numeric matrix.
+    convert_likert runs once per unique answer, not once per cell.
+    Returns a DataFrame (same index as df) with the method labels as columns.
+    """
+    scores = {}
     for col, label in LEARNING_METHODS.items():
         if col in df.columns:
-            # Convert series
-            numeric_series = df[col].apply(convert_likert)
-            mean_val = numeric_series.mean()
-            stats[label] = mean_val
+            lookup = {val: convert_likert(val) for val in df[col].dropna().unique()}
+            scores[label] = df[col].map(lookup).astype(float)
         else:
             print(f"Warning: Column '{col}' not found in data.")
-            stats[label] = 0 # Prepare safe default or skip?
+            scores[label] = pd.Series(np.nan, index=df.index)
+    return pd.DataFrame(scores, index=df.index)
+
+@profiled()
+def calculate_group_means(df, keys=GROUP_KEYS, df_scores=None):
+    """
+    Mean score and answer count per learning method for each grouping column,
+    each computed with a single groupby over the encoded matrix.
+    Returns { key: (df_means, df_counts) } for the keys present in df.
+    """
+    if df_scores is None:
+        df_scores = encode_learning_methods(df)
+
+    results = {}
+    for key in keys:
+        if key not in df.columns:
+            print(f"Warning: '{key}' column not found.")
+            continue
+        grouped = df_scores.groupby(df[key])
+        results[key] = (grouped.mean(), grouped.count())
+    return results
+
+def calculate_means(df, df_scores=None):
+    """Calculates mean scores for each learning method."""
+    if df_scores is None:
+        df_scores = encode_learning_methods(df)
+
+    # Methods without a column keep the previous safe default of 0
+    stats = df_scores.mean().fillna(0)
             
     # Convert to DataFrame for easier plotting
-    df_stats = pd.DataFrame(list(stats.items()), columns=['Metode', 'Mean Score'])
+    df_stats = pd.DataFrame({'Metode': stats.index, 'Mean Score': stats.to_numpy()})
     return df_stats.sort_values(by='Mean Score', ascending=True) # Sort for Bar Chart
 
+@profiled()
 def create_bar_chart(df_stats):
     """Creates a horizontal bar chart ranking learning methods."""
     plt.figure(figsize=(10, 6))
@@ -117,6 +156,7 @@ def create_bar_chart(df_stats):
     buffer.seek(0)
     return base64.b64encode(buffer.read()).decode('utf-8')
 
+@profiled()
 def create_radar_chart(df_stats):
     """Creates a radar chart handling unsorted data (we need fixed order likely)."""
     # Sort specifically for Radar to make it look consistent? 
@@ -162,37 +202,97 @@ def create_radar_chart(df_stats):
     buffer.seek(0)
     return base64.b64encode(buffer.read()).decode('utf-8')
 
-def calculate_jurusan_means(df):
+@profiled()
+def calculate_distribution(df_scores, groups=None):
+    """
+    Full answer distribution per learning method, optionally per group:
+    share of each Likert level, median level and top-2-box (Besar + Sangat Besar).
+    All levels are counted with a single bincount over the encoded codes.
+    groups: Series aligned with df_scores (e.g. df['Jurusan']) or None for the institution.
+    Returns a long DataFrame with one row per (group, Metode).
+    """
+    methods = df_scores.columns.tolist()
+    values = df_scores.to_numpy(dtype=float)
+    codes = np.where(np.isfinite(values), np.rint(values), 0).astype(np.int64)
+    codes = np.where((codes >= 1) & (codes <= 5), codes, 0) # 0 = missing
+
+    if groups is None:
+        gid = np.zeros(len(df_scores), dtype=np.int64)
+        group_labels = ['Institusi']
+    else:
+        gid, group_labels = pd.factorize(groups, sort=True)
+    valid = gid >= 0
+    n_groups, n_methods = len(group_labels), len(methods)
+
+    flat = (gid[valid, None] * n_methods + np.arange(n_methods)[None, :]) * 6 + codes[valid]
+    counts = np.bincount(flat.ravel(), minlength=n_groups * n_methods * 6)
+    counts = counts.reshape(n_groups, n_methods, 6)[..., 1:] # drop the missing bin
+
+    n = counts.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = counts / n[..., None]
+    cum_shares = np.cumsum(shares, axis=-1)
+    median = np.where(n > 0, np.argmax(cum_shares >= 0.5, axis=-1) + 1, np.nan)
+    top2 = shares[..., 3] + shares[..., 4]
+
+    df_dist = pd.DataFrame({
+        'Grup': np.repeat(np.asarray(group_labels, dtype=object), n_methods),
+        'Metode': np.tile(methods, n_groups),
+        'n': n.ravel(),
+    })
+    level_names = sorted(LIKERT_MAP, key=LIKERT_MAP.get)
+    for k, level in enumerate(level_names):
+        df_dist[f'{level} (%)'] = shares[..., k].ravel() * 100
+    df_dist['Median'] = [level_names[int(m) - 1] if pd.notna(m) else None for m in median.ravel()]
+    df_dist['Top-2-Box (%)'] = top2.ravel() * 100
+    return df_dist
+
+@profiled()
+def create_stacked_bar_chart(df_dist):
+    """Stacked horizontal bar of the answer distribution per method (institution level)."""
+    if df_dist.empty:
+        return None
+
+    level_cols = [f'{level} (%)' for level in sorted(LIKERT_MAP, key=LIKERT_MAP.get)]
+    df_plot = df_dist.sort_values(by='Top-2-Box (%)', ascending=True)
+    colors = plt.cm.RdYlBu(np.linspace(0.1, 0.9, len(level_cols)))
+
+    fig, ax = plt.subplots(figsize=(11, 6))
+    left = np.zeros(len(df_plot))
+    for col, color in zip(level_cols, colors):
+        widths = df_plot[col].fillna(0).to_numpy()
+        ax.barh(df_plot['Metode'], widths, left=left, color=color, label=col.replace(' (%)', ''))
+        for y, (x0, w) in enumerate(zip(left, widths)):
+            if w >= 5:
+                ax.text(x0 + w / 2, y, f'{w:.0f}%', ha='center', va='center', fontsize=8)
+        left += widths
+
+    ax.set_xlabel('Persentase Responden (%)', size=11)
+    ax.set_xlim(0, 100)
+    ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.1), ncol=len(level_cols), frameon=False)
+    plt.tight_layout()
+
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format='png', bbox_inches='tight', dpi=300)
+    plt.close(fig)
+    buffer.seek(0)
+    return base64.b64encode(buffer.read()).decode('utf-8')
+
+def calculate_jurusan_means(df, group_means=None):
     """Calculates mean scores for each learning method grouped by Jurusan."""
-    jurusan_stats = {}
-    
-    # Check if Jurusan column exists
-    if 'Jurusan' not in df.columns:
-        print("Warning: 'Jurusan' column not found.")
+    if group_means is None:
+        group_means = calculate_group_means(df, keys=['Jurusan'])
+
+    if 'Jurusan' not in group_means:
         return pd.DataFrame()
 
-    unique_jurusan = df['Jurusan'].dropna().unique()
-    
-    # Clean Jurusan names (strip whitespace)
-    unique_jurusan = [j for j in unique_jurusan if isinstance(j, str)]
-    
-    for jur in unique_jurusan:
-        # Filter by Jurusan
-        df_jur = df[df['Jurusan'] == jur]
-        
-        scores = {}
-        for col, label in LEARNING_METHODS.items():
-            if col in df_jur.columns:
-                val = df_jur[col].apply(convert_likert).mean()
-                scores[label] = val
-            else:
-                scores[label] = np.nan
-        
-        jurusan_stats[jur] = scores
-        
-    df_heatmap = pd.DataFrame.from_dict(jurusan_stats, orient='index')
+    df_heatmap, _ = group_means['Jurusan']
+    # Keep only proper Jurusan names
+    df_heatmap = df_heatmap[[isinstance(j, str) for j in df_heatmap.index]]
+    df_heatmap.index.name = None
     return df_heatmap
 
+@profiled()
 def create_heatmap(df_heatmap):
     """Creates a heatmap visualizing method emphasis by Jurusan."""
     if df_heatmap.empty:
@@ -258,7 +358,10 @@ def generate_report():
     df = load_data()
     
     print("Calculating scores...")
-    df_stats = calculate_means(df)
+    # Encode the learning method answers once; every table below reads from it
+    df_scores = encode_learning_methods(df)
+    df_stats = calculate_means(df, df_scores=df_scores)
+    group_means = calculate_group_means(df, df_scores=df_scores)
     
     print("\nMean Scores:")
     print(df_stats)
@@ -268,7 +371,7 @@ def generate_report():
     radar_chart = create_radar_chart(df_stats)
     
     print("Generating Heatmap...")
-    df_heatmap = calculate_jurusan_means(df)
+    df_heatmap = calculate_jurusan_means(df, group_means=group_means)
     heatmap_chart = create_heatmap(df_heatmap)
 
     # Print Styled Table
@@ -292,6 +395,12 @@ def generate_report():
     except ImportError:
         print("\n[Tips] Install 'tabulate' untuk tampilan tabel yang lebih rapi: pip install tabulate")
         print(df_stats)
+    print("Calculating distributions...")
+    df_dist = calculate_distribution(df_scores)
+    df_dist_jurusan = calculate_distribution(df_scores, df['Jurusan']) if 'Jurusan' in df.columns else pd.DataFrame()
+    stacked_chart = create_stacked_bar_chart(df_dist)
+    print(df_dist.drop(columns=['Grup']).round(1).to_string(index=False))
+
     print("Calculating dimensions...")
     df_dim = calculate_dimensions(df_stats)
     
@@ -315,6 +424,55 @@ def generate_report():
     except ImportError:
         pass
         
+    # Distribution section (institution table + Top-2-Box per Jurusan)
+    df_dist_display = df_dist.drop(columns=['Grup']).sort_values(by='Top-2-Box (%)', ascending=False)
+    distribution_html = f"""
+            <div class="chart-section" style="margin-top: 50px;">
+                <div class="chart-header">
+                    <h2>Distribusi Jawaban per Metode Pembelajaran</h2>
+                    <a href="data:image/png;base64,{stacked_chart}" download="Distribusi_Metode_Pembelajaran.png" class="btn-download">Simpan Grafik HD</a>
+                </div>
+                <img src="data:image/png;base64,{stacked_chart}" alt="Stacked Bar Chart">
+                <div style="display: flex; justify-content: space-between; align-items: center; margin: 30px 0 10px;">
+                    <h3>Tabel Distribusi (Institusi)</h3>
+                    <button onclick="saveTable('distribusiTable', 'Tabel_Distribusi_Metode')" class="btn-download" style="border: none; cursor: pointer;">Simpan Tabel</button>
+                </div>
+                {df_dist_display.to_html(index=False, border=0, table_id='distribusiTable', float_format=lambda x: f'{x:.1f}')}
+            </div>
+    """
+    if not df_dist_jurusan.empty:
+        df_top2 = df_dist_jurusan.pivot(index='Grup', columns='Metode', values='Top-2-Box (%)')
+        df_top2.index.name = 'Jurusan'
+        df_top2.columns.name = None
+        distribution_html += f"""
+            <div style="margin-top: 30px;">
+                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
+                    <h3>Top-2-Box (%) per Jurusan</h3>
+                    <button onclick="saveTable('top2JurusanTable', 'Tabel_Top2Box_Jurusan')" class="btn-download" style="border: none; cursor: pointer;">Simpan Tabel</button>
+                </div>
+                {df_top2.reset_index().to_html(index=False, border=0, table_id='top2JurusanTable', float_format=lambda x: f'{x:.1f}')}
+            </div>
+        """
+
+    # Per-cohort and per-prodi tables from the same grouped result
+    group_tables_html = ""
+    for key, title in [('Tahun Lulus', 'Skor Rata-rata per Tahun Lulus'), ('prodi', 'Skor Rata-rata per Program Studi')]:
+        if key not in group_means:
+            continue
+        df_group, df_count = group_means[key]
+        df_group = df_group.copy()
+        df_group['Responden'] = df_count.max(axis=1)
+        table_id = f"group_{key.replace(' ', '_').lower()}_table"
+        group_tables_html += f"""
+            <div style="margin-top: 50px;">
+                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px;">
+                     <h2>{title}</h2>
+                     <button onclick="saveTable('{table_id}', '{title.replace(' ', '_')}')" class="btn-download" style="border: none; cursor: pointer;">Simpan Tabel</button>
+                </div>
+                {df_group.reset_index().to_html(index=False, border=0, table_id=table_id, float_format=lambda x: f'{x:.2f}')}
+            </div>
+        """
+
     # HTML Content
     def get_status_color(status):
         if status == "Dominan Utama": return "#27ae60" # Green
@@ -427,6 +585,12 @@ def generate_report():
                 </div>
             </div>
 
+            <!-- Distribution Section -->
+            {distribution_html}
+
+            <!-- Per Group Tables (Tahun Lulus, Program Studi) -->
+            {group_tables_html}
+
             <!-- Dimension Table Section -->
             <div style="margin-top: 50px;">
                 <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px;">
@@ -468,8 +632,9 @@ def generate_report():
     """
     
     output_path = os.path.join(REPORTS_DIR, 'pembelajaran_analisis_report.html')
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    with profiling.stage('write html'):
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
         
     print(f"Report generated at: {output_path}")
     
@@ -524,3 +689,4 @@ def get_category(score):
 
 if __name__ == "__main__":
     generate_report()
+    profiling.write_report('pembelajaran_analisis')
@@ -0,0 +1,251 @@
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Setup Paths
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, 'src')
+DATA_RAW = os.path.join(BASE_DIR, 'data', 'raw', 'data.xlsx')
+DATA_PROCESSED_DIR = os.path.join(BASE_DIR, 'data', 'processed')
+REPORTS_DIR = os.path.join(BASE_DIR, 'reports')
+DATA_CLEANED = os.path.join(DATA_PROCESSED_DIR, 'cleaned_data.xlsx')
+STATE_FILE = os.path.join(DATA_PROCESSED_DIR, 'pipeline_state.json')
+
+
+def _src(name):
+    return os.path.join(SRC_DIR, name)
+
+
+# The pipeline DAG. Each node runs one script; it is stale when the hash of
+# its code (the script and every src module it imports, see code_files), its
+# input files or any upstream fingerprint changes, or when one of its outputs
+# is missing.
+NODES = {
+    'cleaned': {
+        'script': _src('cleaning.py'),
+        'inputs': [DATA_RAW],
+        'outputs': [DATA_CLEANED],
+        'deps': [],
+    },
+    'cube': {
+        'script': _src('gap_cube.py'),
+        'inputs': [DATA_CLEANED],
+        'outputs': [os.path.join(DATA_PROCESSED_DIR, 'gap_cube.csv')],
+        'deps': ['cleaned'],
+    },
+    'tables': {
+        'script': _src('table_jml_responden.py'),
+        'inputs': [DATA_CLEANED],
+        'outputs': [os.path.join(REPORTS_DIR, 'report_tables.html')],
+        'deps': ['cleaned'],
+    },
+    'gap': {
+        'script': _src('gap_analisis.py'),
+        'inputs': [DATA_CLEANED],
+        'outputs': [os.path.join(REPORTS_DIR, 'gap_analysis_report.html')],
+        'deps': ['cube'],
+    },
+    'learning': {
+        'script': _src('pembelajaran_analisis.py'),
+        'inputs': [DATA_CLEANED],
+        'outputs': [os.path.join(REPORTS_DIR, 'pembelajaran_analisis_report.html')],
+        'deps': ['cleaned'],
+    },
+}
+
+
+def _local_imports(path):
+    """Names of the src modules imported anywhere in path (function-level imports included)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+    return {name for name in names if os.path.exists(_src(f'{name}.py'))}
+
+
+def code_files(script):
+    """The script plus every src module it imports, directly or through other src modules, sorted."""
+    seen = {script}
+    todo = [script]
+    while todo:
+        for name in _local_imports(todo.pop()):
+            path = _src(f'{name}.py')
+            if path not in seen:
+                seen.add(path)
+                todo.append(path)
+    return sorted(seen)
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a file's content, or a marker when the file does not exist."""
+    if not os.path.exists(path):
+        return 'missing'
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def fingerprint(name, upstream):
+    """
+    Fingerprint of a node: its code files, its input files and the
+    fingerprints of its dependencies. upstream: {dep_name: fingerprint}.
+    """
+    node = NODES[name]
+    h = hashlib.sha256(name.encode('utf-8'))
+    for path in code_files(node['script']) + node['inputs']:
+        h.update(os.path.relpath(path, BASE_DIR).encode('utf-8'))
+        h.update(file_hash(path).encode('utf-8'))
+    for dep in node['deps']:
+        h.update(upstream[dep].encode('utf-8'))
+    return h.hexdigest()
+
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        return {}
+    with open(STATE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state):
+    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def resolve_targets(targets):
+    """Returns the requested nodes plus all their ancestors, in topological order."""
+    order = []
+
+    def visit(name):
+        if name in order:
+            return
+        for dep in NODES[name]['deps']:
+            visit(dep)
+        order.append(name)
+
+    for name in targets or NODES:
+        if name not in NODES:
+            raise ValueError(f"Unknown pipeline node '{name}'. Available: {list(NODES)}")
+        visit(name)
+    return order
+
+
+def is_stale(name, fp, state, force=False):
+    """Returns the reason a node must run, or None when it is up to date."""
+    if force:
+        return 'forced'
+    if state.get(name) != fp:
+        return 'inputs or code changed' if name in state else 'never built'
+    missing = [p for p in NODES[name]['outputs'] if not os.path.exists(p)]
+    if missing:
+        return f"missing output {os.path.relpath(missing[0], BASE_DIR)}"
+    return None
+
+
+def run_node(name):
+    """Runs a node's script from the project root. Returns (name, ok, seconds)."""
+    start = time.time()
+    print(f"[pipeline] >> {name}: {os.path.relpath(NODES[name]['script'], BASE_DIR)}")
+    result = subprocess.run([sys.executable, NODES[name]['script']], cwd=BASE_DIR,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    elapsed = time.time() - start
+    log_path = os.path.join(REPORTS_DIR, f'pipeline_{name}.log')
+    with open(log_path, 'w', encoding='utf-8') as f:
+        f.write(result.stdout)
+    status = 'ok' if result.returncode == 0 else f'FAILED (exit {result.returncode}, see {log_path})'
+    print(f"[pipeline] << {name}: {status} in {elapsed:.1f}s")
+    return name, result.returncode == 0, elapsed
+
+
+def run_pipeline(targets=None, dry_run=False, force=False, workers=None):
+    """
+    Runs the stale nodes of the DAG. A node starts as soon as its own
+    dependencies are finished, so independent nodes run in parallel
+    (one subprocess each). Fingerprints are only recorded for
+    nodes that succeeded, so a failed node is retried on the next run.
+    """
+    order = resolve_targets(targets)
+    state = load_state()
+    workers = workers or os.cpu_count() or 1
+
+    if dry_run:
+        # Without running anything, a stale node makes all its descendants stale too
+        fps, stale = {}, {}
+        for name in order:
+            fps[name] = fingerprint(name, fps)
+            reason = is_stale(name, fps[name], state, force)
+            upstream = [d for d in NODES[name]['deps'] if stale.get(d)]
+            stale[name] = reason or (f"upstream {', '.join(upstream)} will rebuild" if upstream else None)
+            print(f"{'REBUILD' if stale[name] else 'up-to-date':<11} {name:<9} {stale[name] or ''}")
+        return True
+
+    fps, done, failed = {}, set(), set()
+    pending = list(order)
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            # Schedule every node whose dependencies are all finished
+            for name in list(pending):
+                deps = NODES[name]['deps']
+                if any(d in failed for d in deps):
+                    print(f"[pipeline] -- {name}: skipped, upstream failed")
+                    failed.add(name)
+                    pending.remove(name)
+                elif all(d in done for d in deps):
+                    pending.remove(name)
+                    fps[name] = fingerprint(name, fps)
+                    reason = is_stale(name, fps[name], state, force)
+                    if reason:
+                        print(f"[pipeline] {name} is stale ({reason})")
+                        running[executor.submit(run_node, name)] = name
+                    else:
+                        print(f"[pipeline] {name} is up to date")
+                        done.add(name)
+
+            if not running:
+                if pending and not any(d in failed for n in pending for d in NODES[n]['deps']):
+                    raise RuntimeError(f"Pipeline cannot make progress: {pending}")
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                _, ok, _ = future.result()
+                if ok:
+                    state[name] = fps[name]
+                    save_state(state)
+                    done.add(name)
+                else:
+                    failed.add(name)
+
+    if failed:
+        print(f"[pipeline] Failed or skipped: {sorted(failed)}")
+    return not failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the tracer study pipeline, rebuilding only stale steps.")
+    parser.add_argument('targets', nargs='*', help=f"Nodes to build (default: all). Available: {', '.join(NODES)}")
+    parser.add_argument('--dry-run', action='store_true', help="Only show which nodes would rebuild.")
+    parser.add_argument('--force', action='store_true', help="Rebuild the selected nodes even if up to date.")
+    parser.add_argument('--workers', type=int, default=None, help="Maximum number of nodes run in parallel.")
+    parser.add_argument('--quiet', action='store_true', help="Skip console tables in the node logs (sets TRACER_QUIET=1).")
+    args = parser.parse_args()
+    if args.quiet:
+        # Inherited by every node's subprocess
+        os.environ['TRACER_QUIET'] = '1'
+
+    ok = run_pipeline(args.targets, dry_run=args.dry_run, force=args.force, workers=args.workers)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,160 @@
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Setup Paths
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = os.environ.get('TRACER_REPORTS_DIR', os.path.join(BASE_DIR, 'reports'))
+SUMMARY_FILE = os.path.join(REPORTS_DIR, 'cleaning_report.txt')
+
+# Opt-in: TRACER_PROFILE=1 in the environment or --profile on the command line
+ENABLED = os.environ.get('TRACER_PROFILE', '').lower() in ('1', 'true', 'yes', 'on') or '--profile' in sys.argv
+
+_records = []
+_stack = []
+_step = None
+
+
+class Stage:
+    """Measurements of one named stage. Set rows_out inside the block."""
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.depth = len(_stack)
+        self.wall = self.cpu = self.peak_mb = 0.0
+        self._child_peak = 0
+
+    def as_dict(self):
+        return {
+            'stage': self.name,
+            'depth': self.depth,
+            'wall_s': round(self.wall, 4),
+            'cpu_s': round(self.cpu, 4),
+            'peak_mb': round(self.peak_mb, 2),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+        }
+
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+
+def _begin(record):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    # Hand the peak reached so far to the enclosing stage before resetting it
+    if _stack:
+        _stack[-1]._child_peak = max(_stack[-1]._child_peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+    _stack.append(record)
+    _records.append(record)
+    record._t0 = time.perf_counter()
+    record._c0 = time.process_time()
+
+
+def _end(record):
+    record.wall = time.perf_counter() - record._t0
+    record.cpu = time.process_time() - record._c0
+    peak = max(record._child_peak, tracemalloc.get_traced_memory()[1])
+    record.peak_mb = peak / 2 ** 20
+    _stack.remove(record)
+    if _stack:
+        _stack[-1]._child_peak = max(_stack[-1]._child_peak, peak)
+
+
+@contextmanager
+def stage(name, rows_in=None):
+    """Times a block when profiling is enabled; a no-op record otherwise."""
+    record = Stage(name, rows_in)
+    if not ENABLED:
+        yield record
+        return
+    _begin(record)
+    try:
+        yield record
+    finally:
+        _end(record)
+
+
+def step(name, rows=None):
+    """
+    Sequential stages for flat scripts: closes the open step (rows becomes
+    its rows_out) and starts the next one with rows as rows_in.
+    step(None, rows) only closes the open step.
+    """
+    global _step
+    if not ENABLED:
+        return
+    if _step is not None:
+        _step.rows_out = rows
+        _end(_step)
+        _step = None
+    if name is not None:
+        _step = Stage(name, rows)
+        _begin(_step)
+
+
+def _rows(obj):
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+
+def profiled(name=None):
+    """Decorator recording a function as a stage; rows are len() of the first argument and the result."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            with stage(label, _rows(args[0]) if args else None) as record:
+                result = func(*args, **kwargs)
+                record.rows_out = _rows(result) if not isinstance(result, str) else None
+            return result
+        return wrapper
+    return decorator
+
+
+def summary_table(records=None):
+    """Fixed-width text table of the recorded stages (nested stages indented)."""
+    records = _records if records is None else records
+    fmt = lambda v: '' if v is None else str(v)
+    lines = [f"{'Stage':<44} {'Wall (s)':>9} {'CPU (s)':>9} {'Peak (MB)':>10} {'Rows in':>9} {'Rows out':>9}"]
+    lines.append('-' * len(lines[0]))
+    for r in records:
+        label = ('  ' * r.depth + r.name)[:44]
+        lines.append(f"{label:<44} {r.wall:>9.3f} {r.cpu:>9.3f} {r.peak_mb:>10.2f} "
+                     f"{fmt(r.rows_in):>9} {fmt(r.rows_out):>9}")
+    return '\n'.join(lines)
+
+
+def write_report(run_name):
+    """
+    Writes the recorded stages to reports/profile_<run_name>.json and appends
+    a summary table to reports/cleaning_report.txt. No-op when disabled.
+    """
+    if not ENABLED or not _records:
+        return None
+    step(None)
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    json_path = os.path.join(REPORTS_DIR, f'profile_{run_name}.json')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({'run': run_name, 'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+                   'stages': [r.as_dict() for r in _records]}, f, indent=2)
+
+    with open(SUMMARY_FILE, 'a', encoding='utf-8') as f:
+        f.write(f"\n=== Profile: {run_name} ({time.strftime('%Y-%m-%d %H:%M:%S')}) ===\n")
+        f.write(summary_table() + '\n')
+    print(f"Profile written to '{json_path}' (summary appended to {SUMMARY_FILE})")
+    return json_path
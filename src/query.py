@@ -0,0 +1,106 @@
+import pandas as pd
+import argparse
+import os
+import sqlite3
+
+import schema
+from data_cache import load_cleaned, is_fresh, _existing_cache, DATA_FILE
+
+# Optional DuckDB (in-process, columnar, out of core); sqlite3 is used without it
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+TABLE_NAME = 'alumni'
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(text):
+    """SQL string literal (views cannot take bound parameters)."""
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _alias_select(columns):
+    """SELECT list renaming every registered column to its schema ID (others keep their name)."""
+    return ', '.join(f"{_quote(c)} AS {_quote(schema.column_id(c) or c)}" for c in columns)
+
+
+def connect(source=DATA_FILE):
+    """
+    Opens an in-process connection with the cleaned data exposed as the
+    'alumni' view, columns named by their schema IDs. With DuckDB and a parquet cache the view reads the file
+    directly (columnar, out of core); otherwise the cached DataFrame is loaded.
+    """
+    if duckdb is not None:
+        con = duckdb.connect()
+        if not is_fresh(source):
+            load_cleaned(source) # rebuilds the cache
+        path = _existing_cache(source)
+        if path.endswith('.parquet'):
+            # Only the schema is read here; queries scan the parquet file lazily
+            columns = [row[0] for row in con.execute("DESCRIBE SELECT * FROM read_parquet(?)", [path]).fetchall()]
+            con.execute(f"CREATE VIEW {TABLE_NAME} AS SELECT {_alias_select(columns)} "
+                        f"FROM read_parquet({_literal(path)})")
+        else:
+            con.register(TABLE_NAME, load_cleaned(source, ids=True))
+        return con
+
+    con = sqlite3.connect(':memory:')
+    load_cleaned(source, ids=True).to_sql(TABLE_NAME, con, index=False)
+    return con
+
+
+def query(sql, con=None):
+    """Runs a SQL statement against the 'alumni' view and returns a DataFrame."""
+    con = con or connect()
+    if duckdb is not None and isinstance(con, duckdb.DuckDBPyConnection):
+        return con.execute(sql).df()
+    return pd.read_sql_query(sql, con)
+
+
+def repl(con):
+    engine = 'DuckDB' if duckdb is not None else 'SQLite'
+    print(f"Tracer study SQL ({engine}). Table: {TABLE_NAME}. "
+          "Commands: .columns, .quit. End statements with ';'.")
+    buffer = []
+    while True:
+        try:
+            line = input('sql> ' if not buffer else '...> ')
+        except EOFError:
+            break
+        stripped = line.strip()
+        if not buffer and stripped in ('.quit', '.exit'):
+            break
+        if not buffer and stripped == '.columns':
+            print(schema.describe().to_string(index=False))
+            continue
+        buffer.append(line)
+        if not stripped.endswith(';'):
+            continue
+        sql = '\n'.join(buffer)
+        buffer = []
+        try:
+            print(query(sql, con).to_string(index=False))
+        except Exception as e:
+            print(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the cleaned tracer study data with SQL.")
+    parser.add_argument('sql', nargs='?', help="Statement to run; starts an interactive prompt when omitted.")
+    parser.add_argument('--csv', help="Write the result to this CSV file instead of printing it.")
+    args = parser.parse_args()
+
+    connection = connect()
+    if args.sql is None:
+        repl(connection)
+    else:
+        df_result = query(args.sql, connection)
+        if args.csv:
+            df_result.to_csv(args.csv, index=False)
+            print(f"{len(df_result)} rows written to '{os.path.abspath(args.csv)}'")
+        else:
+            print(df_result.to_string(index=False))
@@ -0,0 +1,192 @@
+import pandas as pd
+import numpy as np
+import argparse
+
+import salary
+import schema
+from data_cache import load_cleaned
+from console import print_styled_table
+from dataset import WORKING_STATUS
+
+# Finest grain of the outcome cube; Jurusan rides along with prodi so both
+# levels are plain sums.
+CUBE_KEYS = ['jurusan', 'prodi']
+
+STAT_COLS = ['responden', 'kerja', 'wiraswasta', 'mt_n', 'mt_6bln', 'mt_sum', 'gaji_n', 'gaji_sum']
+
+# Ranking metrics: label, default weight, whether higher is better, narrative title
+METRICS = {
+    'serapan': ('Serapan Kerja (%)', 1.0, True, 'The Job Absorber'),
+    'kerja_6bln': ('Bekerja <= 6 Bulan (%)', 1.0, True, 'The Fastest Hired'),
+    'masa_tunggu': ('Rata-rata Masa Tunggu (Bulan)', 1.0, False, 'The Quick Starter'),
+    'gaji': ('Rata-rata Gaji (Estimasi)', 1.0, True, 'The High Earner'),
+    'wiraswasta': ('Wiraswasta (%)', 0.5, True, 'The Job Creator'),
+    'volume': ('Jumlah Responden', 0.5, True, 'The Major Contributor'),
+}
+DEFAULT_WEIGHTS = {m: spec[1] for m, spec in METRICS.items()}
+
+# Metric names in the narrative
+METRIC_NARRATIVE = {
+    'serapan': 'Serapan Kerja',
+    'kerja_6bln': 'Kecepatan Serapan (<= 6 bulan)',
+    'masa_tunggu': 'Masa Tunggu',
+    'gaji': 'Gaji',
+    'wiraswasta': 'Wirausaha',
+    'volume': 'Volume Responden',
+}
+
+
+def build_outcome_cube(df, keys=CUBE_KEYS):
+    """
+    Employment outcome statistics per (jurusan, prodi) in a single
+    groupby-sum: respondents, working (Bekerja/Wiraswasta), wiraswasta,
+    masa tunggu count/sum/<= 6 bulan of employees and the salary midpoint
+    sum/count of working respondents.
+    """
+    columns = {k: schema.find_column(df, k) for k in keys}
+    col_status = schema.find_column(df, 'status')
+    if col_status is None or any(c is None for c in columns.values()):
+        return pd.DataFrame()
+
+    status = df[col_status]
+    working = status.isin(WORKING_STATUS).to_numpy()
+    # Masa tunggu follows the waktu tunggu table: employees who filled it in
+    masa_tunggu = pd.to_numeric(df[schema.find_column(df, 'masa_tunggu')], errors='coerce').to_numpy()
+    has_mt = (status == 'Bekerja (Full time/Part time)').to_numpy() & ~np.isnan(masa_tunggu)
+    bands = salary.encode_bands(df[schema.find_column(df, 'pendapatan')])
+    has_gaji = working & (bands >= 0)
+
+    df_stats = pd.DataFrame({
+        'responden': 1,
+        'kerja': working.astype(np.int64),
+        'wiraswasta': (status == 'Wiraswasta').to_numpy().astype(np.int64),
+        'mt_n': has_mt.astype(np.int64),
+        'mt_6bln': (has_mt & (masa_tunggu <= 6)).astype(np.int64),
+        'mt_sum': np.where(has_mt, masa_tunggu, 0.0),
+        'gaji_n': has_gaji.astype(np.int64),
+        'gaji_sum': np.where(has_gaji, salary.BAND_MID[bands.clip(min=0)], 0.0),
+    }, index=df.index)
+    return df_stats.groupby([df[columns[k]].rename(k) for k in keys]).sum().reset_index()
+
+
+def outcome_metrics(cube, by='jurusan'):
+    """Rolls the cube up to by (schema ID) and derives the ranking metrics."""
+    summed = cube.groupby(by)[STAT_COLS].sum()
+    rate = lambda a, b: a / b.where(b > 0)
+    return pd.DataFrame({
+        'serapan': rate(summed['kerja'], summed['responden']) * 100,
+        'kerja_6bln': rate(summed['mt_6bln'], summed['mt_n']) * 100,
+        'masa_tunggu': rate(summed['mt_sum'], summed['mt_n']),
+        'gaji': rate(summed['gaji_sum'], summed['gaji_n']),
+        'wiraswasta': rate(summed['wiraswasta'], summed['responden']) * 100,
+        'volume': summed['responden'],
+    })
+
+
+def score_metrics(df_metrics, weights=None):
+    """
+    Min-max normalizes every metric across groups (inverted where lower is
+    better; missing values score 0), then takes the weighted mean (0-100).
+    Returns (normalized metrics, score).
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    metrics = list(METRICS)
+    values = df_metrics[metrics].to_numpy(dtype=float)
+    low, high = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+    span = np.where(high > low, high - low, 1.0)
+    norm = (values - low) / span
+    lower_better = np.array([not METRICS[m][2] for m in metrics])
+    norm[:, lower_better] = 1 - norm[:, lower_better]
+    norm = np.nan_to_num(norm, nan=0.0)
+
+    w = np.array([weights[m] for m in metrics], dtype=float)
+    score = norm @ w / (w.sum() or 1) * 100
+    return pd.DataFrame(norm, index=df_metrics.index, columns=metrics), pd.Series(score, index=df_metrics.index)
+
+
+def _fmt(metric, value):
+    if pd.isna(value):
+        return '-'
+    if metric == 'gaji':
+        return f"Rp {value / 1_000_000:.1f} Juta".replace('.', ',')
+    if metric == 'volume':
+        return f"{int(value)} orang"
+    if metric == 'masa_tunggu':
+        return f"{value:.1f} bulan".replace('.', ',')
+    return f"{value:.1f}%".replace('.', ',')
+
+
+def narrative(df_metrics, df_norm, weights=None):
+    """
+    Templated predikat per group: titled after its strongest weighted
+    metric, naming its first places, strengths and weakest metric.
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    active = [m for m in METRICS if weights[m] > 0]
+    ranks = df_norm[active].rank(ascending=False, method='min').astype(int)
+    n = len(df_metrics)
+    texts = []
+    for group in df_metrics.index:
+        norm = df_norm.loc[group, active]
+        best, worst = norm.idxmax(), norm.idxmin()
+        describe = lambda m: f"{METRIC_NARRATIVE[m]} ({_fmt(m, df_metrics.loc[group, m])})"
+        firsts = [m for m in active if ranks.loc[group, m] == 1]
+        if firsts:
+            lead = f"JUARA 1 di {' dan '.join(describe(m) for m in firsts)}."
+        else:
+            lead = f"Unggul di {describe(best)}, peringkat {ranks.loc[group, best]} dari {n}."
+        text = f'<b>"{METRICS[best][3]}"</b><br>{lead}'
+        if worst != best and ranks.loc[group, worst] > n / 2:
+            text += f" Tantangannya ada pada {describe(worst)}, peringkat {ranks.loc[group, worst]} dari {n}."
+        texts.append(text)
+    return pd.Series(texts, index=df_metrics.index)
+
+
+def rank_groups(df, by='jurusan', weights=None, cube=None):
+    """
+    Composite ranking of every group of by ('jurusan' or 'prodi') by the
+    weighted, normalized outcome metrics. weights: {metric: weight}
+    overriding DEFAULT_WEIGHTS (0 drops a metric).
+    """
+    if cube is None:
+        cube = build_outcome_cube(df)
+    if cube.empty:
+        return pd.DataFrame()
+
+    df_metrics = outcome_metrics(cube, by)
+    df_norm, score = score_metrics(df_metrics, weights)
+    df_rank = pd.DataFrame({
+        'Peringkat': score.rank(ascending=False, method='min').astype(int),
+        'Skor': score.round(1),
+        # One star per quarter of the score range, at least one
+        'Skor Kekuatan': ['⭐' * int(max(1, np.ceil(s / 25))) for s in score],
+        'Predikat & Analisis': narrative(df_metrics, df_norm, weights),
+    })
+    if by == 'prodi':
+        df_rank.insert(0, 'Jurusan', cube.groupby('prodi')['jurusan'].first())
+    df_rank = pd.concat([df_rank, df_metrics.rename(columns={m: spec[0] for m, spec in METRICS.items()})], axis=1)
+    df_rank = df_rank.rename_axis(schema.label(by)).reset_index()
+    return df_rank.sort_values(['Peringkat', 'Skor'], ascending=[True, False], ignore_index=True)
+
+
+def parse_weights(items):
+    """['gaji=2', 'volume=0'] -> {'gaji': 2.0, 'volume': 0.0}"""
+    weights = {}
+    for item in items or []:
+        metric, _, value = item.partition('=')
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}' (choose from {', '.join(METRICS)})")
+        weights[metric] = float(value)
+    return weights
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Composite ranking of jurusan/prodi by employment outcomes.")
+    parser.add_argument('--by', default='jurusan', choices=['jurusan', 'prodi'])
+    parser.add_argument('--weight', nargs='*', metavar='METRIC=W',
+                        help=f"Override metric weights ({', '.join(f'{m}={w:g}' for m, w in DEFAULT_WEIGHTS.items())}).")
+    args = parser.parse_args()
+
+    df_rank = rank_groups(load_cleaned(), args.by, parse_weights(args.weight))
+    df_rank['Predikat & Analisis'] = df_rank['Predikat & Analisis'].str.replace(r'<[^>]+>', ' ', regex=True)
+    print_styled_table(df_rank.round(2), f"Peringkat {schema.label(args.by)}")
@@ -0,0 +1,143 @@
+import pandas as pd
+import numpy as np
+import argparse
+
+import formatting
+import schema
+from data_cache import load_cleaned
+from console import print_styled_table
+from dataset import WORKING_STATUS
+
+# Band intervals of schema.LEVEL_PENDAPATAN (Rupiah per month). The top band
+# is open; it is given the width of the band below it.
+BAND_EDGES = np.array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9], dtype=float) * 1_000_000
+BAND_LOWER = BAND_EDGES[:-1]
+BAND_UPPER = BAND_EDGES[1:]
+BAND_MID = (BAND_LOWER + BAND_UPPER) / 2
+
+DEFAULT_THRESHOLDS = (3_000_000, 5_000_000)
+
+# Dimensions offered on the command line (schema IDs)
+DIMENSIONS = ['jurusan', 'prodi', 'diploma', 'tahun_lulus', 'jenis_instansi']
+
+
+def encode_bands(series):
+    """Band code per respondent (0 = lowest band, -1 = no/unknown answer)."""
+    return pd.Categorical(series, categories=schema.LEVEL_PENDAPATAN).codes.astype(np.int64)
+
+
+def band_histogram(df, by=None, status=WORKING_STATUS, mask=None):
+    """
+    Respondents per (group, band) in a single bincount over group x band
+    codes. by: schema ID(s) forming the groups (None for the institution
+    total); status: statuses to include (None for all respondents), or a
+    precomputed boolean row mask (e.g. Dataset.mask('working')).
+    Returns (group index, counts [groups x bands]).
+    """
+    codes = encode_bands(df[schema.find_column(df, 'pendapatan')])
+    keep = codes >= 0
+    if mask is not None:
+        keep &= mask
+    elif status is not None:
+        keep &= df[schema.find_column(df, 'status')].isin(status).to_numpy()
+
+    by = [by] if isinstance(by, str) else list(by or [])
+    if by:
+        keys = [df[schema.find_column(df, k)].rename(k) for k in by]
+        group_codes, group_index = pd.MultiIndex.from_arrays(keys).factorize(sort=True) if len(by) > 1 \
+            else pd.factorize(keys[0], sort=True)
+        if len(by) == 1:
+            group_index = pd.Index(group_index, name=by[0])
+        keep &= group_codes >= 0
+    else:
+        group_codes, group_index = np.zeros(len(df), dtype=np.int64), pd.Index(['Total'])
+
+    n_bands = len(schema.LEVEL_PENDAPATAN)
+    counts = np.bincount(group_codes[keep] * n_bands + codes[keep],
+                         minlength=len(group_index) * n_bands).reshape(len(group_index), n_bands)
+    return group_index, counts
+
+
+def interpolated_quantile(counts, q):
+    """
+    Grouped-data quantile per row of counts, interpolating linearly inside
+    the band that holds the q-th respondent: L + (q*N - F) / f * width.
+    NaN for empty groups.
+    """
+    counts = np.asarray(counts, dtype=float)
+    n = counts.sum(axis=1)
+    cum = counts.cumsum(axis=1)
+    target = q * n
+    band = (cum < target[:, None]).sum(axis=1).clip(max=counts.shape[1] - 1)
+    rows = np.arange(len(counts))
+    f = counts[rows, band]
+    before = cum[rows, band] - f
+    with np.errstate(invalid='ignore', divide='ignore'):
+        value = BAND_LOWER[band] + (target - before) / f * (BAND_UPPER[band] - BAND_LOWER[band])
+    return np.where(n > 0, value, np.nan)
+
+
+def share_above(counts, threshold):
+    """
+    Share (%) of respondents earning more than threshold, assuming answers
+    are spread uniformly within each band.
+    """
+    counts = np.asarray(counts, dtype=float)
+    above = ((BAND_UPPER - threshold) / (BAND_UPPER - BAND_LOWER)).clip(0, 1)
+    n = counts.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(n > 0, counts @ above / n * 100, np.nan)
+
+
+def summarize(group_index, counts, thresholds=DEFAULT_THRESHOLDS):
+    """Salary statistics per row of a band histogram."""
+    n = counts.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(n > 0, counts @ BAND_MID / n, np.nan)
+    df_summary = pd.DataFrame({
+        'Responden': n,
+        'Rata-rata': mean,
+        'Q1': interpolated_quantile(counts, 0.25),
+        'Median': interpolated_quantile(counts, 0.5),
+        'Q3': interpolated_quantile(counts, 0.75),
+    }, index=group_index)
+    for t in thresholds:
+        df_summary[f'> Rp{t / 1_000_000:g} juta (%)'] = share_above(counts, t).round(1)
+    return df_summary
+
+
+def salary_summary(df, by=None, thresholds=DEFAULT_THRESHOLDS, status=WORKING_STATUS, total=True, mask=None):
+    """
+    Interval-aware salary statistics (mean of band midpoints, interpolated
+    quartiles, share above each threshold) per group of by (schema ID or
+    list of IDs). A 'Total' row is appended when grouping.
+    """
+    if schema.find_column(df, 'pendapatan') is None:
+        return pd.DataFrame()
+    group_index, counts = band_histogram(df, by, status, mask)
+    df_summary = summarize(group_index, counts, thresholds)
+    if by and total:
+        df_total = summarize(pd.Index(['Total']), counts.sum(axis=0, keepdims=True), thresholds)
+        if isinstance(group_index, pd.MultiIndex):
+            df_total.index = pd.MultiIndex.from_tuples([('Total',) + ('',) * (group_index.nlevels - 1)])
+        df_summary = pd.concat([df_summary[df_summary['Responden'] > 0], df_total])
+        df_summary.index.names = group_index.names
+    return df_summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Interval-aware salary statistics per group.")
+    parser.add_argument('--by', nargs='*', default=['jurusan'], choices=DIMENSIONS,
+                        help="Group columns (schema IDs); several form a cross table.")
+    parser.add_argument('--threshold', type=float, nargs='*', default=list(DEFAULT_THRESHOLDS),
+                        help="Report the share of respondents earning more than these amounts (Rupiah).")
+    args = parser.parse_args()
+
+    df_load = load_cleaned()
+    df_salary = salary_summary(df_load, args.by, args.threshold)
+    # Amounts print compactly (e.g. Rp3.8 juta)
+    formatting.set_formats(df_salary, dict.fromkeys(['Rata-rata', 'Q1', 'Median', 'Q3'], 'rupiah'))
+    if args.by:
+        df_salary.index.names = [schema.label(k) for k in args.by]
+        df_salary = df_salary.reset_index()
+    print_styled_table(df_salary, "Pendapatan Lulusan (Bekerja/Wiraswasta)")
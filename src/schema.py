@@ -0,0 +1,252 @@
+import pandas as pd
+import hashlib
+import json
+import re
+
+# Shared answer scales, lowest level first. The competency levels follow the
+# survey's codes (cleaning.competency_mapping: 3 = Menguasai, 4 = Cukup Menguasai)
+LEVEL_KOMPETENSI = ['Tidak Menguasai', 'Kurang Menguasai', 'Menguasai', 'Cukup Menguasai', 'Sangat Menguasai']
+LEVEL_METODE = ['Tidak Sama Sekali', 'Kurang Besar', 'Cukup Besar', 'Besar', 'Sangat Besar']
+LEVEL_PENDAPATAN = [
+    '< Rp. 1.000.000',
+    'Rp. 1.000.001 - Rp. 2.000.000',
+    'Rp. 2.000.001 - Rp. 3.000.000',
+    'Rp. 3.000.001 - Rp. 4.000.000',
+    'Rp. 4.000.001 - Rp. 5.000.000',
+    'Rp. 5.000.001 - Rp. 6.000.000',
+    'Rp. 6.000.001 - Rp. 7.000.000',
+    'Rp. 7.000.001 - Rp. 8.000.000',
+    '> Rp. 8.000.001',
+]
+
+# Option dictionaries of the multi-select questions (answers are comma-joined,
+# and several options contain commas themselves)
+OPSI_CARA_CARI = [
+    'Melalui iklan di koran/majalah, brosur',
+    'Melamar ke perusahaan tanpa mengetahui lowongan yang ada',
+    'Pergi ke Bursa/pameran kerja',
+    'Mencari lewat internet/iklan online/milis',
+    'Dihubungi oleh perusahaan',
+    'Menghubungi Kemenakertrans',
+    'Menghubungi Agen tenaga kerja komersial/swasta',
+    'Memperoleh informasi dari pusat/kantor pengembangan karir fakultas/universitas',
+    'Menghubungi kantor kemahasiswaan/hubungan alumni',
+    'Membangun jejaring (network) sejak masih kuliah',
+    'Melalui relasi (misalnya dosen, orang tua, saudara, teman, dll)',
+    'Membangun bisnis sendiri',
+    'Melalui penempatan kerja atau magang',
+    'Bekerja di tempat yang sama dengan tempat kerja semasa kuliah',
+]
+OPSI_ALASAN_TIDAK_SESUAI = [
+    'Pertanyaan tidak sesuai; pekerjaan saya sekarang sudah sesuai dengan pendidikan saya',
+    'Saya belum mendapatkan pekerjaan yang lebih sesuai',
+    'Di pekerjaan ini saya memperoleh propek karir yang baik',
+    'Saya lebih suka bekerja di area pekerjaan yang tidak ada hubungannya dengan pendidikan saya',
+    'Saya di promosikan ke posisi yang kurang berhubungan dengan pendidikan saya dibanding posisi sebelumnya',
+    'Saya dapat memperoleh pendapatan yang lebih tinggi di pekerjaan ini',
+    'Pekerjaan saya saat ini lebih aman/terjamin/secure',
+    'Pekerjaan saya saat ini lebih menarik',
+    'Pekerjaan saya saat ini lebih memungkinkan saya mengambil pekerjaan tambahan/jadwal yang fleksibel dll',
+    'Pekerjaan saya saat ini lokasinya lebih dekat dari rumah saya',
+    'Pekerjaan saya saat ini dapat lebih menjamin kebutuhan keluarga saya',
+    'Pada awal meniti karir ini, saya harus menerima pekerjaan yang tidak berhubungan dengan pendidikan saya',
+]
+
+
+def _col(label, dtype='str', categories=None, variants=()):
+    return {'label': label, 'dtype': dtype, 'categories': categories, 'variants': list(variants)}
+
+
+# Column registry: short ID -> canonical question text of the cleaned data,
+# dtype ('int', 'float', 'str', 'category', 'multi'), ordered category
+# dictionary (option dictionary for 'multi') and other spellings of the same column (raw headers, older exports).
+SCHEMA = {
+    'id': _col('ID', 'int'),
+    'tahun_lulus': _col('Tahun Lulus', 'int'),
+    'jurusan': _col('Jurusan'),
+    'diploma': _col('diploma', 'category', ['D1', 'D2', 'D3', 'D4']),
+    'prodi': _col('prodi', variants=['Program Studi']),
+    'status': _col('Jelaskan status Anda saat ini?', 'category', [
+        'Bekerja (Full time/Part time)', 'Wiraswasta', 'Melanjutkan Pendidikan',
+        'Tidak kerja tetapi sedang mencari kerja', 'Belum memungkinkan bekerja']),
+    'kerja_6bln': _col('Apakah anda telah mendapatkan pekerjaan <=6 bulan / termasuk bekerja sebelum lulus?',
+                       'category', ['Ya', 'Tidak']),
+    'masa_tunggu': _col('Dalam berapa bulan Anda mendapatkan pekerjaan? Tulis dengan angka (Contoh: 1, 1Tahun = 12 bulan) rev2',
+                        'float'),
+    'pendapatan': _col('Berapa rata-rata pendapatan Anda per bulan?', 'category', LEVEL_PENDAPATAN),
+    'provinsi': _col('Provinsi rev'),
+    'kabkota': _col('Kota/Kabupate rev', variants=['Kota/Kabupaten rev']),
+    'jenis_instansi': _col('Apa jenis Perusahaan/Instansi/Institusi tempat Anda bekerja sekarang? rev', 'category', [
+        'Instansi Pemerintah', 'Organisasi non-profit/Lembaga Swadaya Masyarakat', 'Perusahaan Swasta',
+        'Wiraswasta/perusahaan sendiri', 'BUMN/BUMD', 'Institusi/Organisasi Multilateral', 'lainnya']),
+    'posisi_wiraswasta': _col('Apaila berwiraswasta, apa posisi/jabatan Anda saat ini? (Status Wiraswasta)', 'category',
+                              ['Founder', 'Co-Founder', 'Staff', 'Freelance/Kerja lepas']),
+    'tingkat_kerja': _col('Apa tingkat tempat kerja Anda? rev', 'category', [
+        'Lokal/Wilayah (Wiraswasta tidak berbadan hukum)', 'Nasional (Wiraswasta berbadan hukum)',
+        'Multinasional/Internasional']),
+    'sumber_biaya': _col('Sumber biaya', 'category', ['Biaya Sendiri', 'Beasiswa']),
+    'sumber_dana': _col('Sumber dana dalam pembiayaan kuliah (bukan ketika studi lanjut) rev', 'category', [
+        'Biaya Sendiri/Keluarga', 'Beasiswa ADIK', 'Beasiswa BIDIKMISI', 'Beasiswa PPA', 'Beasiswa AFIRMASI',
+        'Beasiswa Perusahaan/Swasta', 'Lainnya']),
+    'keeratan': _col('Seberapa erat hubungan bidang studi dengan pekerjaan Anda?', 'category', [
+        'Tidak sama sekali', 'Kurang Erat', 'Cukup Erat', 'Erat', 'Sangat Erat']),
+    'kesesuaian_pendidikan': _col('Tingkat pendidikan apa yang paling tepat/sesuai untuk pekerjaan Anda saat ini?',
+                                  'category', ['Setingkat Lebih Tinggi', 'Tingkat yang Sama',
+                                               'Setingkat Lebih Rendah', 'Tidak Perlu Pendidikan Tinggi']),
+    'etika_acq': _col('Etika 1', 'category', LEVEL_KOMPETENSI),
+    'keahlian_acq': _col('Keahlian berdasarkan bidang ilmu 1', 'category', LEVEL_KOMPETENSI),
+    'inggris_acq': _col('Bahasa Inggris 1', 'category', LEVEL_KOMPETENSI),
+    'ti_acq': _col('Penggunaan Teknologi Informasi 1', 'category', LEVEL_KOMPETENSI),
+    'komunikasi_acq': _col('Komunikasi 1', 'category', LEVEL_KOMPETENSI),
+    'kerjasama_acq': _col('Kerjasama Tim 1', 'category', LEVEL_KOMPETENSI),
+    'pengembangan_acq': _col('Pengembangan 1', 'category', LEVEL_KOMPETENSI),
+    'etika_req': _col('Etika 2', 'category', LEVEL_KOMPETENSI),
+    'keahlian_req': _col('Keahlian berdasarkan bidang ilmu 2', 'category', LEVEL_KOMPETENSI),
+    'inggris_req': _col('Bahasa Inggris 2', 'category', LEVEL_KOMPETENSI),
+    'ti_req': _col('Penggunaan Teknologi Informasi 2', 'category', LEVEL_KOMPETENSI),
+    'komunikasi_req': _col('Komunikasi 2', 'category', LEVEL_KOMPETENSI),
+    'kerjasama_req': _col('Kerjasama Tim 2', 'category', LEVEL_KOMPETENSI),
+    'pengembangan_req': _col('Pengembangan 2', 'category', LEVEL_KOMPETENSI),
+    'm_perkuliahan': _col('Perkuliahan', 'category', LEVEL_METODE),
+    'm_demonstrasi': _col('Demonstrasi', 'category', LEVEL_METODE),
+    'm_riset': _col('Partisipasi dalam proyek riset', 'category', LEVEL_METODE),
+    'm_magang': _col('Magang', 'category', LEVEL_METODE),
+    'm_praktikum': _col('Praktikum', 'category', LEVEL_METODE),
+    'm_kerja_lapangan': _col('Kerja Lapangan', 'category', LEVEL_METODE),
+    'm_diskusi': _col('Diskusi', 'category', LEVEL_METODE),
+    'mulai_cari': _col('Kapan Anda mulai cari pekerjaan? (Mohon pekerjaan sambilan tidak dimasukkan)', 'category', [
+        'Kira-kira bulan sebelum lulus', 'Kira-kira bulan setelah lulus', 'Saya tidak mencari kerja']),
+    'cara_cari': _col('Bagaimana Anda mencari pekerjaan tersebut? (jawaban bisa lebih dari satu', 'multi',
+                      OPSI_CARA_CARI),
+    'jml_lamaran': _col('Berapa Perusahaan/Instansi/Institusi yang sudah Anda lamar (lewat surel atau email) '
+                        'sebelum Anda memperoleh pekerjaan pertama? rev', 'float'),
+    'jml_respon': _col('Berapa banyak Perusahaan/Instansi/Institusi yang merespon lamaran Anda? rev', 'float'),
+    'jml_wawancara': _col('Berapa banyak Perusahaann/Instansi/Institusi yang mengundang Anda untuk wawancara? rev',
+                          'float'),
+    'aktif_cari': _col('Apakah Anda aktif mencari pekerjaan dalam 4 minggu terakhir? rev', 'category', [
+        'Ya, saya akan mulai bekerja dalam 2 minggu kedepan',
+        'Ya, tapi saya belum pasti akan bekerja dalam 2minggu kedepan',
+        'Tidak, tapi saya sedang menunggu hasil lamaran kerja', 'Tidak', 'Lainnya']),
+    'alasan_tidak_sesuai': _col('Jika menurut Anda pekerjaan saat ini tidak sesuai dengan pendidikan Anda, '
+                                'mengapa  mengambilnya? Jawaban bisa lebih dari satu', 'multi',
+                                OPSI_ALASAN_TIDAK_SESUAI),
+}
+
+
+def registry_hash():
+    """SHA-256 of the registry (labels, dtypes, categories, variants); caches of canonicalized data key on it."""
+    return hashlib.sha256(json.dumps(SCHEMA, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def normalize(text):
+    """Header comparison key: case- and whitespace-insensitive."""
+    return re.sub(r'\s+', ' ', str(text)).strip().casefold()
+
+
+# normalized label -> ID, normalized variant -> ID (labels take precedence)
+_LABEL_INDEX = {normalize(spec['label']): col_id for col_id, spec in SCHEMA.items()}
+_VARIANT_INDEX = {normalize(v): col_id for col_id, spec in SCHEMA.items() for v in spec['variants']}
+_VARIANT_INDEX.update(_LABEL_INDEX)
+
+
+def column_id(name, variants=True):
+    """Registry ID of a column header (an ID itself, a label or a variant), or None."""
+    if name in SCHEMA:
+        return name
+    key = normalize(name)
+    return (_VARIANT_INDEX if variants else _LABEL_INDEX).get(key)
+
+
+def find_column(df, col_id):
+    """Header in df holding an ID's data (the ID itself, its label or a variant), or None."""
+    if col_id in df.columns:
+        return col_id
+    if col_id not in SCHEMA:
+        return None
+    spec = SCHEMA[col_id]
+    for candidate in [spec['label']] + spec['variants']:
+        if candidate in df.columns:
+            return candidate
+    # Tolerate case/whitespace drift, labels before variants
+    for allow_variants in (False, True):
+        for name in df.columns:
+            if column_id(name, variants=allow_variants) == col_id:
+                return name
+    return None
+
+
+def label(col_id):
+    """Display label of an ID; unknown names are returned unchanged."""
+    return SCHEMA[col_id]['label'] if col_id in SCHEMA else col_id
+
+
+def _rename_map(columns, target, variants):
+    """
+    {header: target name} for every registered header. Exact labels claim
+    their ID first, so a variant never shadows the canonical column.
+    """
+    ids = {}
+    for allow_variants in ([False, True] if variants else [False]):
+        for name in columns:
+            col_id = column_id(name, variants=allow_variants)
+            if name not in ids and col_id is not None and col_id not in ids.values():
+                ids[name] = col_id
+
+    mapping = {}
+    for name, col_id in ids.items():
+        new = col_id if target == 'id' else SCHEMA[col_id]['label']
+        if new != name:
+            mapping[name] = new
+    return mapping
+
+
+def canonicalize_columns(df, variants=False):
+    """
+    Renames headers that differ from a registry label only by case or
+    whitespace (or, with variants=True, by a known alternative spelling)
+    to the canonical label. Other columns are left untouched.
+    """
+    present = set(df.columns)
+    mapping = {k: v for k, v in _rename_map(df.columns, 'label', variants).items() if v not in present}
+    return df.rename(columns=mapping) if mapping else df
+
+
+def cast(series, col_id):
+    """Casts a column to its registry dtype. Unknown category values become NaN."""
+    spec = SCHEMA[col_id]
+    if spec['dtype'] == 'int':
+        return pd.to_numeric(series, errors='coerce').astype('Int64')
+    if spec['dtype'] == 'float':
+        return pd.to_numeric(series, errors='coerce').astype(float)
+    if spec['dtype'] == 'category' and spec['categories']:
+        return pd.Categorical(series, categories=spec['categories'], ordered=True)
+    return series
+
+
+def to_ids(df, dtypes=False):
+    """
+    Renames registered columns to their compact IDs (call once at load).
+    dtypes=True also casts them to the registry dtypes.
+    """
+    df_out = df.rename(columns=_rename_map(df.columns, 'id', variants=True))
+    if dtypes:
+        for col_id in [c for c in df_out.columns if c in SCHEMA]:
+            df_out[col_id] = cast(df_out[col_id], col_id)
+    return df_out
+
+
+def to_labels(df):
+    """Resolves IDs in the columns and index names of a frame to display labels (render time)."""
+    df_out = df.rename(columns={c: label(c) for c in df.columns if c in SCHEMA})
+    if any(name in SCHEMA for name in df_out.index.names):
+        df_out.index = df_out.index.set_names([label(n) for n in df_out.index.names])
+    return df_out
+
+
+def describe():
+    """Registry as a table (ID, label, dtype, number of categories)."""
+    return pd.DataFrame([
+        {'ID': col_id, 'Kolom': spec['label'], 'Tipe': spec['dtype'],
+         'Kategori': len(spec['categories'] or [])}
+        for col_id, spec in SCHEMA.items()
+    ])
@@ -0,0 +1,150 @@
+import pandas as pd
+import numpy as np
+import argparse
+
+import schema
+from data_cache import load_cleaned
+from console import print_styled_table
+from dataset import WORKING_STATUS
+
+# Follow-up of job seekers: months from graduation to the survey. The
+# cleaned data keeps only Tahun Lulus, so graduation is placed in
+# GRADUATION_MONTH of that year; the survey ran from July 2025 (most answers
+# in July/August).
+SURVEY_YEAR, SURVEY_MONTH = 2025, 8
+GRADUATION_MONTH = 9
+
+SEEKING_STATUS = 'Tidak kerja tetapi sedang mencari kerja'
+
+# Months at which the survival table reports the share still searching
+REPORT_MONTHS = (3, 6, 12)
+
+
+def follow_up_months(tahun_lulus, survey_year=SURVEY_YEAR, survey_month=SURVEY_MONTH,
+                     graduation_month=GRADUATION_MONTH):
+    """Months between graduation and the survey (at least 0)."""
+    years = pd.to_numeric(tahun_lulus, errors='coerce').to_numpy(dtype=float)
+    return np.clip((survey_year - years) * 12 + (survey_month - graduation_month), 0, None)
+
+
+def survival_data(df, **follow_up):
+    """
+    Durations and event flags per respondent. Working respondents with a
+    masa tunggu are events at that duration; job seekers are right-censored
+    at their follow-up time. Everyone else (further study, not able to
+    work, working without a duration) is left out (NaN duration).
+    Returns (durations, events) aligned with df.
+    """
+    status = df[schema.find_column(df, 'status')]
+    masa_tunggu = pd.to_numeric(df[schema.find_column(df, 'masa_tunggu')], errors='coerce').to_numpy(dtype=float)
+    events = status.isin(WORKING_STATUS).to_numpy() & ~np.isnan(masa_tunggu)
+    censored = (status == SEEKING_STATUS).to_numpy()
+    durations = np.full(len(df), np.nan)
+    durations[events] = np.clip(masa_tunggu[events], 0, None)
+    durations[censored] = follow_up_months(df[schema.find_column(df, 'tahun_lulus')], **follow_up)[censored]
+    return durations, events
+
+
+def kaplan_meier(durations, events, groups=None):
+    """
+    Kaplan-Meier estimate for every group at once. Events and exits are
+    counted per (group, distinct time) with one bincount each; the number
+    at risk is the group size minus earlier exits, and the survival is the
+    cumulative product along the time axis. Events are taken before
+    censorings at tied times.
+    Returns (group labels, times, survival [groups x times], at risk,
+    events per time).
+    """
+    durations = np.asarray(durations, dtype=float)
+    events = np.asarray(events, dtype=bool)
+    if groups is None:
+        group_codes, group_labels = np.zeros(len(durations), dtype=np.int64), pd.Index(['Total'])
+    else:
+        group_codes, group_labels = pd.factorize(pd.Series(groups), sort=True)
+    valid = (group_codes >= 0) & ~np.isnan(durations)
+    times, time_codes = np.unique(durations[valid], return_inverse=True)
+    n_groups, n_times = len(group_labels), len(times)
+
+    flat = group_codes[valid] * n_times + time_codes.ravel()
+    exits = np.bincount(flat, minlength=n_groups * n_times).reshape(n_groups, n_times)
+    deaths = np.bincount(flat, weights=events[valid], minlength=n_groups * n_times).reshape(n_groups, n_times)
+    at_risk = exits.sum(axis=1, keepdims=True) - np.cumsum(exits, axis=1) + exits
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hazard = np.where(at_risk > 0, deaths / at_risk, 0.0)
+    return group_labels, times, np.cumprod(1 - hazard, axis=1), at_risk, deaths
+
+
+def survival_at(times, survival, t):
+    """Step-function value S(t) per group (1 before the first time)."""
+    idx = np.searchsorted(times, t, side='right') - 1
+    return survival[:, idx] if idx >= 0 else np.ones(len(survival))
+
+
+def median_time(times, survival):
+    """First time at which S(t) <= 0.5 per group; NaN if never reached."""
+    reached = survival <= 0.5
+    first = reached.argmax(axis=1)
+    return np.where(reached.any(axis=1), times[first], np.nan)
+
+
+def survival_table(df, by=None, **follow_up):
+    """
+    Median months to the first job and the share still searching after
+    REPORT_MONTHS per group of by (schema ID; None for the institution).
+    Grouped tables end with a 'Total' row.
+    """
+    if any(schema.find_column(df, k) is None for k in ('status', 'masa_tunggu', 'tahun_lulus')):
+        return pd.DataFrame()
+    durations, events = survival_data(df, **follow_up)
+    in_analysis = ~np.isnan(durations)
+
+    parts = []
+    levels = [None] if by is None else [by, None]
+    for level in levels:
+        groups = None if level is None else df[schema.find_column(df, level)]
+        labels, times, surv, _, _ = kaplan_meier(durations, events, groups)
+        codes = np.zeros(len(df), dtype=np.int64) if groups is None else pd.Index(labels).get_indexer(groups)
+        keep = in_analysis & (codes >= 0)
+        n = np.bincount(codes[keep], minlength=len(labels))
+        n_events = np.bincount(codes[keep], weights=events[keep], minlength=len(labels)).astype(int)
+        df_part = pd.DataFrame({
+            'Responden': n,
+            'Bekerja (Event)': n_events,
+            'Masih Mencari (Tersensor)': n - n_events,
+            'Median Masa Tunggu (Bulan)': median_time(times, surv),
+        }, index=labels)
+        for t in REPORT_MONTHS:
+            df_part[f'Masih Mencari > {t} Bulan (%)'] = (survival_at(times, surv, t) * 100).round(1)
+        parts.append(df_part)
+
+    df_table = pd.concat(parts)
+    df_table.index.name = schema.label(by) if by else None
+    return df_table
+
+
+def survival_curves(df, by=None, **follow_up):
+    """{group: DataFrame(times, survival)} for charts, from one estimator call."""
+    durations, events = survival_data(df, **follow_up)
+    groups = None if by is None else df[schema.find_column(df, by)]
+    labels, times, surv, at_risk, _ = kaplan_meier(durations, events, groups)
+    return {g: pd.DataFrame({'Bulan': times, 'Survival': surv[i], 'At Risk': at_risk[i]})
+            for i, g in enumerate(labels)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kaplan-Meier time to first job, job seekers censored.")
+    parser.add_argument('--by', nargs='*', default=['jurusan', 'prodi', 'tahun_lulus'],
+                        help="Group columns (schema IDs), one table each.")
+    parser.add_argument('--survey', default=f"{SURVEY_YEAR}-{SURVEY_MONTH:02d}",
+                        help="Survey reference month (YYYY-MM) for the follow-up of job seekers.")
+    parser.add_argument('--graduation-month', type=int, default=GRADUATION_MONTH)
+    args = parser.parse_args()
+
+    year, month = (int(v) for v in args.survey.split('-'))
+    follow_up = {'survey_year': year, 'survey_month': month, 'graduation_month': args.graduation_month}
+    df_load = load_cleaned()
+    print_styled_table(survival_table(df_load, **follow_up).reset_index(names='Kelompok'), "Masa Tunggu Institusi")
+    for col_id in args.by:
+        print_styled_table(survival_table(df_load, col_id, **follow_up).reset_index(),
+                           f"Masa Tunggu per {schema.label(col_id)} (Kaplan-Meier)")
@@ -0,0 +1,238 @@
+import pandas as pd
+import numpy as np
+import argparse
+import os
+
+import schema
+from data_cache import load_cleaned, DATA_FILE
+
+# Setup Paths
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYNTHETIC_DIR = os.path.join(BASE_DIR, 'data', 'synthetic')
+
+# Conditional structure of the generator (schema IDs). Each column is drawn
+# from its empirical distribution given the values of its parents; columns
+# not listed here are conditioned on the respondent's status.
+PARENTS = {
+    'tahun_lulus': [],
+    'jurusan': ['tahun_lulus'],
+    'prodi': ['jurusan'],
+    'diploma': ['prodi'],
+    'status': ['jurusan'],
+    'kerja_6bln': ['status'],
+    'masa_tunggu': ['status', 'kerja_6bln'],
+    'pendapatan': ['status', 'jurusan'],
+    'provinsi': ['status'],
+    'kabkota': ['provinsi'],
+}
+DEFAULT_PARENTS = ['status']
+
+# Cleaned -> raw value codes, inverting the mappings in cleaning.py
+RAW_KOMPETENSI = {level: code for code, level in enumerate(schema.LEVEL_KOMPETENSI, 1)}
+RAW_METODE = {'Sangat Besar': 1, 'Besar': 2, 'Cukup Besar': 3, 'Kurang Besar': 4, 'Tidak Sama Sekali': 5}
+RAW_TINGKAT = {'Lokal/Wilayah (Wiraswasta tidak berbadan hukum)': 1, 'Nasional (Wiraswasta berbadan hukum)': 2,
+               'Multinasional/Internasional': 3}
+
+# Raw export layout: header -> schema ID it is derived from (None = left empty)
+RAW_COLUMNS = {
+    'ID': 'id',
+    'Timestamp': None,
+    'Email Address': None,
+    'Nama Mahasiswa': None,
+    'Nomor Induk Mahasiswa (NIM)': None,
+    'Nomor Handphone': None,
+    'NIK': None,
+    'Tahun Lulus': 'tahun_lulus',
+    'Jurusan ': 'jurusan',
+    'Program Studi': 'prodi',
+    'No. NPWP / SIUP (Jika ada)': None,
+    'Nama Perusahaan Tempat Bekerja (Jika Anda sudah bekerja)': None,
+    'Nama Atasan': None,
+    'Kontak Atasan (Email atau No Telepon)': None,
+    'Jelaskan status Anda saat ini?': 'status',
+    'Apakah anda telah mendapatkan pekerjaan <=6 bulan / termasuk bekerja sebelum lulus?': 'kerja_6bln',
+    'Dalam berapa bulan Anda mendapatkan pekerjaan? Tulis dengan angka (Contoh: 1, 1Tahun = 12 bulan)': 'masa_tunggu',
+    'Dalam berapa bulan Anda mendapatkan pekerjaan? Tulis dengan angka (Contoh: 1, 1Tahun = 12 bulan) rev2': 'masa_tunggu',
+    'Berapa rata-rata pendapatan Anda per bulan?': 'pendapatan',
+    'Provinsi ': 'provinsi',
+    'Provinsi rev': 'provinsi',
+    'Kota/Kabupaten': 'kabkota',
+    'Kota/Kabupate rev': 'kabkota',
+    'Apa jenis Perusahaan/Instansi/Institusi tempat Anda bekerja sekarang?': 'jenis_instansi',
+    'Apa nama perusahaan/kantor tempat Anda bekerja?': None,
+    'Apaila berwiraswasta, apa posisi/jabatan Anda saat ini? (Status Wiraswasta)': 'posisi_wiraswasta',
+    'Apa tingkat tempat kerja Anda?': 'tingkat_kerja',
+    'Sumber biaya ': 'sumber_biaya',
+    'Perguruan Tinggi': None,
+    'Program Studi ': None,
+    'Tanggal Masuk (Contoh: 7 Januari 2020)': None,
+    'Sumber dana dalam pembiayaan kuliah (bukan ketika studi lanjut)': 'sumber_dana',
+    'Seberapa erat hubungan bidang studi dengan pekerjaan Anda? ': 'keeratan',
+    'Tingkat pendidikan apa yang paling tepat/sesuai untuk pekerjaan Anda saat ini?': 'kesesuaian_pendidikan',
+    **{schema.label(c): c for c in schema.SCHEMA if c.endswith('_acq') or c.endswith('_req') or c.startswith('m_')},
+    'Kapan Anda mulai cari pekerjaan? (Mohon pekerjaan sambilan tidak dimasukkan)': 'mulai_cari',
+    'Bagaimana Anda mencari pekerjaan tersebut? (jawaban bisa lebih dari satu': 'cara_cari',
+    'Berapa Perusahaan/Instansi/Institusi yang sudah Anda lamar (lewat surel atau email) sebelum Anda memperoleh pekerjaan pertama?': 'jml_lamaran',
+    'Berapa Perusahaan/Instansi/Institusi yang sudah Anda lamar (lewat surel atau email) sebelum Anda memperoleh pekerjaan pertama? rev': 'jml_lamaran',
+    'Berapa banyak Perusahaan/Instansi/Institusi yang merespon lamaran Anda?': 'jml_respon',
+    'Berapa banyak Perusahaan/Instansi/Institusi yang merespon lamaran Anda? rev': 'jml_respon',
+    'Berapa banyak Perusahaann/Instansi/Institusi yang mengundang Anda untuk wawancara?': 'jml_wawancara',
+    'Berapa banyak Perusahaann/Instansi/Institusi yang mengundang Anda untuk wawancara? Rev': 'jml_wawancara',
+    'Apakah Anda aktif mencari pekerjaan dalam 4 minggu terakhir?': 'aktif_cari',
+    'Jika menurut Anda pekerjaan saat ini tidak sesuai dengan pendidikan Anda, mengapa  mengambilnya? Jawaban bisa lebih dari satu': 'alasan_tidak_sesuai',
+}
+
+
+def _key(values):
+    """Hashable group key; NaN becomes the string 'nan' so it can be looked up."""
+    return tuple(str(v) for v in values)
+
+
+def _distribution(series):
+    """(values, probabilities) of a column, missing values included."""
+    counts = series.value_counts(dropna=False)
+    return counts.index.to_numpy(dtype=object), (counts / counts.sum()).to_numpy(dtype=float)
+
+
+def learn_model(df):
+    """
+    Learns the generator from a cleaned frame (IDs or question texts):
+    the marginal of every column and its conditional distribution given
+    its PARENTS. Returns a dict used by sample().
+    """
+    df = schema.to_ids(df)
+    columns = [c for c in df.columns if c != 'id']
+    order = [c for c in PARENTS if c in columns] + [c for c in columns if c not in PARENTS]
+
+    model = {'order': [], 'columns': list(df.columns), 'dtypes': {}, 'rows': len(df)}
+    for col in order:
+        parents = [p for p in PARENTS.get(col, DEFAULT_PARENTS) if p in model['order']]
+        conditional = {}
+        if parents:
+            for key, sub in df.groupby(parents, dropna=False, sort=False):
+                conditional[_key(key)] = _distribution(sub[col])
+        model[col] = {'parents': parents, 'marginal': _distribution(df[col]), 'conditional': conditional}
+        model['dtypes'][col] = df[col].dtype
+        model['order'].append(col)
+    return model
+
+
+def sample(model, n_rows, seed=0):
+    """Draws n_rows synthetic respondents in the cleaned schema (schema IDs as columns)."""
+    rng = np.random.default_rng(seed)
+    out = {}
+    for col in model['order']:
+        spec = model[col]
+        values = np.empty(n_rows, dtype=object)
+        if not spec['parents']:
+            choices, probs = spec['marginal']
+            values[:] = rng.choice(choices, size=n_rows, p=probs)
+        else:
+            df_parents = pd.DataFrame({p: out[p] for p in spec['parents']})
+            for key, idx in df_parents.groupby(spec['parents'], dropna=False, sort=False).indices.items():
+                key = key if isinstance(key, tuple) else (key,)
+                choices, probs = spec['conditional'].get(_key(key), spec['marginal'])
+                values[idx] = rng.choice(choices, size=len(idx), p=probs)
+        out[col] = values
+
+    df_out = pd.DataFrame({'id': np.arange(1, n_rows + 1)})
+    for col in model['columns']:
+        if col == 'id':
+            continue
+        dtype = model['dtypes'][col]
+        series = pd.Series(out[col])
+        df_out[col] = pd.to_numeric(series) if pd.api.types.is_numeric_dtype(dtype) else series.astype(dtype)
+    return df_out
+
+
+def to_cleaned_form(df_ids):
+    """Cleaned-data layout: question texts as headers, as in cleaned_data.xlsx."""
+    return schema.to_labels(df_ids)
+
+
+def to_raw_form(df_ids, seed=0, duplicate_rate=0.01):
+    """
+    Raw export layout (data/raw/data.xlsx) that cleaning.py can process:
+    coded answers, 'Program Studi' as '<diploma> - <prodi>', fake identity
+    columns and a share of earlier duplicate submissions per NIM.
+    """
+    rng = np.random.default_rng(seed + 1)
+    n = len(df_ids)
+    df = df_ids.copy()
+    df['prodi'] = df['diploma'].astype(str) + ' - ' + df['prodi'].astype(str)
+    for col in df.columns:
+        if col.endswith('_acq') or col.endswith('_req'):
+            df[col] = df[col].map(RAW_KOMPETENSI)
+        elif col.startswith('m_'):
+            df[col] = df[col].map(lambda v: f"{RAW_METODE[v]} {v}" if v in RAW_METODE else v)
+    if 'tingkat_kerja' in df.columns:
+        df['tingkat_kerja'] = df['tingkat_kerja'].map(lambda v: f"{RAW_TINGKAT[v]} {v}" if v in RAW_TINGKAT else v)
+    for col in ('jenis_instansi', 'sumber_dana', 'aktif_cari'):
+        if col in df.columns:
+            # Values outside the allowed lists are free text in the raw export
+            df[col] = df[col].replace({'lainnya': '-', 'Lainnya': np.nan})
+
+    df_raw = pd.DataFrame(index=df.index)
+    for header, col_id in RAW_COLUMNS.items():
+        df_raw[header] = df[col_id] if col_id in df.columns else np.nan
+
+    nim = 3_000_000_000 + rng.choice(10 ** 9, size=n, replace=False)
+    start = pd.Timestamp('2025-07-01').value
+    df_raw['Timestamp'] = pd.to_datetime(rng.integers(start, start + 90 * 86_400 * 10 ** 9, size=n))
+    df_raw['Email Address'] = [f"alumni{i}@example.com" for i in range(n)]
+    df_raw['Nama Mahasiswa'] = [f"Alumni {i}" for i in range(n)]
+    df_raw['Nomor Induk Mahasiswa (NIM)'] = nim
+    df_raw['Nomor Handphone'] = [f"08{i:010d}" for i in range(n)]
+    df_raw['NIK'] = 6_100_000_000_000_000 + np.arange(n)
+
+    # Earlier submissions of the same NIM, which cleaning.py drops again
+    n_dup = int(n * duplicate_rate)
+    if n_dup:
+        df_dup = df_raw.iloc[rng.choice(n, size=n_dup, replace=False)].copy()
+        df_dup['Timestamp'] = df_dup['Timestamp'] - pd.Timedelta(days=1)
+        df_raw = pd.concat([df_raw, df_dup], ignore_index=True)
+        df_raw['ID'] = np.arange(1, len(df_raw) + 1)
+    return df_raw
+
+
+def save(df, path):
+    """Writes by extension: .xlsx, .csv, .parquet or .pkl."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.xlsx':
+        df.to_excel(path, index=False)
+    elif ext == '.parquet':
+        df.to_parquet(path, index=False)
+    elif ext == '.pkl':
+        df.to_pickle(path)
+    else:
+        df.to_csv(path, index=False)
+    print(f"Synthetic data saved to '{path}' ({len(df)} rows)")
+
+
+def generate(n_rows, seed=0, form='cleaned', source=DATA_FILE):
+    """Learns from the cleaned data and returns n_rows synthetic rows in the given form."""
+    model = learn_model(load_cleaned(source))
+    df_ids = sample(model, n_rows, seed=seed)
+    return to_raw_form(df_ids, seed=seed) if form == 'raw' else to_cleaned_form(df_ids)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic tracer study data for scale testing.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000],
+                        help="Dataset size(s), e.g. --rows 10000 100000 1000000.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (same seed, same data).")
+    parser.add_argument('--form', choices=['cleaned', 'raw', 'both'], default='both',
+                        help="Cleaned-data schema, raw-export schema or both.")
+    parser.add_argument('--format', choices=['xlsx', 'csv', 'parquet', 'pkl'], default='csv',
+                        help="Output format (xlsx is slow beyond ~100k rows).")
+    parser.add_argument('--out-dir', default=SYNTHETIC_DIR, help="Output directory.")
+    args = parser.parse_args()
+
+    model = learn_model(load_cleaned())
+    for n in args.rows:
+        df_ids = sample(model, n, seed=args.seed)
+        forms = ['cleaned', 'raw'] if args.form == 'both' else [args.form]
+        for form in forms:
+            df_form = to_raw_form(df_ids, seed=args.seed) if form == 'raw' else to_cleaned_form(df_ids)
+            save(df_form, os.path.join(args.out_dir, f"{form}_{n}_seed{args.seed}.{args.format}"))
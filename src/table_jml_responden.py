@@ -4,420 +4,27 @@ import io
 import time
 import os
 
-try:
-    import folium
-    from folium.plugins import MarkerCluster
-except ImportError as e:
-    print(f"Import Error: {e}")
-    folium = None
-
-# Optional Geopandas for Static Maps
-try:
-    import geopandas as gpd
-    import matplotlib.pyplot as plt
-    import matplotlib.patheffects
-    from shapely.geometry import Point
-    # from mpl_toolkits.axes_grid1 import make_axes_locatable # Removed
-except ImportError:
-    gpd = None
-    plt = None
-
-# Database Koordinat Provinsi Indonesia (Latitude, Longitude)
-INDO_COORDS = {
-    'Aceh': (4.6951, 96.7494),
-    'Sumatera Utara': (2.1154, 99.5451),
-    'Sumatera Barat': (-0.7399, 100.8000),
-    'Riau': (0.2933, 101.7068),
-    'Jambi': (-1.4852, 102.4381),
-    'Sumatera Selatan': (-3.3194, 104.9144),
-    'Bengkulu': (-3.5778, 102.3464),
-    'Lampung': (-4.5586, 105.4068),
-    'Kepulauan Bangka Belitung': (-2.7411, 106.4406),
-    'Kepulauan Riau': (3.9456, 108.1428),
-    'DKI Jakarta': (-6.2088, 106.8456),
-    'Jawa Barat': (-6.9175, 107.6191),
-    'Jawa Tengah': (-7.1510, 110.1403),
-    'Daerah Istimewa Yogyakarta': (-7.7956, 110.3695),
-    'Jawa Timur': (-7.5360, 112.2384),
-    'Banten': (-6.4058, 106.0640),
-    'Bali': (-8.4095, 115.1889),
-    'Nusa Tenggara Barat': (-8.6529, 117.3616),
-    'Nusa Tenggara Timur': (-8.6574, 121.0794),
-    'Kalimantan Barat': (-0.2787, 111.4753),
-    'Kalimantan Tengah': (-1.6815, 113.3824),
-    'Kalimantan Selatan': (-3.0926, 115.2838),
-    'Kalimantan Timur': (0.5387, 116.4194),
-    'Kalimantan Utara': (3.0731, 116.0414),
-    'Sulawesi Utara': (0.6247, 123.9750),
-    'Sulawesi Tengah': (-1.4300, 121.4456),
-    'Sulawesi Selatan': (-3.6687, 119.9740),
-    'Sulawesi Tenggara': (-4.1449, 122.1746),
-    'Gorontalo': (0.6999, 122.4467),
-    'Sulawesi Barat': (-2.8441, 119.2321),
-    'Maluku': (-3.2385, 129.4936),
-    'Maluku Utara': (0.2120, 127.9791),
-    'Papua Barat': (-1.3361, 133.1747),
-    'Papua': (-4.2699, 138.0804),
-    'Sumatera Tengah': (-0.947, 100.417)
-}
-
-# Database Koordinat Kota/Kabupaten di Kalbar
-KALBAR_COORDS = {
-    'Pontianak': (-0.026330, 109.342504),
-    'Kubu Raya': (-0.468725, 109.378906),
-    'Ketapang': (-1.595914, 110.490723), # Approx center
-    'Mempawah': (0.334000, 109.116000),
-    'Sanggau': (0.120800, 110.586600),
-    'Sambas': (1.338700, 109.317500),
-    'Landak': (0.435700, 109.957500), # Ngabang
-    'Singkawang': (0.910300, 108.985000),
-    'Kayong Utara': (-1.144800, 109.957900), # Sukadana
-    'Sintang': (0.071100, 111.495200),
-    'Kapuas Hulu': (0.814300, 112.930400), # Putussibau
-    'Sekadau': (0.035700, 110.938800),
-    'Melawi': (-0.686500, 111.688100), # Nanga Pinoh
-    'Bengkayang': (0.931700, 109.529900)
-}
-
-
-def generate_static_map_geopandas(df_counts, output_path, region_name='Indonesia', total_reference=None):
-    """
-    Generates a static map.
-    - Indonesia: Choropleth (Polygons) if GeoJSON available.
-    - Kalbar: Bubble Map (Points) as fallback for missing Regency shapefiles.
-    - total_reference: Optional total to use for percentage calculation (to match table).
-    """
-    if not gpd or not plt:
-        print("Geopandas or Matplotlib not available.")
-        return
-
-    # 1. Indonesia Map -> CHOROPLETH
-    if region_name == 'Indonesia':
-        try:
-            # Load Indonesia Province GeoJSON
-            url = "https://raw.githubusercontent.com/superpikar/indonesia-geojson/master/indonesia-province-simple.json"
-            gdf_indo = gpd.read_file(url)
-            
-            # Normalize Names for Merge
-            # GeoJSON 'Propinsi' is usually UPPERCASE (e.g., 'JAWA BARAT')
-            # Our DF 'Provinsi' might be Mixed (e.g., 'Jawa Barat')
-            
-            # Create copy to avoid mutating original
-            df_plot = df_counts.copy()
-            if 'Provinsi' in df_plot.columns:
-                 # Normalize: Upper case
-                 df_plot['Provinsi_Upper'] = df_plot['Provinsi'].astype(str).str.upper()
-                 
-                 # Manual fixes for common mismatches if known
-                 # e.g. 'DI YOGYAKARTA' vs 'JAKARTA RAYA' - check content
-                 name_map = {
-                     'DI YOGYAKARTA': 'DAERAH ISTIMEWA YOGYAKARTA',
-                     'DKI JAKARTA': 'DKI JAKARTA'
-                 }
-                 df_plot['Provinsi_Upper'] = df_plot['Provinsi_Upper'].replace(name_map)
-                 
-                 # GeoJSON column: 'Propinsi'
-                 gdf_indo['Propinsi_Upper'] = gdf_indo['Propinsi'].astype(str).str.upper()
-                 
-                 # Merge
-                 gdf_merged = gdf_indo.merge(df_plot, left_on='Propinsi_Upper', right_on='Provinsi_Upper', how='left')
-                 
-                 # Fill NaN with 0 for plotting
-                 gdf_merged['Jumlah'] = gdf_merged['Jumlah'].fillna(0)
-                 
-                 # Plot Choropleth
-                 fig, ax = plt.subplots(figsize=(15, 6))
-                 
-                 gdf_merged.plot(column='Jumlah',
-                                 ax=ax,
-                                 legend=True,
-                                 legend_kwds={'label': "Jumlah Alumni", 'orientation': "horizontal"},
-                                 cmap='Blues',
-                                 edgecolor='black',
-                                 linewidth=0.5,
-                                 missing_kwds={'color': 'lightgrey'})
-                                 
-                 ax.set_title(f"Sebaran Alumni - {region_name} (Choropleth)", fontsize=16)
-                 ax.axis('off')
-                 
-                 plt.tight_layout()
-                 plt.savefig(output_path, dpi=150, bbox_inches='tight')
-                 plt.close()
-                 print(f"Choropleth Map saved: {output_path}")
-                 return
-
-        except Exception as e:
-            print(f"Failed to generate Choropleth for {region_name}: {e}")
-            print("Falling back to Point map...")
-
-
-    # 2. Kalbar Map -> CHOROPLETH
-    if region_name == 'Kalimantan Barat':
-        try:
-             # Load Kalbar GeoJSON
-             url = "https://raw.githubusercontent.com/ghapsara/indonesia-atlas/master/kabupaten-kota/Kalimantan%20Barat/kalimantan-barat-simplified-topo.json"
-             gdf_kalbar = gpd.read_file(url)
-             
-             # User reported duplicates (Mempawah appearing twice). Drop duplicates by name.
-             gdf_kalbar = gdf_kalbar.drop_duplicates(subset='kabkot', keep='first')
-             
-             # Prepare Data for Merge
-             # DF column usually 'Kota/Kabupaten' which has values like 'Kab. Sambas', 'Kota Pontianak'
-             # GeoJSON 'kabkot' has 'Sambas', 'Pontianak' (confirmed via script)
-             
-             # We need to normalize DF names to match GeoJSON
-             df_plot = df_counts.copy()
-             
-             # DEBUG: Print GeoJSON contents
-             print("--- Kalbar GeoJSON Regions ---")
-             print(gdf_kalbar['kabkot'].unique())
-             print(f"Total Regions: {len(gdf_kalbar)}")
-             
-             def normalize_kalbar_name(name):
-                 # Remove 'Kab. ', 'Kota ', 'Kabupaten ' prefix case-insensitive
-                 # simple string replace might miss case or variations
-                 import re
-                 # Remove "Kabupaten", "Kab.", "Kota" with optional trailing space/dot
-                 clean = re.sub(r'^(Kabupaten|Kab\.?|Kota)\s*', '', name, flags=re.IGNORECASE)
-                 return clean.strip()
-             
-             label_col = 'Kota/Kabupaten'
-             if label_col in df_plot.columns:
-                 df_plot['kabkot_clean'] = df_plot[label_col].apply(normalize_kalbar_name)
-                 
-                 # Check if 'Pontianak' is in GeoJSON
-                 if 'Pontianak' not in gdf_kalbar['kabkot'].values:
-                     # Create synthetic geometry for Pontianak (approximate circle/buffer)
-                     # Coordinate: (-0.026330, 109.342504)
-                     # 0.05 degrees approx 5km radius
-                     pt = Point(109.342504, -0.026330)
-                     poly = pt.buffer(0.08) 
-                     
-                     # Add to GeoDataFrame
-                     new_row = pd.DataFrame([{'kabkot': 'Pontianak', 'geometry': poly}])
-                     gdf_kalbar = pd.concat([gdf_kalbar, new_row], ignore_index=True)
-                 
-                 # Merge
-                 gdf_merged = gdf_kalbar.merge(df_plot, left_on='kabkot', right_on='kabkot_clean', how='left')
-                 
-                 # Ensure Pontianak is LAST (to be drawn on top)
-                 # Create a sort key: 1 for Pontianak, 0 for others
-                 gdf_merged['sort_order'] = gdf_merged['kabkot'].apply(lambda x: 1 if 'Pontianak' in str(x) else 0)
-                 gdf_merged = gdf_merged.sort_values('sort_order')
-                 
-                 # Fill NaN
-                 gdf_merged['Jumlah Responden'] = gdf_merged['Jumlah Responden'].fillna(0)
-                 
-                 # Calculate Percentage for Labels
-                 # Use total_reference if provided to match table exactly
-                 if total_reference:
-                     total_responden = total_reference
-                 else:
-                     # Fallback to sum of mapped data (risk of mismatch if merge drops rows)
-                     # Or sum of original DF?
-                     # Better to use sum of input DF if columns exist
-                     if 'Jumlah Responden' in df_counts.columns:
-                         total_responden = df_counts['Jumlah Responden'].sum()
-                     else:
-                         total_responden = gdf_merged['Jumlah Responden'].sum()
-                         
-                 if total_responden > 0:
-                     gdf_merged['pct'] = (gdf_merged['Jumlah Responden'] / total_responden) * 100
-                 else:
-                     gdf_merged['pct'] = 0
-                 
-                 # Plot Choropleth
-                 fig, ax = plt.subplots(figsize=(12, 10))
-                 
-             import matplotlib.colors as mcolors
-             
-             # Split Data
-             gdf_pontianak = gdf_merged[gdf_merged['kabkot'] == 'Pontianak']
-             gdf_others = gdf_merged[gdf_merged['kabkot'] != 'Pontianak']
-             
-             # Create Custom Colormap for Others (LightGrey -> DarkBlue)
-             # darkblue ke lightgrey (User request interpreted as range)
-             cmap_custom = mcolors.LinearSegmentedColormap.from_list("grey_blue", ["lightgrey", "darkblue"])
-             
-             # Plot 'Others' first
-             gdf_others.plot(column='Jumlah Responden',
-                             ax=ax,
-                             legend=True,
-                             legend_kwds={'label': "Jumlah Alumni (Non-Pontianak)", 'orientation': "vertical"},
-                             cmap=cmap_custom,
-                             edgecolor='black',
-                             linewidth=0.5,
-                             missing_kwds={'color': 'lightgrey'})
-                             
-             # Plot Pontianak (Red)
-             if not gdf_pontianak.empty:
-                 gdf_pontianak.plot(ax=ax,
-                                    color='red',
-                                    edgecolor='black',
-                                    linewidth=0.5)
-                 # Note: Pontianak won't be in the colorbar, which is fine as it's an outlier
-             
-             # Add Labels (Annotate) - Iterate over full merged DF to label all
-             for idx, row in gdf_merged.iterrows():
-                 # Skip if geometry is missing or empty
-                 if row.geometry is None: continue
-                 
-                 # Get Centroid
-                 centroid = row.geometry.centroid
-                 x, y = centroid.x, centroid.y
-                 
-                 # Get Name (use original kabkot from GeoJSON or cleaned)
-                 name = row.get('kabkot', '')
-                 val_pct = row.get('pct', 0)
-                 
-                 # Format Label: "Name\n(X.X%)"
-                 label = f"{name}\n({val_pct:.1f}%)"
-                 
-                 # Add Text
-                 # Use white halo for readability
-                 ax.annotate(text=label, xy=(x, y), xytext=(0, 0), textcoords="offset points", # Center
-                             ha='center', va='center',
-                             fontsize=8, color='black', weight='bold',
-                             path_effects=[matplotlib.patheffects.withStroke(linewidth=2, foreground="white")])
-
-             ax.set_title("Sebaran Alumni - Kalimantan Barat", fontsize=16)
-             ax.axis('off')
-             
-             plt.tight_layout()
-             plt.savefig(output_path, dpi=150, bbox_inches='tight')
-             plt.close()
-             print(f"Kalbar Choropleth Map saved: {output_path}")
-             return
-                 
-        except Exception as e:
-             print(f"Failed to generate Kalbar Choropleth: {e}")
-             print("Falling back to Bubble map logic (if any)...")
-
-    # 3. Fallback / Generic Bubble Map (if Choropleth failed or another region)
-    
-    # Load Base Map (World or Indonesia Boundary)
-    world = None
-    try:
-        url = "https://raw.githubusercontent.com/datasets/geo-countries/master/data/countries.geojson"
-        world = gpd.read_file(url)
-    except Exception as e:
-         print(f"Could not load remote base map: {e}")
+from data_cache import load_cleaned
+from dataset import Dataset, as_dataset, WORKING_STATUS
+import anomaly
+import console
+from console import print_styled_table
+import formatting
+import geo
+import geo_cube
+import profiling
+import ranking
+import salary
+import schema
+import survival
+from profiling import profiled
 
-    # Prepare Points
-    points = []
-    values = []
-    
-    # Use global INDO_COORDS / KALBAR_COORDS
-    if 'Provinsi' in df_counts.columns:
-        coords_db = INDO_COORDS
-        label_col = 'Provinsi'
-        val_col = 'Jumlah'
-    else:
-        coords_db = KALBAR_COORDS
-        label_col = 'Kota/Kabupaten'
-        val_col = 'Jumlah Responden'
-        
-    for index, row in df_counts.iterrows():
-        name = row.get(label_col)
-        val = row.get(val_col)
-        
-        # Check direct match or partial
-        matched_coords = None
-        if name in coords_db:
-             matched_coords = coords_db[name]
-        else:
-             # Try simple normalization for Kalbar keys
-             # e.g. "Kab. Kubu Raya" -> "Kubu Raya"
-             for k, v in coords_db.items():
-                 if k.lower() in name.lower() or name.lower() in k.lower():
-                     matched_coords = v
-                     break
-        
-        if matched_coords:
-            lat, lon = matched_coords
-            points.append(Point(lon, lat))
-            values.append(val)
-            
-    if not points:
-        print(f"No matching coordinates found for points map ({region_name}).")
-        return
-
-    gdf_points = gpd.GeoDataFrame({'value': values}, geometry=points, crs="EPSG:4326")
-
-    # Plotting
-    fig, ax = plt.subplots(figsize=(12, 8))
-    
-    # Plot Base Map if available
-    if world is not None:
-        # Filter for Indonesia
-        base = pd.DataFrame() # Initialize as empty
-        potential_cols = ['ADMIN', 'name', 'common', 'NAME', 'sovereignt']
-        
-        for col in potential_cols:
-            if col in world.columns:
-                filtered = world[world[col] == 'Indonesia']
-                if not filtered.empty:
-                    base = filtered
-                    break
-        
-        if not base.empty:
-            base.plot(ax=ax, color='#f0f0f0', edgecolor='#888888')
-        else:
-            world.plot(ax=ax, color='#f0f0f0', edgecolor='#888888')
-
-    # Zoom Limits
-    if region_name == 'Kalimantan Barat':
-        ax.set_xlim(108.0, 114.5)
-        ax.set_ylim(-3.5, 2.5)
-        ax.set_title(f"Sebaran Alumni - {region_name}", fontsize=16)
-    else:
-        ax.set_xlim(95, 141)
-        ax.set_ylim(-11, 6)
-        ax.set_title(f"Sebaran Alumni - {region_name}", fontsize=16)
-    
-    # Plot Points (Bubble)
-    # Size based on value
-    min_size = 50
-    max_size = 1000
-    
-    if max(values) == min(values):
-        sizes = [300] * len(values)
-    else:
-        sizes = [(v - min(values)) / (max(values) - min(values)) * (max_size - min_size) + min_size for v in values]
-    
-    # Color based on value (Blue Gradient)
-    gdf_points.plot(ax=ax, 
-                    column='value', # Use column for color mapping
-                    cmap='Blues', 
-                    markersize=sizes, 
-                    alpha=0.7,
-                    edgecolor='k',
-                    linewidth=0.5,
-                    legend=True)
-
-    ax.axis('off')
-    
-    # Save PNG
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
-    print(f"Static Geopandas Map saved: {output_path}")
-
-def map_to_png(m, output_path):
-    """
-    Legacy/Deprecated or wrapper. 
-    If we use this name to maintain compatibility with existing calls,
-    we need to redirect or handle it.
-    But better to call generate_static_map_geopandas explicitly.
-    Emptying this for now to avoid selenium usage.
-    """
-    pass
 
 def sort_crosstab_by_total(df_crosstab):
     """
     Sorts the crosstab DataFrame by the 'Total' column in descending order,
     keeping the 'Total' row (margin) at the bottom.
-    Also adds a 'Persentase' column.
+    Also adds a numeric 'Persentase' column (formatted when rendered).
     """
     if 'Total' not in df_crosstab.columns:
         return df_crosstab
@@ -450,14 +57,13 @@ def sort_crosstab_by_total(df_crosstab):
         
         if grand_total > 0:
             # Calculate percentage
-            pct = (df_final['Total'] / grand_total) * 100
-            # Format
-            df_final['Persentase'] = pct.map('{:.2f}%'.format)
+            df_final['Persentase'] = (df_final['Total'] / grand_total) * 100
         else:
-            df_final['Persentase'] = "0.00%"
+            df_final['Persentase'] = 0.0
             
-    return df_final
+    return formatting.set_formats(df_final, {'Persentase': 'percent'})
 
+@profiled()
 def create_distribution_campus_loc_tahun(df):
     """
     Creates a distribution table of respondents based on Lokasi Kampus (derived from prodi) and Tahun Lulus.
@@ -504,6 +110,7 @@ def create_distribution_campus_loc_tahun(df):
     ct = pd.crosstab(df[temp_loc_col], df[year_col], margins=True, margins_name='Total')
     return sort_crosstab_by_total(ct)
 
+@profiled()
 def create_distribution_jurusan_tahun(df):
     """
     Creates a distribution table of respondents based on Jurusan and Tahun Lulus.
@@ -523,6 +130,7 @@ def create_distribution_jurusan_tahun(df):
     ct = pd.crosstab(df[jurusan_col], df[year_col], margins=True, margins_name='Total')
     return sort_crosstab_by_total(ct)
 
+@profiled()
 def create_distribution_prodi_tahun(df):
     """
     Creates a distribution table of respondents based on Program Studi (prodi) and Tahun Lulus.
@@ -548,6 +156,7 @@ def create_distribution_prodi_tahun(df):
     ct = pd.crosstab(df[prodi_col], df[year_col], margins=True, margins_name='Total')
     return sort_crosstab_by_total(ct)
 
+@profiled()
 def create_distribution_masa_tunggu_status(df):
     """
     Creates a distribution table of Status Pekerjaan vs Kategori Masa Tunggu.
@@ -602,10 +211,14 @@ def create_distribution_masa_tunggu_status(df):
     # Apply sorting by Total desc (Rows) and add Percentage
     return sort_crosstab_by_total(tabel_final)
 
+@profiled()
 def create_distribution_waktu_tunggu_jurusan(df):
     """
     Creates a distribution table for Average Respondents Accepted Working within 6 months.
+    df: DataFrame or dataset.Dataset (shares the employed and duration masks).
     """
+    data = as_dataset(df)
+    df = data.df
     # 1. Preprocessing Data Masa Tunggu
     col_masa_tunggu = 'Dalam berapa bulan Anda mendapatkan pekerjaan? Tulis dengan angka (Contoh: 1, 1Tahun = 12 bulan) rev2'
     
@@ -614,29 +227,28 @@ def create_distribution_waktu_tunggu_jurusan(df):
         print(f"Warning: Column '{col_masa_tunggu}' not found.")
         return pd.DataFrame()
 
-    # 2. Filter: Hanya ambil responden yang mengisi masa tunggu DAN statusnya Bekerja
     col_status = 'Jelaskan status Anda saat ini?'
-    target_status = 'Bekerja (Full time/Part time)'
-    
-    df_filtered = df.dropna(subset=[col_masa_tunggu]).copy()
-    
-    if col_status in df_filtered.columns:
-        df_filtered = df_filtered[df_filtered[col_status] == target_status]
-    else:
+    if col_status not in df.columns:
         print(f"Warning: Column '{col_status}' not found. Cannot filter by status.")
         return pd.DataFrame()
 
-    # Pastikan data numerik
-    df_filtered['Masa_Tunggu_Bulan'] = pd.to_numeric(df_filtered[col_masa_tunggu], errors='coerce')
+    col_group = 'Jurusan'
+    if col_group not in df.columns:
+        return pd.DataFrame()
+
+    # 2. Filter: Hanya ambil responden yang mengisi masa tunggu DAN statusnya Bekerja
+    # (only the two columns used are taken out of the frame)
+    masks = ('employed', 'has_duration')
+    df_filtered = pd.DataFrame({
+        col_group: data.column(col_group, *masks),
+        'Masa_Tunggu_Bulan': pd.to_numeric(data.column(col_masa_tunggu, *masks), errors='coerce'),
+    })
 
     # 3. Logika Perhitungan (< 6 Bulan)
     # Buat kolom helper: 1 jika <= 6 bulan, 0 jika > 6 bulan
-    df_filtered['Is_Less_6_Months'] = df_filtered['Masa_Tunggu_Bulan'].apply(lambda x: 1 if x <= 6 else 0)
+    df_filtered['Is_Less_6_Months'] = (df_filtered['Masa_Tunggu_Bulan'] <= 6).astype(int)
 
     # 4. Membuat Tabel Agregat (Group by Jurusan)
-    col_group = 'Jurusan'
-    if col_group not in df_filtered.columns:
-        return pd.DataFrame()
         
     analisis_masa_tunggu = df_filtered.groupby(col_group).agg(
         Jumlah_Responden=('Masa_Tunggu_Bulan', 'count'),
@@ -647,10 +259,7 @@ def create_distribution_waktu_tunggu_jurusan(df):
     # 5. Menghitung Persentase
     analisis_masa_tunggu['Persentase_Kurang_6_Bulan'] = (
         analisis_masa_tunggu['Jumlah_Kurang_6_Bulan'] / analisis_masa_tunggu['Jumlah_Responden'] * 100
-    ) #.round(2) -> will map later
-
-    # Rounding rata-rata waktu tunggu
-    analisis_masa_tunggu['Rata_rata_Waktu_Tunggu'] = analisis_masa_tunggu['Rata_rata_Waktu_Tunggu'].round(1)
+    )
 
     # Sort before renaming
     analisis_masa_tunggu = analisis_masa_tunggu.sort_values(by='Persentase_Kurang_6_Bulan', ascending=False)
@@ -687,17 +296,19 @@ def create_distribution_waktu_tunggu_jurusan(df):
             (jumlah_kurang_6 / total_responden * 100) if total_responden > 0 else 0
         ],
         'Rata-rata Masa Tunggu (Bulan)': [
-            round(avg_masa_tunggu, 1)
+            avg_masa_tunggu
         ]
     })
     
     final_table = pd.concat([final_table, total_row], ignore_index=True)
     
-    # Format Percentage Column string
-    final_table['Persentase (<= 6 Bulan) (%)'] = final_table['Persentase (<= 6 Bulan) (%)'].apply(lambda x: f"{x:.2f}%")
-    
-    return final_table
+    # Numbers stay numeric; the formats are applied when rendering
+    return formatting.set_formats(final_table, {
+        'Persentase (<= 6 Bulan) (%)': 'percent',
+        'Rata-rata Masa Tunggu (Bulan)': 'number1',
+    })
 
+@profiled()
 def create_serapan_jurusan(df):
     """
     Creates a crosstab of Jurusan vs Status Pekerjaan.
@@ -718,6 +329,7 @@ def create_serapan_jurusan(df):
     # This matches the user's general preference for sorting
     return sort_crosstab_by_total(tabel_jurusan)
 
+@profiled()
 def create_serapan_prodi_per_jurusan(df):
     """
     Creates a dictionary of tables, one per Jurusan.
@@ -810,10 +422,9 @@ def create_serapan_prodi_per_jurusan(df):
             
             # Percentage based on Jurusan Total
             if jurusan_grand_total > 0:
-                pct = (row_data['Total'] / jurusan_grand_total) * 100
-                row_dict['Persentase'] = f"{pct:.2f}%"
+                row_dict['Persentase'] = (row_data['Total'] / jurusan_grand_total) * 100
             else:
-                row_dict['Persentase'] = "0.00%"
+                row_dict['Persentase'] = 0.0
                 
             final_rows.append(row_dict)
             
@@ -824,7 +435,7 @@ def create_serapan_prodi_per_jurusan(df):
             total_dict[col] = val
         
         # Percentage for Total Row is 100%
-        total_dict['Persentase'] = "100.00%"
+        total_dict['Persentase'] = 100.0
         
         final_rows.append(total_dict)
         
@@ -834,186 +445,86 @@ def create_serapan_prodi_per_jurusan(df):
         final_cols_order = ['Program Studi'] + columns + ['Persentase']
         df_jurusan = df_jurusan[final_cols_order]
         
-        results[jurusan] = df_jurusan
+        results[jurusan] = formatting.set_formats(df_jurusan, {'Persentase': 'percent'})
         
     return results
 
-# Database Koordinat removed from here
-
-
-def create_distribution_provinsi(df):
+@profiled()
+def create_distribution_provinsi(df, filters=None, cube=None):
     """
-    Creates a distribution table of working respondents by Province.
+    Creates a distribution table of respondents by Province, working
+    respondents unless filters ({schema ID: [values]}, see
+    geo_cube.parse_filters) name a status.
+    df: DataFrame or dataset.Dataset; cube: geo_cube.build_geo_cube()
+    result to reuse instead of grouping df.
     """
-    col_status = 'Jelaskan status Anda saat ini?'
-    col_prov = 'Provinsi rev'
-    
-    if col_prov not in df.columns:
-        if 'Provinsi' in df.columns:
-            col_prov = 'Provinsi'
-        else:
-             return pd.DataFrame()
-             
-    # Filter Responden yang Bekerja/Wiraswasta
-    working_status = ['Bekerja (Full time/Part time)', 'Wiraswasta']
-    
-    # Check if status column exists
-    if col_status in df.columns:
-        df_working = df[df[col_status].isin(working_status)].copy()
-    else:
-        df_working = df.copy() # Fallback if status not found? Or return empty
-    
-    if df_working.empty:
+    if cube is None:
+        cube = geo_cube.build_geo_cube(as_dataset(df).df)
+    counts = geo_cube.region_counts(cube, 'provinsi', {**geo_cube.DEFAULT_FILTERS, **(filters or {})})
+
+    if counts.empty:
         return pd.DataFrame()
         
     # Hitung Jumlah per Provinsi
-    prov_counts = df_working[col_prov].value_counts().reset_index()
+    prov_counts = counts.reset_index()
     prov_counts.columns = ['Provinsi', 'Jumlah']
     
-    # Add coordinates for reference if needed, but for table display, just simple is fine
-    # Maybe add Percentage?
     total = prov_counts['Jumlah'].sum()
     if total > 0:
-        prov_counts['Persentase'] = (prov_counts['Jumlah'] / total * 100).map('{:.2f}%'.format)
+        prov_counts['Persentase'] = prov_counts['Jumlah'] / total * 100
         
     # Add Total Row
-    total_row = pd.DataFrame({'Provinsi': ['TOTAL'], 'Jumlah': [total], 'Persentase': ['100.00%']})
+    total_row = pd.DataFrame({'Provinsi': ['TOTAL'], 'Jumlah': [total], 'Persentase': [100.0]})
     prov_counts = pd.concat([prov_counts, total_row], ignore_index=True)
     
-    return prov_counts
+    return formatting.set_formats(prov_counts, {'Persentase': 'percent'})
 
 
-def get_density_color(count, min_val, max_val):
-    """
-    Returns a blue gradient hex color based on the count.
-    Light Blue -> Dark Blue
-    """
-    # Normalize count between 0 and 1
-    if max_val == min_val:
-        norm = 1.0
-    else:
-        norm = (count - min_val) / (max_val - min_val)
-    
-    # Simple Bucket approach for clearer distinction or Matplotlib colormap?
-    # User asked for "darkblue" for max.
-    # Let's use matplotlib colors if imported, or custom hex interpolation.
-    import matplotlib.colors as mcolors
-    
-    # Create colormap from LightBlue to DarkBlue
-    cmap = mcolors.LinearSegmentedColormap.from_list("blue_density", ["#87CEEB", "#00008B"])
-    
-    # Get hex code
-    hex_color = mcolors.to_hex(cmap(norm))
-    return hex_color
+def _static_map_path(output_file):
+    """PNG next to the report images for a map HTML in reports/."""
+    return output_file.replace('reports', 'assets/gambar').replace('.html', '.png')
+
 
+@profiled()
 def generate_alumni_map(prov_counts_df, output_file):
     """
-    Generates a Folium map based on province counts.
+    Generates the province map (Folium HTML and PNG) from the province table.
     """
-    if folium is None:
-        print("Folium not installed, skipping map generation.")
-        return
-
     # Filter out Total row for mapping
-    df_map = prov_counts_df[prov_counts_df['Provinsi'] != 'TOTAL'].copy()
-    
-    # Calculate Min/Max for Color Scaling
-    max_count = df_map['Jumlah'].max()
-    min_count = df_map['Jumlah'].min()
-    
-    # 5. Membuat Peta Dasar (Fokus di Indonesia)
-    m = folium.Map(location=[-2.5, 118], zoom_start=5, tiles='CartoDB positron')
-
-    # 6. Menambahkan Marker ke Peta
-    for index, row in df_map.iterrows():
-        prov_name = row['Provinsi']
-        count = row['Jumlah']
-        
-        # Cek apakah provinsi ada di database koordinat
-        if prov_name in INDO_COORDS:
-            lat, lon = INDO_COORDS[prov_name]
-            
-            # Menentukan ukuran lingkaran berdasarkan jumlah alumni
-            # Radius dasar 5, ditambah faktor skala
-            radius = 5 + (count / 5) 
-            
-            # Get Color based on density
-            color = get_density_color(count, min_count, max_count)
-
-            folium.CircleMarker(
-                location=[lat, lon],
-                radius=radius,
-                popup=f"<b>{prov_name}</b><br>Jumlah Alumni: {count}",
-                color=color,
-                fill=True,
-                fill_color=color,
-                fill_opacity=0.7
-            ).add_to(m)
-            
-            # Opsional: Tambahkan Label Angka Permanen untuk provinsi padat
-            if count > 10: 
-                folium.Marker(
-                    location=[lat, lon],
-                    icon=folium.DivIcon(html=f"""<div style="font-family: courier new; color: black; font-weight: bold">{count}</div>""")
-                ).add_to(m)
-                
-    m.save(output_file)
-    print(f"Map generated: {output_file}")
-    
-    # Save as PNG using Geopandas
-    try:
-        png_output = output_file.replace('reports', 'assets/gambar').replace('.html', '.png')
-        if gpd:
-             generate_static_map_geopandas(df_map, png_output, region_name='Indonesia')
-    except Exception as e:
-        print(f"Error saving PNG map: {e}")
+    df_map = prov_counts_df[prov_counts_df['Provinsi'] != 'TOTAL']
+    counts = df_map.set_index('Provinsi')['Jumlah']
+    geo.render_map(counts, 'provinsi', output_file, _static_map_path(output_file))
 
 
-def create_distribution_kabkota_kalbar(df):
+@profiled()
+def create_distribution_kabkota_kalbar(df, filters=None, cube=None):
     """
-    Creates a distribution table for Kota/Kabupaten in Kalimantan Barat.
+    Creates a distribution table for Kota/Kabupaten in Kalimantan Barat,
+    working respondents unless filters name a status (see
+    create_distribution_provinsi).
     """
-    col_prov = 'Provinsi rev'
-    col_city = 'Kota/Kabupate rev'
-    
-    if col_prov not in df.columns or col_city not in df.columns:
+    if cube is None:
+        cube = geo_cube.build_geo_cube(as_dataset(df).df)
+    if 'provinsi' not in cube.columns:
         return pd.DataFrame()
-        
-    # Filter for Kalimantan Barat
-    # The user implied "Sebaran khusus", usually implies "Working" respondents too if consistent with others?
-    # The example total 504 matches the user's request. 
-    # Let's filter by working first to check if it matches 504.
-    # Actually, previous table "Table 8" total was 556 working respondents. 
-    # If Kalbar is 504, then likely it is filtered by working.
-    
-    col_status = 'Jelaskan status Anda saat ini?'
-    working_status = ['Bekerja (Full time/Part time)', 'Wiraswasta']
-    
-    df_filtered = df.copy()
-    
+
     # User Request: "seharusnya sebaran ini adalah yang sudah bekerja saja"
-    # Ensure strict filtering
-    if col_status in df.columns:
-        df_filtered = df_filtered[df_filtered[col_status].isin(working_status)]
-    else:
-        # If status column missing, return empty or warn? For now assume it exists
-        pass
-        
-    df_kalbar = df_filtered[df_filtered[col_prov] == 'Kalimantan Barat'].copy()
+    filters = {**geo_cube.DEFAULT_FILTERS, **(filters or {}), 'provinsi': [geo_cube.KALBAR]}
+    counts = geo_cube.region_counts(cube, 'kabkota', filters)
     
-    if df_kalbar.empty:
+    if counts.empty:
         return pd.DataFrame()
 
     # Count by City
-    city_counts = df_kalbar[col_city].value_counts().reset_index()
+    city_counts = counts.reset_index()
     city_counts.columns = ['Kota/Kabupaten', 'Jumlah Responden']
     
     # Calculate Percentage
     total = city_counts['Jumlah Responden'].sum()
     if total > 0:
-        city_counts['Persentase (%)'] = (city_counts['Jumlah Responden'] / total * 100).map('{:.2f}%'.format)
+        city_counts['Persentase (%)'] = city_counts['Jumlah Responden'] / total * 100
     else:
-        city_counts['Persentase (%)'] = '0.00%'
+        city_counts['Persentase (%)'] = 0.0
 
     # Sort Descending (already done by value_counts, but good to ensure)
     city_counts = city_counts.sort_values(by='Jumlah Responden', ascending=False)
@@ -1022,29 +533,26 @@ def create_distribution_kabkota_kalbar(df):
     total_row = pd.DataFrame({
         'Kota/Kabupaten': ['Total Kalbar'], 
         'Jumlah Responden': [total], 
-        'Persentase (%)': ['100.00%']
+        'Persentase (%)': [100.0]
     })
     
     final_table = pd.concat([city_counts, total_row], ignore_index=True)
     
-    return final_table
+    return formatting.set_formats(final_table, {'Persentase (%)': 'percent'})
 
+@profiled()
 def create_salary_distribution(df):
     """
     Creates a distribution table for Salary/Income of working respondents.
+    df: DataFrame or dataset.Dataset (shares the working mask).
     """
+    data = as_dataset(df)
     col_salary = 'Berapa rata-rata pendapatan Anda per bulan?'
-    col_status = 'Jelaskan status Anda saat ini?'
-    working_status = ['Bekerja (Full time/Part time)', 'Wiraswasta']
     
-    if col_salary not in df.columns:
+    if col_salary not in data.df.columns:
         return pd.DataFrame()
         
-    df_filtered = df.copy()
-    if col_status in df.columns:
-        df_filtered = df_filtered[df_filtered[col_status].isin(working_status)]
-        
-    salary_counts = df_filtered[col_salary].value_counts().reset_index()
+    salary_counts = data.column(col_salary, 'working').value_counts().reset_index()
     salary_counts.columns = ['Rata-rata Pendapatan', 'Jumlah Responden']
     
     # Custom sort order for salary categories
@@ -1066,272 +574,75 @@ def create_salary_distribution(df):
     # Calculate Percentage
     total = salary_counts['Jumlah Responden'].sum()
     if total > 0:
-        salary_counts['Persentase (%)'] = (salary_counts['Jumlah Responden'] / total * 100).map('{:.2f}%'.format)
+        salary_counts['Persentase (%)'] = salary_counts['Jumlah Responden'] / total * 100
     else:
-        salary_counts['Persentase (%)'] = '0.00%'
+        salary_counts['Persentase (%)'] = 0.0
         
     # Add Total Row
     total_row = pd.DataFrame({
         'Rata-rata Pendapatan': ['Total'], 
         'Jumlah Responden': [total], 
-        'Persentase (%)': ['100.00%']
+        'Persentase (%)': [100.0]
     })
     
     final_table = pd.concat([salary_counts, total_row], ignore_index=True)
     
-    return final_table
+    return formatting.set_formats(final_table, {'Persentase (%)': 'percent'})
 
+@profiled()
 def create_salary_by_jurusan(df):
     """
-    Calculates the Average salary per Jurusan using custom range conversions.
+    Salary per Jurusan from the interval-aware salary engine: mean of band
+    midpoints plus interpolated quartiles, ranked by the mean. The amounts
+    stay in Rupiah (shown as Rp x juta when rendered).
     """
-    col_salary = 'Berapa rata-rata pendapatan Anda per bulan?'
-    col_jurusan = 'Jurusan'
-    col_status = 'Jelaskan status Anda saat ini?'
-    working_status = ['Bekerja (Full time/Part time)', 'Wiraswasta']
-    
-    if col_salary not in df.columns or col_jurusan not in df.columns:
-        return pd.DataFrame()
-        
-    df_filtered = df.copy()
-    if col_status in df.columns:
-        df_filtered = df_filtered[df_filtered[col_status].isin(working_status)]
-    
-    # Drop rows where salary is missing
-    df_filtered = df_filtered.dropna(subset=[col_salary])
-    
-    if df_filtered.empty:
+    data = as_dataset(df)
+    df_summary = salary.salary_summary(data.df, 'jurusan', total=False, mask=data.mask('working'))
+    if df_summary.empty or df_summary['Responden'].sum() == 0:
         return pd.DataFrame()
+    df_summary = df_summary[df_summary['Responden'] > 0].sort_values('Rata-rata', ascending=False)
+
+    salary_by_jurusan = df_summary.rename_axis('Jurusan').reset_index()
+    salary_by_jurusan = salary_by_jurusan.rename(columns={'Rata-rata': 'Rata-rata Gaji (Estimasi)'})
+    share_cols = [c for c in salary_by_jurusan.columns if c.endswith('(%)')]
+    return formatting.set_formats(salary_by_jurusan, {
+        **dict.fromkeys(['Rata-rata Gaji (Estimasi)', 'Q1', 'Median', 'Q3'], 'rupiah'),
+        **dict.fromkeys(share_cols, 'number1'),
+    })
 
-    # User Defined Mappings for Mean Calculation
-    salary_map = {
-        '< Rp. 1.000.000': 1000000,
-        'Rp. 1.000.001 - Rp. 2.000.000': 1500000,
-        'Rp. 2.000.001 - Rp. 3.000.000': 2500000,
-        'Rp. 3.000.001 - Rp. 4.000.000': 3500000,
-        'Rp. 4.000.001 - Rp. 5.000.000': 4500000,
-        'Rp. 5.000.001 - Rp. 6.000.000': 5500000,
-        'Rp. 6.000.001 - Rp. 7.000.000': 6500000,
-        'Rp. 7.000.001 - Rp. 8.000.000': 7500000,
-        '> Rp. 8.000.001': 8000000
-    }
-
-    # Map categories to numeric
-    df_filtered['salary_num'] = df_filtered[col_salary].map(salary_map)
-    
-    # Calculate Mean per Jurusan
-    salary_by_jurusan = df_filtered.groupby(col_jurusan)['salary_num'].mean().reset_index()
-    salary_by_jurusan.columns = ['Jurusan', 'Rata-rata Gaji (Estimasi)']
-    
-    # Sort by numeric mean descending
-    salary_by_jurusan = salary_by_jurusan.sort_values(by='Rata-rata Gaji (Estimasi)', ascending=False)
-    
-    # Store numeric version for chart
-    df_chart = salary_by_jurusan.copy()
-    df_chart = df_chart.rename(columns={'Rata-rata Gaji (Estimasi)': 'Total'})
-    
-    # Format for display table: Compact format (e.g., Rp3.8 juta)
-    salary_by_jurusan['Rata-rata Gaji (Estimasi)'] = salary_by_jurusan['Rata-rata Gaji (Estimasi)'].apply(
-        lambda x: f"Rp{x/1000000:.1f} juta"
-    )
-    
-    return salary_by_jurusan, df_chart
-
-def create_jurusan_ranking():
+@profiled()
+def create_jurusan_ranking(df, by='jurusan', weights=None):
     """
-    Creates a dataframe for Jurusan Ranking based on provided qualitative/quantitative analysis.
+    Creates the Jurusan (or prodi) ranking from the outcome metrics of the
+    data: composite score, stars and a generated predikat per group.
     """
-    data = [
-        {
-            "Peringkat": 1,
-            "Jurusan": "Teknik Arsitektur",
-            "Skor Kekuatan": "⭐⭐⭐⭐",
-            "Predikat & Analisis": """<b>"The High Quality Performer"</b><br>Meskipun jumlah respondennya paling sedikit (52), namun jurusan ini JUARA 1 di dua kategori sekaligus: Kecepatan Serapan (77,5%) dan Gaji Tertinggi (Rp 3,8 Juta). Kualitas lulusannya sangat premium di mata pasar."""
-        },
-        {
-            "Peringkat": 2,
-            "Jurusan": "Akuntansi",
-            "Skor Kekuatan": "⭐⭐⭐⭐",
-            "Predikat & Analisis": """<b>"The Major Contributor"</b><br>Naik signifikan ke peringkat 2 berkat Volume Responden Tertinggi (226 orang) yang mendominasi 30% data survei. Selain itu, kecepatan serapannya sangat baik (Juara 2). Nilai minus hanya pada gaji awal yang masih entry level."""
-        },
-        {
-            "Peringkat": 3,
-            "Jurusan": "Teknik Sipil & Perencanaan",
-            "Skor Kekuatan": "⭐⭐⭐",
-            "Predikat & Analisis": """<b>"The Fastest Hired"</b><br>Unggul mutlak di Masa Tunggu Tercepat (3,4 bulan). Sangat efisien dalam mengantarkan lulusan ke dunia kerja, meskipun volume responden dan gaji berada di level menengah."""
-        },
-        {
-            "Peringkat": 4,
-            "Jurusan": "Teknik Mesin",
-            "Skor Kekuatan": "⭐⭐⭐",
-            "Predikat & Analisis": """<b>"The High Valued Entrepreneur"</b><br>Unggul di Gaji Tertinggi (Rp 3,8 Juta) dan jumlah responden yang besar (110 orang). Peringkatnya tertahan karena masa tunggu rata-rata yang cukup lama (6,4 bulan), namun ini terkompensasi oleh tingginya angka wirausaha."""
-        },
-        {
-            "Peringkat": 5,
-            "Jurusan": "Ilmu Kelautan & Perikanan",
-            "Skor Kekuatan": "⭐⭐",
-            "Predikat & Analisis": """<b>"The Balanced Niche"</b><br>Memiliki performa yang seimbang di semua lini. Tidak terlalu menonjol di satu sisi, tapi cukup stabil dalam serapan (71,8%) dan masa tunggu (5,2 bulan)."""
-        },
-        {
-            "Peringkat": 6,
-            "Jurusan": "Teknik Elektro",
-            "Skor Kekuatan": "⭐⭐",
-            "Predikat & Analisis": """<b>"The Steady Player"</b><br>Konsisten di papan tengah. Memiliki gaji yang cukup baik (Rp 3,5 Juta) di atas rata-rata institusi, namun butuh peningkatan dalam kecepatan serapan (67,5%)."""
-        },
-        {
-            "Peringkat": 7,
-            "Jurusan": "Administrasi Bisnis",
-            "Skor Kekuatan": "⭐⭐",
-            "Predikat & Analisis": """<b>"The Salary Surprise"</b><br>Meskipun secara ranking umum ada di bawah, jurusan ini punya keunggulan Gaji Tinggi (Rp 3,7 Juta - Peringkat 3). Tantangannya ada pada masa tunggu yang paling lama (6,4 bulan) dan volume responden yang moderat."""
-        },
-        {
-            "Peringkat": 8,
-            "Jurusan": "Teknologi Pertanian",
-            "Skor Kekuatan": "⭐",
-            "Predikat & Analisis": """<b>"The Job Creator"</b><br>Secara statistik "pekerja", jurusan ini ada di bawah (gaji & kecepatan rendah). NAMUN, perlu dicatat: Jurusan ini adalah Raja Wirausaha (21 orang). Indikator ranking ini bias ke "karyawan", sehingga potensi wirausaha Pertanian tidak terpotret penuh di sini."""
-        }
-    ]
-    
-    df = pd.DataFrame(data)
-    return df
+    df_rank = ranking.rank_groups(df, by, weights)
+    if df_rank.empty:
+        return df_rank
+
+    # Display order: rank and narrative first, then the metrics behind them
+    label = schema.label(by)
+    front = ['Peringkat', label] + (['Jurusan'] if by == 'prodi' else []) + ['Skor Kekuatan', 'Predikat & Analisis']
+    df_rank = df_rank[front + [c for c in df_rank.columns if c not in front]]
+    rates = [spec[0] for m, spec in ranking.METRICS.items() if m not in ('gaji', 'volume')]
+    return formatting.set_formats(df_rank, {
+        **dict.fromkeys(['Skor'] + rates, 'number1'),
+        ranking.METRICS['gaji'][0]: 'rupiah',
+    })
 
 
+@profiled()
 def generate_kalbar_map(city_counts_df, output_file):
     """
-    Generates a Folium map for West Kalimantan (Kalbar) distribution.
-    Uses 'CartoDB positron' tiles to match the theme.
+    Generates the Kalimantan Barat map (Folium HTML and PNG) from the
+    Kota/Kabupaten table; percentages use the table's Total Kalbar row.
     """
-    if folium is None:
-        print("Folium not installed, skipping Kalbar map generation.")
-        return
-
-    # Filter out Total row
-    df_map = city_counts_df[city_counts_df['Kota/Kabupaten'] != 'Total Kalbar'].copy()
-    
-    # Calculate Min/Max for Color Scaling
-    max_count = df_map['Jumlah Responden'].max()
-    min_count = df_map['Jumlah Responden'].min()
+    is_total = city_counts_df['Kota/Kabupaten'] == 'Total Kalbar'
+    counts = city_counts_df[~is_total].set_index('Kota/Kabupaten')['Jumlah Responden']
+    total = city_counts_df.loc[is_total, 'Jumlah Responden'].sum() or None
+    geo.render_map(counts, 'kabkota', output_file, _static_map_path(output_file), total=total)
 
-    # Center map on West Kalimantan (approx)
-    m = folium.Map(location=[0.0, 111.0], zoom_start=7, tiles='CartoDB positron')
 
-    for index, row in df_map.iterrows():
-        city_name = row['Kota/Kabupaten']
-        count = row['Jumlah Responden']
-        
-        if city_name in KALBAR_COORDS:
-            lat, lon = KALBAR_COORDS[city_name]
-            
-            # Radius calculation
-            radius = 5 + (count / 3) # Slightly larger scale for cities
-            
-            # Get Color based on density
-            color = get_density_color(count, min_count, max_count)
-
-            folium.CircleMarker(
-                location=[lat, lon],
-                radius=radius,
-                popup=f"<b>{city_name}</b><br>Jumlah Alumni: {count}",
-                color=color,
-                fill=True,
-                fill_color=color,
-                fill_opacity=0.8
-            ).add_to(m)
-            
-            # Label
-            if count > 5:
-                folium.Marker(
-                    location=[lat, lon],
-                    icon=folium.DivIcon(html=f"""<div style="font-family: courier new; color: black; font-weight: bold; font-size: 10pt">{count}</div>""")
-                ).add_to(m)
-                
-    m.save(output_file)
-    print(f"Kalbar Map generated: {output_file}")
-
-    # Save as PNG using Geopandas
-    try:
-        png_output = output_file.replace('reports', 'assets/gambar').replace('.html', '.png')
-        if gpd:
-             # Extract total from original df (before filtering out Total row) or recalculate
-             # city_counts_df has 'Total Kalbar' row
-             total_row = city_counts_df[city_counts_df['Kota/Kabupaten'] == 'Total Kalbar']
-             total_val = None
-             if not total_row.empty:
-                 total_val = total_row['Jumlah Responden'].values[0]
-                 
-             generate_static_map_geopandas(df_map, png_output, region_name='Kalimantan Barat', total_reference=total_val)
-    except Exception as e:
-        print(f"Error saving Kalbar PNG map: {e}")
-
-
-def print_styled_table(df, title=None):
-    """
-    Prints a pandas DataFrame in a styled format.
-    Uses 'tabulate' if available, otherwise falls back to a custom ASCII implementation.
-    """
-    if title:
-        print(f"\n[{title}]")
-
-    try:
-        from tabulate import tabulate
-        # 'psql' format looks like MySQL/PostgreSQL output, very readable
-        try:
-            print(tabulate(df, headers='keys', tablefmt='psql', showindex=True))
-        except UnicodeEncodeError:
-            # Fallback: Robustly strip ALL non-ascii chars for console print
-            print("(Console output contains special characters, stripping for display...)")
-            df_safe = df.copy()
-            for col in df_safe.columns:
-                 # Force string, encode to ascii with replace, decode back to string
-                 df_safe[col] = df_safe[col].apply(lambda x: str(x).encode('ascii', 'ignore').decode('ascii'))
-            print(tabulate(df_safe, headers='keys', tablefmt='psql', showindex=True))
-    except ImportError:
-        # Fallback implementation if tabulate is not installed
-        # Calculate column widths
-        # Reset index to include the index in the table columns for printing
-        df_print = df.reset_index()
-        
-        # Convert all data to string
-        df_print = df_print.astype(str)
-        
-        columns = [str(c) for c in df_print.columns.tolist()]
-        data = df_print.values.tolist()
-        
-        # Calculate max width for each column
-        col_widths = []
-        for i, col in enumerate(columns):
-            max_len = len(col)
-
-            for row in data:
-                if len(row[i]) > max_len:
-                    max_len = len(row[i])
-            col_widths.append(max_len + 2) # +2 for padding
-            
-        # Function to create a separator line
-        def create_separator(chars="-", junction="+"):
-            line = junction
-            for w in col_widths:
-                line += chars * w + junction
-            return line
-            
-        # Print the table
-        border = create_separator("-", "+")
-        header_row = "|"
-        for i, col in enumerate(columns):
-             header_row += f" {col:<{col_widths[i]-1}}|"
-             
-        print(border)
-        print(header_row)
-        print(border)
-        
-        for row in data:
-            row_str = "|"
-            for i, val in enumerate(row):
-                row_str += f" {val:<{col_widths[i]-1}}|"
-            print(row_str)
-            
-        print(border)
-        print("(Note: Install 'tabulate' for even prettier tables: pip install tabulate)")
 
 import matplotlib.pyplot as plt
 import io
@@ -1339,6 +650,7 @@ import base64
 import numpy as np
 import matplotlib.colors as mcolors
 
+@profiled()
 def get_horizontal_bar_chart_base64(df, title):
     """
     Generates a horizontal bar chart from the dataframe and returns it as a base64 string.
@@ -1410,6 +722,174 @@ def get_horizontal_bar_chart_base64(df, title):
     image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
     return image_base64
 
+# Job-search funnel: each respondent is encoded with the last stage reached
+FUNNEL_STAGES = ['Melamar', 'Direspon', 'Wawancara', 'Bekerja setelah wawancara']
+FUNNEL_KEYS = ['jurusan', 'prodi', 'tahun_lulus']
+
+
+def encode_funnel_stage(df):
+    """
+    Ordinal funnel stage per respondent (0 = no application, 1 = applied,
+    2 = got a response, 3 = interviewed, 4 = working after an interview).
+    Counts are clipped so that responses <= applications <= ... hold.
+    Returns (stage codes, clipped counts DataFrame).
+    """
+    counts = pd.DataFrame({
+        k: pd.to_numeric(df[schema.find_column(df, k)], errors='coerce').fillna(0).clip(lower=0).to_numpy()
+        for k in ('jml_lamaran', 'jml_respon', 'jml_wawancara')
+    }, index=df.index)
+    counts['jml_respon'] = np.minimum(counts['jml_respon'], counts['jml_lamaran'])
+    counts['jml_wawancara'] = np.minimum(counts['jml_wawancara'], counts['jml_respon'])
+    working = df[schema.find_column(df, 'status')].isin(WORKING_STATUS).to_numpy()
+
+    # Each step only counts when the previous one was reached
+    stage = (counts['jml_lamaran'].to_numpy() > 0).astype(np.int8)
+    stage += (stage == 1) & (counts['jml_respon'].to_numpy() > 0)
+    stage += (stage == 2) & (counts['jml_wawancara'].to_numpy() > 0)
+    stage += (stage == 3) & working
+    return stage, counts
+
+
+def build_funnel_cube(df, keys=FUNNEL_KEYS):
+    """
+    Funnel statistics at the finest grain (keys are schema IDs) in a single
+    groupby-sum: respondents reaching each stage, all working respondents
+    (by status, interview or not), application volumes and the masa tunggu
+    sum/count of the rows the waktu tunggu table uses. Coarser levels are
+    plain sums of this cube.
+    """
+    data = as_dataset(df)
+    df = data.df
+    cols = [schema.find_column(df, k) for k in ('jml_lamaran', 'jml_respon', 'jml_wawancara', 'status')]
+    columns = {k: schema.find_column(df, k) for k in keys}
+    if any(c is None for c in cols) or any(c is None for c in columns.values()):
+        return pd.DataFrame()
+
+    stage, counts = encode_funnel_stage(df)
+    stats = {'Responden': np.ones(len(df), dtype=np.int64)}
+    for k, name in enumerate(FUNNEL_STAGES, 1):
+        stats[name] = (stage >= k).astype(np.int64)
+    stats['Bekerja'] = data.mask('working').astype(np.int64)
+    stats.update({'Lamaran': counts['jml_lamaran'], 'Respon': counts['jml_respon'],
+                  'Undangan Wawancara': counts['jml_wawancara']})
+    masa_tunggu = pd.to_numeric(df[schema.find_column(df, 'masa_tunggu')], errors='coerce')
+    waited = data.mask('employed', 'has_duration')
+    stats['mt_sum'] = np.where(waited, masa_tunggu.fillna(0).to_numpy(), 0.0)
+    stats['mt_n'] = waited.astype(np.int64)
+
+    df_stats = pd.DataFrame(stats, index=df.index)
+    return df_stats.groupby([df[columns[k]].rename(k) for k in keys], dropna=False).sum().reset_index()
+
+
+def _funnel_ratios(df_sum):
+    df_out = df_sum[['Responden'] + FUNNEL_STAGES].astype(int)
+    pct = lambda a, b: (a / b.where(b > 0) * 100).round(1)
+    previous = 'Responden'
+    for name in FUNNEL_STAGES:
+        df_out[f'{name} (%)'] = pct(df_sum[name], df_sum[previous])
+        previous = name
+    df_out['Bekerja'] = df_sum['Bekerja'].astype(int)
+    df_out['Bekerja (%)'] = pct(df_sum['Bekerja'], df_sum['Responden'])
+    df_out['Respon per Lamaran (%)'] = pct(df_sum['Respon'], df_sum['Lamaran'])
+    df_out['Wawancara per Respon (%)'] = pct(df_sum['Undangan Wawancara'], df_sum['Respon'])
+    df_out['Rata-rata Masa Tunggu (Bulan)'] = (df_sum['mt_sum'] / df_sum['mt_n'].where(df_sum['mt_n'] > 0)).round(1)
+    return df_out
+
+
+@profiled()
+def create_job_search_funnel(df, by='jurusan', cube=None):
+    """
+    Funnel table (applications -> responses -> interviews -> employed) per
+    group with the conversion of each stage from the previous one (%), the
+    volume ratios and the mean masa tunggu of employed respondents. by: schema
+    ID out of FUNNEL_KEYS (or a list of them). A 'Total' row is appended.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    if cube is None:
+        cube = build_funnel_cube(df)
+    if cube.empty:
+        return pd.DataFrame()
+
+    stat_cols = [c for c in cube.columns if c not in FUNNEL_KEYS]
+    df_groups = cube.groupby(by)[stat_cols].sum()
+    total_key = 'Total' if len(by) == 1 else ('Total',) + ('',) * (len(by) - 1)
+    df_total = pd.DataFrame([df_groups.sum()], index=pd.Index([total_key], tupleize_cols=len(by) > 1))
+    df_groups = pd.concat([df_groups, df_total])
+    df_funnel = _funnel_ratios(df_groups)
+    df_funnel.index.names = [schema.label(k) for k in by]
+    return df_funnel
+
+
+@profiled()
+def get_funnel_chart_base64(df_funnel, title):
+    """Funnel chart of the 'Total' row: centred bars per stage with the step conversion."""
+    row = df_funnel.iloc[-1]
+    labels = ['Responden'] + FUNNEL_STAGES
+    values = [int(row[label]) for label in labels]
+    conversions = [None] + [row[f'{name} (%)'] for name in FUNNEL_STAGES]
+
+    cmap = mcolors.LinearSegmentedColormap.from_list("my_gradient", ["#A9A9A9", "#00008B"])
+    colors = [cmap(1 - i / max(len(labels) - 1, 1)) for i in range(len(labels))]
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    widest = max(values) or 1
+    y = np.arange(len(labels))[::-1]
+    ax.barh(y, values, left=[(widest - v) / 2 for v in values], color=colors, edgecolor='none', height=0.7)
+    for yi, label, v, conv in zip(y, labels, values, conversions):
+        text = f"{label}: {v}" + (f"  ({conv:.1f}%)" if conv is not None and pd.notna(conv) else "")
+        ax.text(widest / 2, yi, text, ha='center', va='center', fontsize=10, fontweight='bold',
+                color='white' if v > widest * 0.35 else '#333')
+
+    ax.set_title(f"Grafik: {title}", fontsize=14, fontweight='bold', pad=20, color='#2c3e50')
+    ax.set_xlim(0, widest)
+    ax.axis('off')
+    plt.tight_layout()
+
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format='png', bbox_inches='tight', dpi=300)
+    plt.close(fig)
+    buffer.seek(0)
+    return base64.b64encode(buffer.read()).decode('utf-8')
+
+@profiled()
+def create_masa_tunggu_survival(df, by='jurusan'):
+    """
+    Kaplan-Meier masa tunggu per group: job seekers count as censored at
+    their time since graduation instead of being dropped.
+    """
+    return survival.survival_table(df, by)
+
+
+@profiled()
+def get_survival_chart_base64(curves, title):
+    """Step chart of the survival curves {group: DataFrame(Bulan, Survival)}."""
+    cmap = mcolors.LinearSegmentedColormap.from_list("my_gradient", ["#A9A9A9", "#00008B"])
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for i, (group, curve) in enumerate(curves.items()):
+        # S(t) starts at 1 before the first observed time
+        x = np.concatenate([[0], curve['Bulan'].to_numpy()])
+        y = np.concatenate([[1], curve['Survival'].to_numpy()]) * 100
+        ax.step(x, y, where='post', label=group, linewidth=1.8,
+                color=cmap(i / max(len(curves) - 1, 1)))
+
+    ax.axhline(50, color='#999', linestyle='--', linewidth=1)
+    ax.set_title(f"Grafik: {title}", fontsize=14, fontweight='bold', pad=20, color='#2c3e50')
+    ax.set_xlabel('Bulan setelah lulus')
+    ax.set_ylabel('Masih mencari kerja (%)')
+    ax.set_ylim(0, 102)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.legend(fontsize=8, frameon=False, loc='upper right')
+    plt.tight_layout()
+
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format='png', bbox_inches='tight', dpi=300)
+    plt.close(fig)
+    buffer.seek(0)
+    return base64.b64encode(buffer.read()).decode('utf-8')
+
+
+@profiled()
 def generate_html_report(data_dict, output_file='report_tables.html'):
     """
     Generates a beautiful HTML report from a dictionary.
@@ -1600,10 +1080,11 @@ def generate_html_report(data_dict, output_file='report_tables.html'):
         html_content += '</div>'
         
         # reset_index to ensure the index part (like Lokasi Kampus) is a proper column
+        df_to_html = formatting.formatted(df)
         if df.index.name:
-             df_to_html = df.reset_index()
+             df_to_html = df_to_html.reset_index()
         else:
-             df_to_html = df.copy()
+             df_to_html = df_to_html.copy()
         
         # Fix: Clear the columns name
         df_to_html.columns.name = None
@@ -1707,7 +1188,23 @@ def generate_html_report(data_dict, output_file='report_tables.html'):
 
 
 if __name__ == "__main__":
+    import argparse
     import os
+    parser = argparse.ArgumentParser(description="Builds the tables report (reports/report_tables.html).")
+    parser.add_argument('--filter', nargs='*', metavar='KEY=VALUE',
+                        help="Subset of the province and Kalbar tables and maps, e.g. "
+                             "jurusan=Teknik Mesin tahun_lulus=2024 status=working (default status: working).")
+    parser.add_argument('--xlsx', metavar='PATH', help="Also write every report table to this workbook (numbers kept numeric).")
+    parser.add_argument('--quiet', action='store_true', help="Skip the console tables (same as TRACER_QUIET=1).")
+    parser.add_argument('--max-rows', type=int, metavar='N',
+                        help="Print only the first N rows of each console table (same as TRACER_MAX_ROWS=N).")
+    args = parser.parse_args()
+    if args.quiet:
+        console.set_quiet()
+    if args.max_rows is not None:
+        console.set_max_rows(args.max_rows)
+    geo_filters = geo_cube.parse_filters(args.filter)
+    geo_title = f" ({geo_cube.describe_filters(geo_filters)})" if geo_filters else ""
     print("--- Running table_jml_responden.py ---")
     
     # Define paths
@@ -1724,7 +1221,11 @@ if __name__ == "__main__":
         
     try:
         print(f"Loading data from {file_path}...")
-        df_load = pd.read_excel(file_path)
+        with profiling.stage('load data') as record:
+            df_load = load_cleaned(file_path) if file_path == DATA_CLEANED else pd.read_excel(file_path)
+            record.rows_out = len(df_load)
+        # Row masks (working, employed, Kalbar, ...) shared by the builders below
+        data = Dataset(df_load)
         
         # Calculate dataframes
         df_campus = create_distribution_campus_loc_tahun(df_load)
@@ -1759,7 +1260,7 @@ if __name__ == "__main__":
             dfs_to_report["Distribusi Masa Tunggu Responden"] = (df_masa_tunggu, chart_masa_tunggu)
             
         # New Table: Rata-rata Waktu Tunggu per Jurusan
-        df_waktu_tunggu = create_distribution_waktu_tunggu_jurusan(df_load)
+        df_waktu_tunggu = create_distribution_waktu_tunggu_jurusan(data)
         if not df_waktu_tunggu.empty:
             print_styled_table(df_waktu_tunggu, "Table 5: Rata-rata Masa Tunggu Lulusan per Jurusan")
             # No chart requested for this yet, pass None
@@ -1784,21 +1285,22 @@ if __name__ == "__main__":
                 print_styled_table(df_jur, table_title)
                 dfs_to_report[table_title] = (df_jur, None)
         
-        # Table 8: Sebaran Provinsi
-        df_provinsi = create_distribution_provinsi(df_load)
+        # Table 8: Sebaran Provinsi (Tables 8 and 9 and their maps share one geo cube)
+        cube_geo = geo_cube.load_geo_cube(df_load, source=file_path)
+        df_provinsi = create_distribution_provinsi(data, geo_filters, cube_geo)
         if not df_provinsi.empty:
-            print_styled_table(df_provinsi, "Table 8: Sebaran Alumni per Provinsi")
+            print_styled_table(df_provinsi, f"Table 8: Sebaran Alumni per Provinsi{geo_title}")
             # Generate Map
             MAP_OUTPUT = os.path.join(REPORTS_DIR, 'Peta_Sebaran_Alumni.html')
             generate_alumni_map(df_provinsi, MAP_OUTPUT)
             # Add table to report
             # Pass map filename reference for IFrame
-            dfs_to_report["Sebaran Alumni per Provinsi"] = (df_provinsi, None, 'Peta_Sebaran_Alumni.html')
+            dfs_to_report[f"Sebaran Alumni per Provinsi{geo_title}"] = (df_provinsi, None, 'Peta_Sebaran_Alumni.html')
             
         # New Table: Sebaran Kota/Kabupaten Kalbar
-        df_kalbar = create_distribution_kabkota_kalbar(df_load)
+        df_kalbar = create_distribution_kabkota_kalbar(data, geo_filters, cube_geo)
         if not df_kalbar.empty:
-             print_styled_table(df_kalbar, "Table 9: Distribusi Serapan Alumni di DUDI")
+             print_styled_table(df_kalbar, f"Table 9: Distribusi Serapan Alumni di DUDI{geo_title}")
              # Prepare df for chart: Rename 'Jumlah Responden' to 'Total' and drop percentage string
              df_chart = df_kalbar.set_index('Kota/Kabupaten')[['Jumlah Responden']].rename(columns={'Jumlah Responden': 'Total'})
              chart_kalbar = get_horizontal_bar_chart_base64(
@@ -1810,10 +1312,10 @@ if __name__ == "__main__":
              MAP_KALBAR_OUTPUT = os.path.join(REPORTS_DIR, 'Peta_Sebaran_Kalbar.html')
              generate_kalbar_map(df_kalbar, MAP_KALBAR_OUTPUT)
              
-             dfs_to_report["Distribusi Serapan Alumni di DUDI"] = (df_kalbar, chart_kalbar, 'Peta_Sebaran_Kalbar.html')
+             dfs_to_report[f"Distribusi Serapan Alumni di DUDI{geo_title}"] = (df_kalbar, chart_kalbar, 'Peta_Sebaran_Kalbar.html')
 
         # New Table: Distribusi Pendapatan
-        df_salary = create_salary_distribution(df_load)
+        df_salary = create_salary_distribution(data)
         if not df_salary.empty:
             print_styled_table(df_salary, "Table 10: Distribusi Pendapatan Responden per Bulan")
             # Prepare df for chart
@@ -1824,25 +1326,54 @@ if __name__ == "__main__":
             dfs_to_report["Distribusi Rata-rata Pendapatan Lulusan per Bulan"] = (df_salary, chart_salary)
 
         # New Table: Rata-rata Gaji per Jurusan
-        result_salary = create_salary_by_jurusan(df_load)
-        if result_salary and not result_salary[0].empty:
-            df_salary_display, df_salary_ranked = result_salary
-            print_styled_table(df_salary_display, "Table 11: Rata-rata Gaji Lulusan per Jurusan (Estimasi)")
+        df_salary_jurusan = create_salary_by_jurusan(data)
+        if not df_salary_jurusan.empty:
+            print_styled_table(df_salary_jurusan, "Table 11: Rata-rata Gaji Lulusan per Jurusan (Estimasi)")
             
-            # Prepare for chart
-            df_chart_sj = df_salary_ranked.set_index('Jurusan')[['Total']]
+            # The table is numeric, so the chart uses it directly
+            df_chart_sj = df_salary_jurusan.set_index('Jurusan')[['Rata-rata Gaji (Estimasi)']].rename(
+                columns={'Rata-rata Gaji (Estimasi)': 'Total'})
             
             chart_salary_jurusan = get_horizontal_bar_chart_base64(df_chart_sj, "Ranking Jurusan berdasarkan Rata-rata Gaji")
-            dfs_to_report["Rata-rata Gaji Lulusan per Jurusan"] = (df_salary_display, chart_salary_jurusan)
-
-        # New Table: Ranking Jurusan (Static from Analysis)
-        df_ranking = create_jurusan_ranking()
+            dfs_to_report["Rata-rata Gaji Lulusan per Jurusan"] = (df_salary_jurusan, chart_salary_jurusan)
+
+        # Masa tunggu with job seekers as censored observations (Kaplan-Meier)
+        df_survival = create_masa_tunggu_survival(df_load, 'jurusan')
+        if not df_survival.empty:
+            print_styled_table(df_survival.reset_index(), "Table: Masa Tunggu Kerja Pertama per Jurusan (Kaplan-Meier)")
+            chart_survival = get_survival_chart_base64(survival.survival_curves(df_load, 'jurusan'),
+                                                       "Kurva Masa Tunggu per Jurusan")
+            dfs_to_report["Masa Tunggu Kerja Pertama per Jurusan (Kaplan-Meier)"] = (df_survival, chart_survival)
+
+        # Job-search funnel: one cube, rolled up per jurusan / prodi / tahun lulus
+        funnel_cube = build_funnel_cube(data)
+        if not funnel_cube.empty:
+            for by, table_title in [('jurusan', "Funnel Pencarian Kerja per Jurusan"),
+                                    ('prodi', "Funnel Pencarian Kerja per Program Studi"),
+                                    ('tahun_lulus', "Funnel Pencarian Kerja per Tahun Lulus")]:
+                df_funnel = create_job_search_funnel(df_load, by, cube=funnel_cube)
+                print_styled_table(df_funnel.reset_index(), f"Table: {table_title}")
+                chart_funnel = get_funnel_chart_base64(df_funnel, "Funnel Pencarian Kerja") if by == 'jurusan' else None
+                dfs_to_report[table_title] = (df_funnel, chart_funnel)
+
+        # Ranking Jurusan (composite of the outcome metrics)
+        df_ranking = create_jurusan_ranking(df_load)
         print_styled_table(df_ranking, "Table 12: Peringkat Performa Jurusan")
         dfs_to_report["Peringkat Performa Jurusan - Tracer Study 2025"] = (df_ranking, None)
 
+        # Data quality: flags of the anomaly scanner, per rule and column
+        df_anomali = anomaly.summarize(anomaly.scan(df_load))
+        if not df_anomali.empty:
+            print_styled_table(df_anomali, "Table: Ringkasan Anomali Data")
+            dfs_to_report["Ringkasan Anomali Data"] = (df_anomali, None)
+
         generate_html_report(dfs_to_report, output_file=REPORT_OUTPUT)
+        if args.xlsx:
+            formatting.write_excel({title: entry[0] for title, entry in dfs_to_report.items()}, args.xlsx)
         
     except Exception as e:
         print(f"Error executing main: {e}")
         import traceback
         traceback.print_exc()
+
+    profiling.write_report('table_jml_responden')
@@ -0,0 +1,46 @@
+"""
+Shared fixtures. The cleaned data is loaded once per session (per worker
+under pytest-xdist: ``python -m pytest -n auto``) from the columnar cache.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, 'src')
+sys.path.insert(0, SRC_DIR)
+
+import matplotlib # noqa: E402
+matplotlib.use('Agg')
+
+import schema # noqa: E402
+from data_cache import load_cleaned # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def df():
+    """Cleaned data with the question texts as column names (do not mutate)."""
+    return load_cleaned()
+
+
+@pytest.fixture(scope='session')
+def df_ids(df):
+    """Cleaned data with schema IDs as column names and registry dtypes."""
+    return schema.to_ids(df, dtypes=True)
+
+
+@pytest.fixture(scope='session')
+def cleaning_run(tmp_path_factory):
+    """
+    Runs cleaning.py on the raw export into a temporary directory.
+    Returns (output directory, stdout).
+    """
+    out_dir = str(tmp_path_factory.mktemp('cleaning'))
+    env = dict(os.environ, TRACER_PROCESSED_DIR=out_dir, TRACER_REPORTS_DIR=out_dir, TRACER_PROFILE='0')
+    result = subprocess.run([sys.executable, os.path.join(SRC_DIR, 'cleaning.py')], env=env, cwd=SRC_DIR,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    assert result.returncode == 0, result.stdout[-2000:]
+    return out_dir, result.stdout
+
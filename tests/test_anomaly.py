@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+import anomaly
+import cleaning
+from gap_analisis import COMPETENCY_SCORE_MAP
+
+
+def test_injected_values_are_flagged(df):
+    df_bad = df.copy()
+    col_mt = 'Dalam berapa bulan Anda mendapatkan pekerjaan? Tulis dengan angka (Contoh: 1, 1Tahun = 12 bulan) rev2'
+    row = df_bad[col_mt].notna().idxmax()
+    df_bad.loc[row, col_mt] = 24228
+    df_flags = anomaly.scan(df_bad)
+    flagged = df_flags[(df_flags['ID'] == df_bad.loc[row, 'ID']) & (df_flags['Kolom'] == 'masa_tunggu')]
+    assert {'outlier', 'impossible'} <= set(flagged['Aturan'])
+
+
+def test_rules_match_direct_checks(df_ids):
+    df_flags = anomaly.scan(df_ids)
+    impossible = df_flags[df_flags['Aturan'] == 'impossible'].groupby('Kolom').size()
+    assert impossible.get('jml_respon', 0) == (df_ids['jml_respon'] > df_ids['jml_lamaran']).sum()
+    assert impossible.get('jml_wawancara', 0) == (df_ids['jml_wawancara'] > df_ids['jml_respon']).sum()
+    contradictions = df_flags[(df_flags['Aturan'] == 'contradiction') & (df_flags['Kolom'] == 'masa_tunggu')]
+    mt, answer = df_ids['masa_tunggu'], df_ids['kerja_6bln'].astype(str)
+    assert len(contradictions) == (((answer == 'Ya') & (mt > 6)) | ((answer == 'Tidak') & (mt <= 6))).sum()
+    assert set(df_flags['ID']) <= set(df_ids['id'])
+
+
+def test_competency_levels_scored_as_gap_analysis(df):
+    columns = anomaly.scanned_columns(df)
+    assert 'etika_acq' in columns and 'etika_req' in columns
+    values = anomaly.numeric_matrix(df, columns)
+    for col_id in ('etika_acq', 'etika_req'):
+        answers = df[columns[col_id]]
+        expected = answers.map(COMPETENCY_SCORE_MAP).astype(float)
+        np.testing.assert_array_equal(values[col_id].to_numpy(), expected.to_numpy())
+        # Both follow the survey's own codes
+        codes = answers.map({level: code for code, level in cleaning.competency_mapping.items()}).astype(float)
+        np.testing.assert_array_equal(values[col_id].to_numpy(), codes.to_numpy())
+
+
+def test_robust_z_per_group():
+    values = pd.DataFrame({'x': [1.0, 2, 3, 4, 100, 10, 20, 30, 40, 50]})
+    groups = pd.Series(['a'] * 5 + ['b'] * 5)
+    z = anomaly.robust_z(values, groups)['x'].to_numpy()
+    assert np.abs(z[4]) > anomaly.Z_LIMIT
+    assert (np.abs(np.delete(z, 4)) <= anomaly.Z_LIMIT).all()
+
+
+def test_cleaning_stage_writes_table(df, tmp_path):
+    cleaning.scan_anomalies(df, str(tmp_path))
+    assert (tmp_path / anomaly.ANOMALY_FILE).exists()
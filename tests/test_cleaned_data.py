@@ -0,0 +1,94 @@
+import pandas as pd
+import pytest
+
+import schema
+from dataset import WORKING_STATUS
+
+SENSITIVE_COLUMNS = ['Timestamp', 'Email Address', 'Nama Mahasiswa', 'Nomor Handphone', 'NIK']
+DIPLOMAS = {'D1', 'D2', 'D3', 'D4'}
+# Company types accepted by the survey; anything else is mapped to 'lainnya'
+JENIS_INSTANSI = [
+    'Instansi Pemerintah',
+    'Organisasi non-profit/Lembaga Swadaya Masyarakat',
+    'Perusahaan Swasta',
+    'Wiraswasta/perusahaan sendiri',
+    'BUMN/BUMD',
+    'Institusi/Organisasi Multilateral',
+]
+STATUSES = [
+    'Bekerja (Full time/Part time)',
+    'Wiraswasta',
+    'Tidak kerja tetapi sedang mencari kerja',
+    'Belum memungkinkan bekerja',
+    'Melanjutkan Pendidikan',
+]
+CATEGORY_IDS = [c for c, spec in schema.SCHEMA.items() if spec['dtype'] == 'category' and spec['categories']]
+
+
+def test_sensitive_columns_removed(df):
+    assert not set(SENSITIVE_COLUMNS) & set(df.columns)
+
+
+def test_registered_columns_present(df):
+    missing = [schema.label(col_id) for col_id in schema.SCHEMA if schema.find_column(df, col_id) is None]
+    assert not missing
+
+
+def test_no_duplicate_columns(df):
+    assert not df.columns.duplicated().any()
+
+
+@pytest.mark.parametrize('col_id', CATEGORY_IDS)
+def test_categories_valid(df, col_id):
+    values = df[schema.find_column(df, col_id)]
+    # Casting to the registry dtype turns unknown values into NaN
+    unknown = values.notna() & pd.isna(schema.cast(values, col_id))
+    assert not unknown.any(), values[unknown].unique()[:5].tolist()
+
+
+def test_jenis_instansi_in_allowed_list(df_ids):
+    values = df_ids['jenis_instansi'].dropna().astype(str)
+    assert len(values) > 0
+    assert set(values) <= set(JENIS_INSTANSI) | {'lainnya'}, set(values) - set(JENIS_INSTANSI)
+    # Exact spelling, not just a case-insensitive match
+    assert values.isin(JENIS_INSTANSI).mean() > 0.5
+
+
+def test_status_values(df_ids):
+    assert df_ids['status'].notna().all()
+    assert set(df_ids['status'].astype(str)) <= set(STATUSES)
+
+
+def test_program_studi_split(df_ids):
+    assert set(df_ids['diploma'].dropna().unique()) <= DIPLOMAS
+    assert df_ids['diploma'].notna().all()
+    assert df_ids['prodi'].notna().all()
+    assert not df_ids['prodi'].astype(str).str.contains(' - ').any()
+
+
+def test_prodi_belongs_to_one_jurusan(df_ids):
+    jurusan_per_prodi = df_ids.groupby('prodi', observed=True)['jurusan'].nunique()
+    assert (jurusan_per_prodi == 1).all(), jurusan_per_prodi[jurusan_per_prodi > 1].to_dict()
+
+
+def test_masa_tunggu_range(df_ids):
+    # An unparsed answer once came through as 24228 months
+    masa_tunggu = df_ids['masa_tunggu'].dropna()
+    assert masa_tunggu.between(0, 100).all(), masa_tunggu[masa_tunggu > 100].tolist()
+
+
+def test_masa_tunggu_answered_by_workers(df_ids):
+    answered = df_ids['masa_tunggu'].notna()
+    assert answered.any()
+    assert answered[~df_ids['status'].isin(WORKING_STATUS)].mean() < answered[df_ids['status'].isin(WORKING_STATUS)].mean()
+
+
+def test_competency_pairs_complete(df_ids):
+    for col_id in schema.SCHEMA:
+        if col_id.endswith('_acq'):
+            assert col_id.replace('_acq', '_req') in df_ids.columns
+
+
+def test_tahun_lulus_numeric(df_ids):
+    assert pd.api.types.is_numeric_dtype(df_ids['tahun_lulus'])
+    assert df_ids['tahun_lulus'].dropna().between(2000, 2100).all()
@@ -0,0 +1,75 @@
+"""End-to-end run of cleaning.py on the raw export (one subprocess per session)."""
+import os
+import re
+
+import pandas as pd
+
+import cleaning
+from data_cache import DATA_FILE, read_parts
+
+RAW_ROWS = 761
+CLEANED_ROWS = 754
+COL_6_BULAN = "Apakah anda telah mendapatkan pekerjaan <=6 bulan / termasuk bekerja sebelum lulus?"
+COL_DURATION = "Dalam berapa bulan Anda mendapatkan pekerjaan? Tulis dengan angka (Contoh: 1, 1Tahun = 12 bulan) rev2"
+
+
+def printed_count(stdout, pattern):
+    match = re.search(pattern, stdout)
+    assert match, f"'{pattern}' not in the cleaning output"
+    return int(match.group(1))
+
+
+def test_row_counts(cleaning_run):
+    _, stdout = cleaning_run
+    assert printed_count(stdout, r'Initial Rows: (\d+)') == RAW_ROWS
+    assert printed_count(stdout, r'Final Rows:\s+(\d+)') == CLEANED_ROWS
+
+
+def test_exception_nim_preserved(cleaning_run):
+    _, stdout = cleaning_run
+    assert printed_count(stdout, r'Exception NIM \d+ count: (\d+)') > 1
+
+
+def test_output_matches_committed_data(cleaning_run, df):
+    out_dir, _ = cleaning_run
+    df_new = pd.read_excel(os.path.join(out_dir, 'cleaned_data.xlsx'))
+    df_committed = pd.read_excel(DATA_FILE)
+    pd.testing.assert_frame_equal(df_new, df_committed)
+
+
+def test_raw_masa_tunggu_is_months():
+    # The raw export once carried 24228 in the masa tunggu column
+    raw = cleaning.read_raw()
+    duration = pd.to_numeric(raw[cleaning.col_duration_rev2], errors='coerce').dropna()
+    assert len(duration) > 0
+    assert duration.between(0, 100).all(), duration[duration > 100].tolist()
+
+
+def test_validation_flag(cleaning_run, df):
+    # Valid: (<=6 bulan "Ya" and duration <= 6) or ("Tidak" and duration > 6 or missing)
+    _, stdout = cleaning_run
+    answer = df[COL_6_BULAN].astype(str)
+    duration = df[COL_DURATION]
+    valid = ((answer == 'Ya') & (duration <= 6)) | ((answer == 'Tidak') & ((duration > 6) | duration.isna()))
+    assert printed_count(stdout, r"Found (\d+) flagged rows") == int(valid.sum())
+
+
+def test_group_and_status_tables(cleaning_run):
+    out_dir, _ = cleaning_run
+    group_table = pd.read_excel(os.path.join(out_dir, 'group_table.xlsx'))
+    status_table = pd.read_excel(os.path.join(out_dir, 'status_table.xlsx'))
+    assert group_table['Count'].sum() == CLEANED_ROWS
+    assert not group_table.duplicated(['Jurusan', 'prodi', 'diploma']).any()
+    assert status_table['Count'].sum() == CLEANED_ROWS
+
+
+def test_streaming_matches_in_memory(tmp_path):
+    final_rows = cleaning.run_streaming(cleaning.DATA_RAW, out_dir=str(tmp_path), reports_dir=str(tmp_path),
+                                        chunk_rows=100, excel=False)
+    assert final_rows == CLEANED_ROWS
+    # Streaming keeps the raw row order; the in-memory run sorts latest first
+    df_parts = read_parts(os.path.join(tmp_path, cleaning.PARTS_DIRNAME)).sort_values('ID', ignore_index=True)
+    df_committed = pd.read_excel(DATA_FILE).sort_values('ID', ignore_index=True)
+    pd.testing.assert_frame_equal(df_parts, df_committed, check_dtype=False)
+    status_table = pd.read_excel(os.path.join(tmp_path, 'status_table.xlsx'))
+    assert status_table['Count'].sum() == CLEANED_ROWS
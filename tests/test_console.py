@@ -0,0 +1,60 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+import console
+import formatting
+
+
+def render(df, **kwargs):
+    stream = io.StringIO()
+    console.render_table(df, stream=stream, **kwargs)
+    return stream.getvalue().splitlines()
+
+
+def test_columns_fit_widest_cell():
+    df = pd.DataFrame({'Prodi': ['TI', 'Teknik Mesin'], 'Jumlah': [5, 120]})
+    lines = render(df, title='Contoh')
+    assert lines[0] == '' and lines[1] == '[Contoh]'
+    assert lines[2] == '+--------------+--------+'
+    assert lines[3] == '| Prodi        | Jumlah |'
+    # Numbers are right-aligned, text left-aligned
+    assert lines[5] == '| TI           |      5 |'
+    assert lines[6] == '| Teknik Mesin |    120 |'
+    assert len({len(line) for line in lines[2:]}) == 1
+
+
+def test_missing_values_and_formats():
+    df = formatting.set_formats(pd.DataFrame({'Nama': ['A', None], 'Persentase': [12.345, np.nan]}),
+                                {'Persentase': 'percent'})
+    lines = render(df)
+    assert lines[3] == '| A    |     12.35% |'
+    assert lines[4] == '| -    |          - |'
+
+
+def test_head_limit_and_truncation():
+    df = pd.DataFrame({'Prodi': ['x' * 80] + [f'P{i}' for i in range(9)]})
+    lines = render(df, max_rows=3, max_width=10)
+    assert lines[3] == '| xxxxxxx... |'
+    assert len(lines) == 3 + 3 + 1 + 1 # borders and header, rows, border, note
+    assert lines[-1] == '(7 more rows not shown)'
+
+
+def test_named_index_is_shown():
+    df = pd.DataFrame({'Jumlah': [1, 2]}, index=pd.Index(['a', 'b'], name='Jurusan'))
+    assert render(df)[1] == '| Jurusan | Jumlah |'
+    assert render(df.reset_index(drop=True))[1] == '| Jumlah |'
+
+
+def test_unencodable_characters_are_replaced():
+    stream = io.TextIOWrapper(io.BytesIO(), encoding='ascii')
+    console.render_table(pd.DataFrame({'Kota': ['Tümbang']}), stream=stream)
+    stream.seek(0)
+    assert '| T?mbang |' in stream.read()
+
+
+def test_quiet_skips_rendering(monkeypatch, capsys):
+    monkeypatch.setattr(console, 'QUIET', True)
+    console.print_styled_table(pd.DataFrame({'a': [1]}), 'Judul')
+    assert capsys.readouterr().out == ''
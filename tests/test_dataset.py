@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import gap_analisis
+import table_jml_responden as tr
+from dataset import Dataset, WORKING_STATUS
+
+COL_STATUS = 'Jelaskan status Anda saat ini?'
+
+
+def test_masks_are_cached(df):
+    data = Dataset(df)
+    working = data.mask('working')
+    assert (working == df[COL_STATUS].isin(WORKING_STATUS).to_numpy()).all()
+    assert data.mask('working') is working
+    both = data.mask('kalbar', 'working')
+    assert both is data.mask('working', 'kalbar')
+    assert (both == working & (df['Provinsi rev'] == 'Kalimantan Barat').to_numpy()).all()
+
+
+def test_column_selects_masked_rows(df):
+    data = Dataset(df)
+    selected = data.column('status', 'employed')
+    expected = df.loc[df[COL_STATUS] == 'Bekerja (Full time/Part time)', COL_STATUS]
+    pd.testing.assert_series_equal(selected, expected)
+    assert data.column('jurusan').equals(df['Jurusan'])
+
+
+@pytest.mark.parametrize('builder', [
+    'create_distribution_provinsi',
+    'create_distribution_kabkota_kalbar',
+    'create_salary_distribution',
+    'create_distribution_waktu_tunggu_jurusan',
+])
+def test_builders_accept_dataset(df, builder):
+    data = Dataset(df)
+    pd.testing.assert_frame_equal(getattr(tr, builder)(data), getattr(tr, builder)(df))
+
+
+def test_gap_with_shared_dataset(df):
+    data = Dataset(df)
+    for jurusan in df['Jurusan'].dropna().unique()[:3]:
+        pd.testing.assert_frame_equal(gap_analisis.calculate_gap(data, jurusan),
+                                      gap_analisis.calculate_gap(df, jurusan))
+    assert data.competencies() is data.competencies()
+
+
+def test_convert_competency_series():
+    series = pd.Series(['Sangat Menguasai', None, 'Cukup Menguasai', 'Sangat Menguasai'], index=[3, 1, 2, 0])
+    values = gap_analisis.convert_competency_series(series)
+    assert values.index.tolist() == [3, 1, 2, 0]
+    assert np.isnan(values.iloc[1])
+    assert values.iloc[0] == values.iloc[3] > values.iloc[2]
+    assert gap_analisis.convert_competency_series(pd.Series([1, 5, None])).tolist()[:2] == [1.0, 5.0]
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import formatting
+import table_jml_responden as tr
+
+
+def test_format_values():
+    values = pd.Series([12.345, np.nan, 100.0])
+    assert formatting.format_values(values, 'percent').tolist() == ['12.35%', '-', '100.00%']
+    assert formatting.format_values(pd.Series([3_750_000.0]), 'rupiah').tolist() == ['Rp3.8 juta']
+    # Labels in mixed columns are kept as they are
+    assert formatting.format_values(pd.Series([1.25, 'TOTAL']), 'number1').tolist() == ['1.2', 'TOTAL']
+
+
+def test_formatted_leaves_numbers_alone():
+    df = formatting.set_formats(pd.DataFrame({'a': [1, 2], 'pct': [50.0, 50.0]}), {'pct': 'percent'})
+    display = formatting.formatted(df)
+    assert display['pct'].tolist() == ['50.00%', '50.00%']
+    assert df['pct'].dtype == float
+    assert display['a'].tolist() == [1, 2]
+    with pytest.raises(ValueError):
+        formatting.set_formats(df, {'a': 'roman'})
+
+
+def test_formats_survive_reset_index(df):
+    table = tr.create_serapan_jurusan(df)
+    assert formatting.formats_of(table.reset_index()) == {'Persentase': 'percent'}
+
+
+def test_write_excel_keeps_numbers(df, tmp_path):
+    table = tr.create_distribution_provinsi(df)
+    path = tmp_path / 'tables.xlsx'
+    formatting.write_excel({'Sebaran Alumni per Provinsi': table}, str(path))
+    df_read = pd.read_excel(path)
+    assert df_read['Persentase'].iloc[-1] == 100
+    from openpyxl import load_workbook
+    ws = load_workbook(path).active
+    assert ws.cell(row=2, column=3).number_format == '0.00"%"'
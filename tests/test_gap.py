@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import gap_analisis
+import gap_cube
+import gap_stats
+import schema
+
+
+@pytest.fixture(scope='module')
+def cube(df):
+    return gap_cube.build_gap_cube(df)
+
+
+def test_every_competency_has_a_column_pair(df):
+    for name, keywords in gap_analisis.COMPETENCY_MAP.items():
+        col_acq, col_req = gap_analisis.get_column_pair(df, keywords)
+        assert col_acq and col_req, name
+        assert col_acq != col_req
+
+
+def test_cube_matches_calculate_gap(df, cube):
+    df_matrix = gap_cube.gap_matrix(cube, 'jurusan')
+    for jurusan in df['Jurusan'].dropna().unique():
+        df_gap = gap_analisis.calculate_gap(df, jurusan).set_index('Kompetensi')
+        if df_gap.empty:
+            continue
+        expected = df_gap['Gap']
+        actual = df_matrix.loc[jurusan, expected.index].astype(float)
+        np.testing.assert_allclose(actual, expected, atol=0.011, err_msg=jurusan)
+
+
+def test_saved_cube_gives_same_sections(cube, tmp_path):
+    path = str(tmp_path / 'gap_cube.csv')
+    gap_cube.save_gap_cube(cube, path)
+    loaded = gap_cube.load_gap_cube(path)
+    for by in ('tahun_lulus', 'prodi'):
+        pd.testing.assert_frame_equal(gap_cube.gap_matrix(loaded, by), gap_cube.gap_matrix(cube, by), check_dtype=False)
+    assert gap_analisis.build_trend_section(loaded) == gap_analisis.build_trend_section(cube)
+
+
+def test_rollup_is_additive(cube):
+    institution = gap_cube.rollup(cube).set_index('Kompetensi')
+    per_jurusan = gap_cube.rollup(cube, ['jurusan']).groupby('Kompetensi')['Responden'].sum()
+    assert (institution['Responden'] == per_jurusan.reindex(institution.index)).all()
+
+
+def test_gap_table_sorted(df):
+    df_matrix = gap_analisis.calculate_gap_table(df, 'prodi')
+    assert df_matrix.index.name == 'prodi'
+    assert df_matrix['Rata-rata Gap'].is_monotonic_decreasing
+
+
+def test_constant_differences_give_no_t_statistics():
+    hist = np.zeros((2, gap_stats.N_BINS))
+    hist[0, 4 + 1] = 3 # three pairs, all required - acquired = 1
+    hist[1, [4 - 1, 4 + 2]] = 2
+    result = gap_stats.paired_tests_from_histogram(hist)
+    for key in ('t', 'p (t-test)', 'Cohen dz'):
+        assert np.isnan(result[key][0]), key
+        assert np.isfinite(result[key][1]), key
+
+
+def test_paired_tests_p_values(df):
+    results = gap_stats.paired_tests(df)
+    assert results
+    for df_level in results.values():
+        if df_level.empty:
+            continue
+        for col in ['p (t-test)', 'p (Wilcoxon)', 'p adj (t-test)', 'p adj (Wilcoxon)']:
+            p = df_level[col].dropna()
+            assert p.between(0, 1).all()
+        assert (df_level['p adj (Wilcoxon)'].dropna() >= df_level['p (Wilcoxon)'].dropna() - 1e-12).all()
+
+
+@pytest.mark.parametrize('sort_by', ['gap', 'name'])
+def test_heatmap_section_order_and_caption(cube, sort_by):
+    html = gap_analisis.build_heatmap_section(cube, sort_by)
+    assert gap_analisis.GAP_SORT_CAPTIONS[sort_by] in html
+    other = 'name' if sort_by == 'gap' else 'gap'
+    assert gap_analisis.GAP_SORT_CAPTIONS[other] not in html
+    df_matrix = gap_analisis.sort_gap_matrix(schema.to_labels(gap_cube.gap_matrix(cube, 'prodi')), sort_by)
+    rows = [html.index(f'<td>{name}</td>') for name in df_matrix.index]
+    assert rows == sorted(rows)
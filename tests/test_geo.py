@@ -0,0 +1,82 @@
+import json
+
+import pandas as pd
+import pytest
+
+import geo
+import table_jml_responden as tr
+
+SQUARE = [[[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]]
+
+
+@pytest.fixture
+def shapes(tmp_path, monkeypatch):
+    """Two-region kabkota shapes in a temporary geometry cache."""
+    collection = {'type': 'FeatureCollection', 'features': [
+        {'type': 'Feature', 'properties': {'name': 'Kubu Raya'},
+         'geometry': {'type': 'Polygon', 'coordinates': SQUARE}},
+        {'type': 'Feature', 'properties': {'name': 'Sambas'},
+         'geometry': {'type': 'MultiPolygon', 'coordinates': [[[[5, 5], [6, 5], [6, 6], [5, 5]]]]}},
+    ]}
+    path = tmp_path / 'geo_kabkota.geojson'
+    path.write_text(json.dumps(collection))
+    monkeypatch.setattr(geo, 'geometry_path', lambda region: str(path))
+    monkeypatch.setattr(geo, '_GEOMETRY', {})
+    return collection
+
+
+def test_region_key():
+    assert geo.region_key('Kab. Kubu Raya') == 'KUBU RAYA'
+    assert geo.region_key('Landak ') == 'LANDAK'
+    assert geo.region_key('Kota  Pontianak') == 'PONTIANAK'
+    assert geo.region_key('DI Yogyakarta') == 'DAERAH ISTIMEWA YOGYAKARTA'
+
+
+def test_geometry_is_prepared_once(shapes):
+    collection, keys = geo.load_geometry('kabkota')
+    assert geo.load_geometry('kabkota')[0] is collection
+    # Pontianak is missing from the source: a synthetic shape, drawn last
+    assert list(keys) == ['KUBU RAYA', 'SAMBAS', 'PONTIANAK']
+    assert collection['features'][0]['properties']['anchor'] == pytest.approx([1, 1])
+
+
+def test_choropleth_joins_counts(shapes, tmp_path):
+    counts = pd.Series({'Kubu Raya ': 10, 'Pontianak': 50, 'Sambas': 5, 'Atlantis': 1})
+    collection = geo.choropleth(counts, 'kabkota', total=100)
+    cached, _ = geo.load_geometry('kabkota')
+    props = {f['properties']['key']: f['properties'] for f in collection['features']}
+    assert props['KUBU RAYA']['value'] == 10 and props['KUBU RAYA']['pct'] == 10.0
+    assert props['PONTIANAK']['color'] == geo.HIGHLIGHT_COLOR
+    # Pontianak stays out of the color scale: Kubu Raya is the darkest
+    assert props['KUBU RAYA']['color'] == '#00008b'
+    # Geometry objects are shared with the cache, not copied
+    assert collection['features'][0]['geometry'] is cached['features'][0]['geometry']
+    png = tmp_path / 'kalbar.png'
+    geo.render_static(collection, 'kabkota', str(png))
+    assert png.stat().st_size > 0
+
+
+def test_point_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr(geo, 'geometry_path', lambda region: str(tmp_path / 'missing.geojson'))
+    monkeypatch.setattr(geo, 'gpd', None)
+    monkeypatch.setattr(geo, '_GEOMETRY', {})
+    collection, keys = geo.load_geometry('provinsi')
+    assert len(keys) == len(geo.INDO_COORDS)
+    assert {f['geometry']['type'] for f in collection['features']} == {'Point'}
+
+
+def test_province_map_from_table(df, tmp_path, monkeypatch):
+    monkeypatch.setattr(geo, 'geometry_path', lambda region: str(tmp_path / 'missing.geojson'))
+    monkeypatch.setattr(geo, 'gpd', None)
+    monkeypatch.setattr(geo, '_GEOMETRY', {})
+    df_prov = tr.create_distribution_provinsi(df)
+    counts = df_prov[df_prov['Provinsi'] != 'TOTAL'].set_index('Provinsi')['Jumlah']
+    collection = geo.choropleth(counts, 'provinsi')
+    mapped = sum(f['properties']['value'] for f in collection['features'])
+    # Only provinces without coordinates are lost (names with trailing spaces still join)
+    lost = sum(v for name, v in counts.items() if geo.region_key(name) not in
+               {geo.region_key(n) for n in geo.INDO_COORDS})
+    assert mapped == counts.sum() - lost
+    png = tmp_path / 'map.png'
+    geo.render_static(collection, 'provinsi', str(png))
+    assert png.stat().st_size > 0
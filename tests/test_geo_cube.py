@@ -0,0 +1,76 @@
+import os
+
+import pandas as pd
+import pytest
+
+import geo_cube
+import table_jml_responden as tr
+from dataset import WORKING_STATUS
+
+COL_STATUS = 'Jelaskan status Anda saat ini?'
+
+
+@pytest.fixture(scope='module')
+def cube(df):
+    return geo_cube.build_geo_cube(df)
+
+
+def test_cube_counts_every_respondent(df, cube):
+    assert cube['responden'].sum() == len(df)
+    assert list(cube.columns) == geo_cube.GEO_KEYS + ['responden']
+
+
+def test_parse_filters():
+    assert geo_cube.parse_filters(['jurusan=Teknik', 'Mesin', 'tahun_lulus=2024', 'tahun_lulus=2023']) == \
+        {'jurusan': ['Teknik Mesin'], 'tahun_lulus': ['2024', '2023']}
+    with pytest.raises(ValueError):
+        geo_cube.parse_filters(['kota=Pontianak'])
+
+
+def test_filtered_tables_match_rows(df, cube):
+    filters = {'jurusan': ['Teknik Mesin'], 'tahun_lulus': ['2024']}
+    table = tr.create_distribution_kabkota_kalbar(df, filters, cube)
+    rows = df[(df['Jurusan'] == 'Teknik Mesin') & (df['Tahun Lulus'] == 2024)
+              & df[COL_STATUS].isin(WORKING_STATUS) & (df['Provinsi rev'] == geo_cube.KALBAR)]
+    expected = rows['Kota/Kabupate rev'].value_counts()
+    counts = table.set_index('Kota/Kabupaten')['Jumlah Responden']
+    assert counts.iloc[-1] == expected.sum() # respondents without a kabkota are not counted
+    pd.testing.assert_series_equal(counts.iloc[:-1].sort_index(), expected.sort_index(), check_names=False)
+
+
+def test_status_filter_overrides_default(df, cube):
+    table = tr.create_distribution_provinsi(df, {'status': ['seeking']}, cube)
+    seeking = df[COL_STATUS] == 'Tidak kerja tetapi sedang mencari kerja'
+    assert table['Jumlah'].iloc[-1] == df.loc[seeking, 'Provinsi rev'].notna().sum()
+
+
+def test_saved_cube_gives_same_tables(df, cube, tmp_path):
+    path = str(tmp_path / 'geo_cube.csv')
+    source = tmp_path / 'cleaned.xlsx'
+    source.write_bytes(b'')
+    geo_cube.save_geo_cube(cube, path, str(source))
+    loaded = geo_cube.load_geo_cube(source=str(source), path=path)
+    filters = {'tahun_lulus': ['2023']}
+    for builder in (tr.create_distribution_provinsi, tr.create_distribution_kabkota_kalbar):
+        pd.testing.assert_frame_equal(builder(df, filters, loaded), builder(df, filters, cube))
+
+
+def test_saved_cube_is_rebuilt_when_stale(df, cube, tmp_path, monkeypatch):
+    path = str(tmp_path / 'geo_cube.csv')
+    source = tmp_path / 'cleaned.xlsx'
+    source.write_bytes(b'v1')
+    stale = cube.head(3)
+    geo_cube.save_geo_cube(stale, path, str(source))
+    assert len(geo_cube.load_geo_cube(df, str(source), path)) == 3
+    # Edited source that is still older than the saved cube (as after copying a tree)
+    source.write_bytes(b'v2 edited')
+    os.utime(source, (0, 0))
+    assert len(geo_cube.load_geo_cube(df, str(source), path)) == len(cube)
+    # A new cube version invalidates the saved cube too
+    geo_cube.save_geo_cube(stale, path, str(source))
+    monkeypatch.setattr(geo_cube, 'GEO_CUBE_VERSION', geo_cube.GEO_CUBE_VERSION + 1)
+    assert len(geo_cube.load_geo_cube(df, str(source), path)) == len(cube)
+
+
+def test_cube_file_is_keyed_to_source():
+    assert geo_cube.geo_cube_path('a/data.xlsx') != geo_cube.geo_cube_path('a/cleaned_data.xlsx')
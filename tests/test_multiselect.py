@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import multiselect
+
+OPTIONS = multiselect.option_dictionary('cara_cari')
+
+
+def bit(option):
+    return 1 << OPTIONS.index(option)
+
+
+def test_options_with_commas():
+    text = ('Melalui iklan di koran/majalah, brosur, Mencari lewat internet/iklan online/milis, '
+            'Melalui relasi (misalnya dosen, orang tua, saudara, teman, dll)')
+    assert multiselect.parse_answer(text, OPTIONS) == (bit('Melalui iklan di koran/majalah, brosur')
+                                                      | bit('Mencari lewat internet/iklan online/milis')
+                                                      | bit('Melalui relasi (misalnya dosen, orang tua, saudara, teman, dll)'))
+
+
+@pytest.mark.parametrize('text, expected', [
+    (np.nan, 0),
+    ('-', 0),
+    ('', 0),
+    ('Instagram', 1 << (len(OPTIONS) - 1)),
+    ('Dihubungi oleh perusahaan, Instagram', (1 << 4) | (1 << (len(OPTIONS) - 1))),
+])
+def test_empty_and_free_text(text, expected):
+    assert multiselect.parse_answer(text, OPTIONS) == expected
+
+
+def test_encode_matches_parse(df):
+    col = df['Bagaimana Anda mencari pekerjaan tersebut? (jawaban bisa lebih dari satu']
+    masks = multiselect.encode(col, OPTIONS)
+    assert masks.dtype == np.uint16
+    assert masks.tolist() == [multiselect.parse_answer(v, OPTIONS) for v in col]
+
+
+def test_frequencies_and_cooccurrence(df):
+    df_masks, dicts = multiselect.encode_frame(df)
+    for col_id, options in dicts.items():
+        masks = df_masks[col_id].to_numpy()
+        df_freq = multiselect.option_frequencies(masks, options, df['Jurusan'])
+        co = multiselect.cooccurrence(masks, options, df['Jurusan'])
+        for jurusan, df_co in co.items():
+            in_group = (df['Jurusan'] == jurusan).to_numpy()
+            bits = np.array([[m >> k & 1 for k in range(len(options))] for m in masks[in_group]])
+            assert (df_freq.loc[jurusan, options].to_numpy() == bits.sum(axis=0)).all()
+            assert (df_co.to_numpy() == bits.T @ bits).all()
+        assert df_freq['Responden'].sum() == df['Jurusan'].notna().sum()
+
+
+def test_popcount():
+    masks = np.array([0, 1, 0b1011, 0xFFFF], dtype=np.uint16)
+    assert multiselect.popcount(masks).tolist() == [0, 1, 3, 16]
+    assert multiselect.decode(pd.Series([0b101]), OPTIONS) == [[OPTIONS[0], OPTIONS[2]]]
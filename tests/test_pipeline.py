@@ -0,0 +1,31 @@
+import os
+
+import pipeline
+
+
+def names(node):
+    return {os.path.basename(p) for p in pipeline.code_files(pipeline.NODES[node]['script'])}
+
+
+def test_code_files_follow_imports():
+    tables = names('tables')
+    # Direct, transitive (salary -> gap_analisis -> profiling) and function-level imports
+    assert {'table_jml_responden.py', 'salary.py', 'gap_analisis.py', 'profiling.py',
+            'schema.py', 'data_cache.py', 'geo_cube.py', 'formatting.py',
+            'console.py'} <= tables
+    assert 'pipeline.py' not in tables
+    assert {'gap_cube.py', 'gap_stats.py', 'schema.py', 'data_cache.py', 'profiling.py',
+            'formatting.py', 'console.py'} <= names('gap')
+    assert {'data_cache.py', 'profiling.py'} <= names('learning')
+    assert {'schema.py', 'data_cache.py'} <= names('cube')
+
+
+def test_fingerprint_changes_with_imported_module(tmp_path, monkeypatch):
+    (tmp_path / 'main.py').write_text("def run():\n    import helper\n")
+    (tmp_path / 'helper.py').write_text("X = 1\n")
+    monkeypatch.setattr(pipeline, 'SRC_DIR', str(tmp_path))
+    monkeypatch.setitem(pipeline.NODES, 'probe', {'script': str(tmp_path / 'main.py'),
+                                                  'inputs': [], 'outputs': [], 'deps': []})
+    before = pipeline.fingerprint('probe', {})
+    (tmp_path / 'helper.py').write_text("X = 2\n")
+    assert pipeline.fingerprint('probe', {}) != before
@@ -0,0 +1,15 @@
+import sqlite3
+
+import query
+
+
+def test_literal_escapes_quotes():
+    path = "/data/o'brien/cleaned'); DROP TABLE alumni; --.parquet"
+    con = sqlite3.connect(':memory:')
+    assert con.execute(f"SELECT {query._literal(path)}").fetchone()[0] == path
+
+
+def test_alumni_view_uses_schema_ids(df):
+    con = query.connect()
+    result = query.query("SELECT jurusan, COUNT(*) AS n FROM alumni GROUP BY jurusan", con)
+    assert result['n'].sum() == len(df)
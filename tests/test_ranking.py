@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import ranking
+import table_jml_responden as tr
+
+
+@pytest.fixture(scope='module')
+def cube(df):
+    return ranking.build_outcome_cube(df)
+
+
+def test_metrics_match_tables(df, cube):
+    df_metrics = ranking.outcome_metrics(cube, 'jurusan')
+    df_wait = tr.create_distribution_waktu_tunggu_jurusan(df).set_index('Jurusan').drop('TOTAL / RATA-RATA INSTITUSI')
+    np.testing.assert_allclose(df_metrics.loc[df_wait.index, 'masa_tunggu'],
+                               df_wait['Rata-rata Masa Tunggu (Bulan)'].astype(float))
+    assert (df_metrics['volume'] == df['Jurusan'].value_counts().reindex(df_metrics.index)).all()
+
+
+def test_prodi_rolls_up_to_jurusan(cube):
+    per_prodi = cube.groupby('jurusan')[ranking.STAT_COLS].sum()
+    assert per_prodi['responden'].sum() == cube['responden'].sum()
+    assert ranking.outcome_metrics(cube, 'prodi')['volume'].sum() == cube['responden'].sum()
+
+
+def test_weights_drive_the_ranking(df, cube):
+    df_rank = ranking.rank_groups(df, cube=cube)
+    assert df_rank['Peringkat'].tolist() == sorted(df_rank['Peringkat'])
+    assert df_rank['Skor'].between(0, 100).all()
+    # Only salary weighted: the ranking follows the salary estimate
+    only_gaji = {m: 0 for m in ranking.METRICS} | {'gaji': 1}
+    df_gaji = ranking.rank_groups(df, weights=only_gaji, cube=cube)
+    assert df_gaji[ranking.METRICS['gaji'][0]].is_monotonic_decreasing
+    assert df_gaji['Predikat & Analisis'].iloc[0].startswith('<b>"The High Earner"')
+
+
+def test_parse_weights():
+    assert ranking.parse_weights(['gaji=2', 'volume=0']) == {'gaji': 2.0, 'volume': 0.0}
+    with pytest.raises(ValueError):
+        ranking.parse_weights(['unknown=1'])
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+import salary
+
+
+def test_quantiles_interpolate_within_bands():
+    # 4 respondents in Rp1-2 juta and 4 in Rp2-3 juta: the median is the shared edge
+    counts = np.zeros((2, len(salary.BAND_MID)))
+    counts[0, [1, 2]] = 4
+    counts[1, 0] = 2
+    np.testing.assert_allclose(salary.interpolated_quantile(counts, 0.5), [2_000_000, 500_000])
+    np.testing.assert_allclose(salary.interpolated_quantile(counts, 0.25), [1_500_000, 250_000])
+    assert np.isnan(salary.interpolated_quantile(np.zeros((1, len(salary.BAND_MID))), 0.5)[0])
+
+
+def test_share_above():
+    counts = np.zeros((1, len(salary.BAND_MID)))
+    counts[0, [1, 2]] = 4
+    assert salary.share_above(counts, 2_000_000)[0] == pytest.approx(50)
+    assert salary.share_above(counts, 2_500_000)[0] == pytest.approx(25)
+    assert salary.share_above(counts, 0)[0] == pytest.approx(100)
+
+
+def test_top_band_above_its_lower_edge():
+    counts = np.zeros((1, len(salary.BAND_MID)))
+    counts[0, -1] = 1
+    df_summary = salary.summarize(['Total'], counts)
+    assert df_summary['Rata-rata'].iloc[0] > 8_000_000
+    assert df_summary['Median'].iloc[0] > 8_000_000
+
+
+@pytest.mark.parametrize('by', ['jurusan', ['tahun_lulus', 'diploma'], 'jenis_instansi'])
+def test_group_totals(df, by):
+    df_summary = salary.salary_summary(df, by)
+    institution = salary.salary_summary(df)
+    body = df_summary.iloc[:-1]
+    assert body['Responden'].sum() <= institution['Responden'].iloc[0]
+    assert (body['Q1'] <= body['Median']).all() and (body['Median'] <= body['Q3']).all()
+    np.testing.assert_allclose(df_summary.iloc[-1]['Median'], institution['Median'].iloc[0])
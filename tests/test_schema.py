@@ -0,0 +1,35 @@
+import pandas as pd
+
+import cleaning
+import data_cache
+import gap_analisis
+import schema
+import synthetic
+
+
+def test_competency_scale_follows_survey_codes():
+    assert schema.LEVEL_KOMPETENSI == [cleaning.competency_mapping[code] for code in sorted(cleaning.competency_mapping)]
+    assert synthetic.RAW_KOMPETENSI == {level: code for code, level in cleaning.competency_mapping.items()}
+
+
+def test_competency_scores_match_scale():
+    for score, level in enumerate(schema.LEVEL_KOMPETENSI, 1):
+        assert gap_analisis.COMPETENCY_SCORE_MAP[level] == score
+        assert gap_analisis.parse_competency_value(level) == score
+
+
+def test_cast_orders_competency_levels():
+    values = schema.cast(pd.Series(['Cukup Menguasai', 'Menguasai', 'Sangat Menguasai']), 'etika_acq')
+    assert values.ordered
+    assert list(values.codes) == [3, 2, 4]
+
+
+def test_cache_is_stale_after_registry_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    source = tmp_path / 'cleaned.xlsx'
+    source.write_bytes(b'workbook')
+    data_cache.write_cache(pd.DataFrame({'ID': [1, 2]}), str(source))
+    assert data_cache.is_fresh(str(source))
+    spec = dict(schema.SCHEMA['id'], variants=['NIM Mahasiswa'])
+    monkeypatch.setitem(schema.SCHEMA, 'id', spec)
+    assert not data_cache.is_fresh(str(source))
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+import survival
+
+
+def test_kaplan_meier_by_hand():
+    # t=2: 1 event of 4 at risk; t=3: censored; t=5: 1 event of 2 at risk
+    durations = [2, 3, 5, 8]
+    events = [True, False, True, False]
+    _, times, surv, at_risk, _ = survival.kaplan_meier(durations, events)
+    assert times.tolist() == [2, 3, 5, 8]
+    assert at_risk[0].tolist() == [4, 3, 2, 1]
+    np.testing.assert_allclose(surv[0], [0.75, 0.75, 0.375, 0.375])
+    assert survival.median_time(times, surv)[0] == 5
+    assert survival.survival_at(times, surv, 1)[0] == 1
+
+
+def test_groups_match_separate_estimates():
+    rng = np.random.default_rng(0)
+    durations = rng.integers(0, 24, 200).astype(float)
+    events = rng.random(200) < 0.7
+    groups = rng.choice(['A', 'B', 'C'], 200)
+    labels, times, surv, _, _ = survival.kaplan_meier(durations, events, groups)
+    for i, g in enumerate(labels):
+        in_g = groups == g
+        _, t_g, s_g, _, _ = survival.kaplan_meier(durations[in_g], events[in_g])
+        for t in (0, 5, 12, 30):
+            assert survival.survival_at(times, surv, t)[i] == pytest.approx(survival.survival_at(t_g, s_g, t)[0])
+
+
+def test_job_seekers_are_censored(df):
+    durations, events = survival.survival_data(df)
+    seeking = (df['Jelaskan status Anda saat ini?'] == survival.SEEKING_STATUS).to_numpy()
+    assert not events[seeking].any()
+    assert not np.isnan(durations[seeking]).any()
+
+    df_table = survival.survival_table(df, 'jurusan')
+    total = df_table.loc['Total']
+    assert total['Masih Mencari (Tersensor)'] == seeking[df['Jurusan'].notna().to_numpy()].sum()
+    assert df_table.drop('Total')['Responden'].sum() == total['Responden']
+    months = [f'Masih Mencari > {t} Bulan (%)' for t in survival.REPORT_MONTHS]
+    assert (df_table[months].diff(axis=1).iloc[:, 1:] <= 0).all().all()
@@ -0,0 +1,51 @@
+import contextlib
+import io
+
+import pandas as pd
+import pytest
+
+import cleaning
+import schema
+import synthetic
+
+ROWS = 400
+
+
+@pytest.fixture(scope='module')
+def model(df):
+    return synthetic.learn_model(df)
+
+
+@pytest.fixture(scope='module')
+def sampled(model):
+    return synthetic.sample(model, ROWS, seed=7)
+
+
+def as_text(df):
+    """Cell-by-cell comparable copy: every value as text, missing as 'NA'."""
+    return df.astype(str).where(df.notna(), 'NA').reset_index(drop=True)
+
+
+def test_same_seed_same_frame(model, sampled):
+    pd.testing.assert_frame_equal(synthetic.sample(model, ROWS, seed=7), sampled)
+    assert not synthetic.sample(model, ROWS, seed=8).equals(sampled)
+
+
+def test_prodi_belongs_to_its_jurusan(df_ids, sampled):
+    observed = set(zip(df_ids['prodi'].astype(str), df_ids['jurusan'].astype(str)))
+    pairs = set(zip(sampled['prodi'].astype(str), sampled['jurusan'].astype(str)))
+    assert pairs <= observed, pairs - observed
+    assert (sampled.groupby('prodi')['jurusan'].nunique() == 1).all()
+
+
+def test_raw_form_cleans_back_to_sample(sampled):
+    df_raw = synthetic.to_raw_form(sampled, seed=7)
+    assert len(df_raw) == ROWS + int(ROWS * 0.01) # injected earlier submissions
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = cleaning.drop_empty_names(df_raw)
+        df = cleaning.transform(cleaning.deduplicate_nim(df), profile=False)
+    df_clean = df.sort_values('ID')
+    expected = synthetic.to_cleaned_form(sampled)
+    assert list(df_clean.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(as_text(df_clean), as_text(expected))
+    assert set(schema.to_ids(df_clean)['id']) == set(sampled['id'])
@@ -0,0 +1,90 @@
+import pytest
+
+import schema
+import table_jml_responden as tr
+
+CROSSTABS = [
+    'create_distribution_campus_loc_tahun',
+    'create_distribution_jurusan_tahun',
+    'create_distribution_prodi_tahun',
+    'create_serapan_jurusan',
+]
+
+
+@pytest.mark.parametrize('builder', CROSSTABS)
+def test_crosstab_totals(df, builder):
+    table = getattr(tr, builder)(df)
+    body = table.drop('Total')
+    assert table.loc['Total', 'Total'] == len(df)
+    assert body['Total'].sum() == len(df)
+    assert (body['Total'].diff().dropna() <= 0).all() # sorted by Total, descending
+    assert table['Persentase'].iloc[-1] == 100
+    assert table.attrs['formats'] == {'Persentase': 'percent'}
+
+
+def test_masa_tunggu_status_totals(df):
+    table = tr.create_distribution_masa_tunggu_status(df)
+    categories = [c for c in table.columns if c not in ('Total', 'Persentase')]
+    assert (table[categories].sum(axis=1) == table['Total']).all()
+    assert table.loc['Total', 'Total'] == table.drop('Total')['Total'].sum()
+
+
+def test_waktu_tunggu_jurusan_totals(df):
+    table = tr.create_distribution_waktu_tunggu_jurusan(df)
+    body, total = table.iloc[:-1], table.iloc[-1]
+    assert total['Total Responden (Bekerja)'] == body['Total Responden (Bekerja)'].sum()
+    assert total['Jumlah Lulusan (<= 6 Bulan)'] == body['Jumlah Lulusan (<= 6 Bulan)'].sum()
+    assert (body['Jumlah Lulusan (<= 6 Bulan)'] <= body['Total Responden (Bekerja)']).all()
+
+
+def test_serapan_prodi_per_jurusan(df):
+    tables = tr.create_serapan_prodi_per_jurusan(df)
+    assert set(tables) == set(df['Jurusan'].dropna().unique())
+    assert sum(table['Total'].iloc[-1] for table in tables.values()) == df['Jurusan'].notna().sum()
+
+
+@pytest.mark.parametrize('builder, count_col', [
+    ('create_distribution_provinsi', 'Jumlah'),
+    ('create_distribution_kabkota_kalbar', 'Jumlah Responden'),
+    ('create_salary_distribution', 'Jumlah Responden'),
+])
+def test_distribution_totals(df, builder, count_col):
+    table = getattr(tr, builder)(df)
+    assert table[count_col].iloc[-1] == table[count_col].iloc[:-1].sum()
+    assert table.iloc[-1, -1] == 100
+    assert table.iloc[:-1, -1].sum() == pytest.approx(100)
+
+
+def test_salary_by_jurusan(df):
+    table = tr.create_salary_by_jurusan(df)
+    means = table['Rata-rata Gaji (Estimasi)']
+    assert (means.diff().dropna() <= 0).all() # ranked by the mean, numbers not strings
+    assert ((table['Q1'] <= table['Median']) & (table['Median'] <= table['Q3'])).all()
+
+
+@pytest.mark.parametrize('by', ['jurusan', 'prodi', 'tahun_lulus'])
+def test_job_search_funnel(df, by):
+    table = tr.create_job_search_funnel(df, by)
+    body, total = table.drop('Total'), table.loc['Total']
+    stages = ['Responden'] + tr.FUNNEL_STAGES
+    assert (body[stages].diff(axis=1).iloc[:, 1:] <= 0).all().all() # each stage nested in the previous
+    assert (body[stages].sum() == total[stages]).all()
+    assert total['Responden'] == df[schema.find_column(df, by)].notna().sum()
+
+
+def test_funnel_agrees_with_status_tables(df):
+    funnel = tr.create_job_search_funnel(df).loc['Total']
+    serapan = tr.create_serapan_jurusan(df).loc['Total']
+    assert funnel['Bekerja'] == sum(serapan[s] for s in tr.WORKING_STATUS)
+    assert funnel['Bekerja setelah wawancara'] <= funnel['Bekerja']
+    waktu_tunggu = tr.create_distribution_waktu_tunggu_jurusan(df).iloc[-1]
+    assert funnel['Rata-rata Masa Tunggu (Bulan)'] == pytest.approx(waktu_tunggu['Rata-rata Masa Tunggu (Bulan)'], abs=0.05)
+
+
+def test_campus_location_from_prodi(df):
+    table = tr.create_distribution_campus_loc_tahun(df)
+    for campus, keyword in [('PDD Kapuas Hulu', 'Kapuas Hulu'), ('PSDKU Sanggau', 'Sanggau'),
+                            ('PSDKU Sukamara', 'Sukamara')]:
+        expected = df['prodi'].astype(str).str.contains(keyword, case=False).sum()
+        assert expected > 0
+        assert table.loc[campus, 'Total'] == expected